@@ -0,0 +1,108 @@
+"""Event-driven pane activity tracking for Yadon Desktop Pet
+
+Each watched tmux session gets its own control-mode client with output
+enabled. tmux pushes a ``%output`` notification whenever a pane writes, so
+the last-output timestamp of every pane is known as soon as bytes arrive and
+no ``capture-pane`` polling is needed to tell whether a CLI is still busy.
+"""
+
+import atexit
+import functools
+import threading
+
+from clock import monotonic
+from config import TMUX_ACTIVITY_EVENTS
+from tmux_client import TmuxControlClient
+from utils import log_debug, get_tmux_backend
+
+
+def _log_debug(message: str):
+    log_debug('activity_engine', message)
+
+
+# Notifications after which the "session window pane" status may be stale
+_LAYOUT_NOTIFICATIONS = (
+    '%window-pane-changed ', '%session-window-changed ', '%session-renamed ',
+    '%session-changed ', '%window-add ', '%window-close ',
+    '%unlinked-window-close ', '%layout-change ', '%window-renamed ',
+)
+
+
+class ActivityEngine:
+    """Track per-pane output timestamps from control-mode notifications"""
+
+    def __init__(self):
+        self._clients = {}  # session -> TmuxControlClient
+        self._lock = threading.Lock()
+        self.last_output = {}  # pane_id -> clock.monotonic() of the latest %output
+        self.layout_seq = {}  # session -> count of pane/window focus or layout changes
+
+    def watch(self, session) -> bool:
+        """Stream notifications for a session (idempotent)
+
+        Returns:
+            True when the session's output is currently being streamed. A
+            dropped connection is re-established here (at most once per
+            reconnect delay); until then callers should fall back to capturing.
+        """
+        if not session:
+            return False
+        with self._lock:
+            client = self._clients.get(session)
+            if client is None:
+                client = TmuxControlClient(session=session, output=True)
+                client.add_listener(functools.partial(self._on_notification, session))
+                self._clients[session] = client
+                _log_debug(f"watching session {session}")
+        return client.ensure_connected()
+
+    def unwatch(self, session):
+        with self._lock:
+            client = self._clients.pop(session, None)
+        if client is not None:
+            client.close()
+            _log_debug(f"stopped watching session {session}")
+
+    def last_output_ts(self, pane_id):
+        """Timestamp of the latest output seen for a pane, or None"""
+        return self.last_output.get(pane_id)
+
+    def layout_version(self, session) -> int:
+        """Counter bumped whenever the session's active window/pane may have changed"""
+        return self.layout_seq.get(session, 0)
+
+    def forget(self, pane_id):
+        self.last_output.pop(pane_id, None)
+
+    def close(self):
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            client.close()
+
+    def _on_notification(self, session, line):
+        # %output %<pane> <escaped data>  /  %extended-output %<pane> <age> ... : <data>
+        if line.startswith(('%output ', '%extended-output ')):
+            start = line.find(' ') + 1
+            end = line.find(' ', start)
+            pane_id = line[start:end] if end != -1 else line[start:]
+            self.last_output[pane_id] = monotonic()
+        elif line.startswith(_LAYOUT_NOTIFICATIONS):
+            self.layout_seq[session] = self.layout_seq.get(session, 0) + 1
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_activity_engine():
+    """Return the process-wide activity engine, or None when disabled"""
+    global _engine
+    if not TMUX_ACTIVITY_EVENTS or get_tmux_backend() is not None:
+        return None
+    with _engine_lock:
+        if _engine is None:
+            _engine = ActivityEngine()
+            atexit.register(_engine.close)
+        return _engine
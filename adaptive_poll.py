@@ -0,0 +1,66 @@
+"""Adaptive polling intervals for Yadon Desktop Pet
+
+Monitoring timers back off exponentially while nothing changes, tighten as
+a pane approaches an idle threshold and snap back to their fastest rate on
+any change. Limits are configured per subsystem in ADAPTIVE_POLL_INTERVALS.
+"""
+
+import weakref
+
+from config import ADAPTIVE_POLL_INTERVALS, ADAPTIVE_POLL_BACKOFF
+
+_registry = weakref.WeakSet()
+
+
+class AdaptiveInterval:
+    """Interval policy for one polling timer
+
+    Args:
+        subsystem: Key into ADAPTIVE_POLL_INTERVALS
+    """
+
+    def __init__(self, subsystem):
+        self.subsystem = subsystem
+        self.min_ms, self.max_ms = ADAPTIVE_POLL_INTERVALS[subsystem]
+        self.interval = self.min_ms
+        _registry.add(self)
+
+    def reset(self) -> int:
+        self.interval = self.min_ms
+        return self.interval
+
+    def update(self, changed, idle=True, due_in_ms=None) -> int:
+        """Compute the next interval after a poll
+
+        Args:
+            changed: The poll observed a change (snap back to min_ms)
+            idle: Nothing is being watched, so an unchanged poll may back off;
+                when False an unchanged poll keeps the current rate
+            due_in_ms: Time until the next pending threshold, if any; the
+                next poll is never scheduled later than that
+
+        Returns:
+            Interval in milliseconds
+        """
+        if changed:
+            self.interval = self.min_ms
+        elif idle:
+            self.interval = min(int(self.interval * ADAPTIVE_POLL_BACKOFF), self.max_ms)
+        if due_in_ms is not None:
+            self.interval = max(self.min_ms, min(self.interval, int(due_in_ms)))
+        return self.interval
+
+
+def retime(timer, interval_ms):
+    """Apply an interval to a running QTimer without needless restarts"""
+    if timer.interval() != interval_ms:
+        timer.setInterval(interval_ms)
+
+
+def interval_summary():
+    """{subsystem: (timer count, min current ms, max current ms)}"""
+    summary = {}
+    for policy in list(_registry):
+        count, low, high = summary.get(policy.subsystem, (0, policy.interval, policy.interval))
+        summary[policy.subsystem] = (count + 1, min(low, policy.interval), max(high, policy.interval))
+    return summary
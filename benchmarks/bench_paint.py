@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Benchmark: YadonPet sprite painting, per-pixel loop vs cached pixmap
+
+Runs headless:
+
+    QT_QPA_PLATFORM=offscreen python3 benchmarks/bench_paint.py
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6.QtGui import QColor, QImage, QPainter  # noqa: E402
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+from config import PIXEL_SIZE, VARIANT_ORDER, WINDOW_HEIGHT, WINDOW_WIDTH  # noqa: E402
+from pixel_data import build_pixel_data  # noqa: E402
+from sprite_cache import get_sprite_frames  # noqa: E402
+
+
+def paint_per_pixel(painter, pixel_data, face_offset):
+    """The original paintEvent sprite loop, kept as the baseline"""
+    for y in range(16):
+        for x in range(16):
+            color_hex = pixel_data[y][x]
+            if y < 10:
+                draw_x = x * PIXEL_SIZE + face_offset
+            else:
+                draw_x = x * PIXEL_SIZE
+            draw_y = y * PIXEL_SIZE
+            if color_hex != "#FFFFFF":
+                painter.fillRect(draw_x, draw_y, PIXEL_SIZE, PIXEL_SIZE, QColor(color_hex))
+
+
+def paint_cached(painter, frames, face_offset):
+    painter.drawPixmap(0, 0, frames[face_offset])
+
+
+def bench(label, paint, frames_per_variant):
+    target = QImage(WINDOW_WIDTH, WINDOW_HEIGHT, QImage.Format.Format_ARGB32_Premultiplied)
+    offsets = (-1, 0, 1, 0)
+    start = time.perf_counter()
+    count = 0
+    for variant in VARIANT_ORDER:
+        for i in range(frames_per_variant):
+            target.fill(0)
+            painter = QPainter(target)
+            paint(painter, variant, offsets[i % len(offsets)])
+            painter.end()
+            count += 1
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22} {elapsed / count * 1e6:9.1f} us/frame  ({count} frames)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=2000, help='frames per variant')
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)  # noqa: F841 (pixmaps need an application)
+    pixel_data = {v: build_pixel_data(v) for v in VARIANT_ORDER}
+
+    bench('per-pixel (baseline)', lambda p, v, o: paint_per_pixel(p, pixel_data[v], o), args.frames)
+
+    start = time.perf_counter()
+    frames = {v: get_sprite_frames(v) for v in VARIANT_ORDER}
+    print(f"{'pixmap cache build':<22} {(time.perf_counter() - start) * 1e3:9.3f} ms (once per process)")
+    bench('cached pixmap', lambda p, v, o: paint_cached(p, frames[v], o), args.frames)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: /proc process scanner vs ps
+
+Simulates one monitoring tick: build a process index, then look up the CLI
+children of a handful of pane pids. Run it on a machine with a few thousand
+processes, or let it spawn idle sleepers to get there:
+
+    python3 benchmarks/bench_process_scan.py --spawn 3000
+"""
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from config import TMUX_CLI_NAMES  # noqa: E402
+from process_index import ProcProcessIndex, _proc_children_supported, build_process_index  # noqa: E402
+
+
+def one_tick(backend, pane_pids, make_index=None):
+    index = make_index() if make_index else build_process_index(backend)
+    found = 0
+    for pid in pane_pids:
+        for child in index.children_of(pid):
+            cmdline = index.command(child).lower()
+            if any(name in cmdline for name in TMUX_CLI_NAMES):
+                found += 1
+                break
+    return found
+
+
+def bench(label, fn, rounds):
+    fn()  # warm up
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    median = samples[len(samples) // 2] * 1000
+    best = samples[0] * 1000
+    print(f"{label:<28} median {median:8.3f} ms   best {best:8.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--spawn', type=int, default=0, help='idle processes to start first')
+    parser.add_argument('--panes', type=int, default=8, help='pane pids to look up per tick')
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    # Every process gets its own group and is killed with it, so no sleep
+    # outlives the run (an orphan holding stdout would hang a piped run)
+    sleepers = []
+    try:
+        for _ in range(args.spawn):
+            sleepers.append(subprocess.Popen(['sleep', '600'], stdout=subprocess.DEVNULL,
+                                             start_new_session=True))
+        # Stand-in pane shells, each with one (non-CLI) foreground child
+        shells = [subprocess.Popen(['sh', '-c', 'sleep 600; :'], stdout=subprocess.DEVNULL,
+                                   start_new_session=True)
+                  for _ in range(args.panes)]
+        sleepers.extend(shells)
+        pane_pids = [proc.pid for proc in shells]
+        time.sleep(0.2)
+
+        total = len([n for n in os.listdir('/proc') if n.isdigit()]) if os.path.isdir('/proc') else 0
+        print(f"processes: {total or 'unknown'}, pane lookups per tick: {args.panes}")
+
+        bench('ps (fork + parse)', lambda: one_tick('ps', pane_pids), args.rounds)
+        if os.path.isdir('/proc/self/task'):
+            if _proc_children_supported():
+                bench('/proc (children files)',
+                      lambda: one_tick('proc', pane_pids, lambda: ProcProcessIndex(use_children_files=True)),
+                      args.rounds)
+
+            def full_stat_scan():
+                index = ProcProcessIndex(use_children_files=False)
+                for pid in pane_pids:
+                    for child in index.children_of(pid):
+                        index.command(child)
+            bench('/proc (full stat scan)', full_stat_scan, args.rounds)
+    finally:
+        for proc in sleepers:
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        for proc in sleepers:
+            proc.wait()
+
+
+if __name__ == '__main__':
+    main()
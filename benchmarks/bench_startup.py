@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Benchmark: time from launch to first painted pet with N tmux sessions
+
+Creates --sessions sessions on a private tmux server and launches a fresh
+interpreter --runs times. Each run goes through the same startup path as
+main() (start_pets) offscreen and reports the time from process launch to
+the first and the last pet's first paintEvent, plus how many tmux calls were
+made and tmux processes spawned in the first --window seconds (the startup
+herd).
+
+    python3 benchmarks/bench_startup.py --sessions 4 --runs 5
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+SOCKET = 'yadon-startup'
+
+
+def run_child(args):
+    """One startup, timed against the launch timestamp from the parent"""
+    t0 = float(os.environ['YADON_BENCH_T0'])
+    spawn_log = os.environ['YADON_BENCH_SPAWN_LOG']
+
+    from PyQt6.QtCore import QTimer
+    from PyQt6.QtWidgets import QApplication
+    import yadon_pet
+    from utils import tmux_call_count
+
+    painted = {}
+    original_paint = yadon_pet.YadonPet.paintEvent
+
+    def paint_event(pet, event):
+        original_paint(pet, event)
+        painted.setdefault(id(pet), (time.time(), tmux_call_count()))
+
+    yadon_pet.YadonPet.paintEvent = paint_event
+
+    app = QApplication(sys.argv)
+    pets, monitor = yadon_pet.start_pets()
+    QTimer.singleShot(int(args.window * 1000), app.quit)
+    app.exec()
+
+    with open(spawn_log) as f:
+        spawns = [float(line) for line in f if line.strip()]
+    firsts = sorted(painted.values())
+    print(json.dumps({
+        'pets': len(pets),
+        'first_paint_ms': (firsts[0][0] - t0) * 1000 if firsts else None,
+        'all_painted_ms': (firsts[-1][0] - t0) * 1000 if len(firsts) == len(pets) and firsts else None,
+        'tmux_calls_at_first_paint': firsts[0][1] if firsts else None,
+        'tmux_calls_in_window': tmux_call_count(),
+        'tmux_spawns_in_window': sum(1 for t in spawns if t - t0 <= args.window),
+    }))
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=4)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--window', type=float, default=2.0, help='seconds each run lasts')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return run_child(args)
+
+    real_tmux = shutil.which('tmux')
+    if not real_tmux:
+        print('tmux not found; skipping')
+        return 0
+    tmpdir = tempfile.mkdtemp(prefix='yadon-startup-')
+    spawn_log = os.path.join(tmpdir, 'spawns')
+    wrapper = os.path.join(tmpdir, 'tmux')
+    with open(wrapper, 'w') as f:
+        f.write('#!/bin/sh\n'
+                f'date +%s.%N >> {spawn_log}\n'
+                f'exec {real_tmux} -L {SOCKET} "$@"\n')
+    os.chmod(wrapper, 0o755)
+    for i in range(args.sessions):
+        subprocess.run([real_tmux, '-L', SOCKET, 'new-session', '-d', '-s', f'start{i}'], check=True)
+
+    results = []
+    try:
+        for _ in range(args.runs):
+            open(spawn_log, 'w').close()
+            env = dict(os.environ, YADON_TMUX=wrapper, YADON_BENCH_SPAWN_LOG=spawn_log,
+                       YADON_BENCH_T0=repr(time.time()))
+            cmd = [sys.executable, os.path.abspath(__file__), '--child', '--window', str(args.window)]
+            out = subprocess.run(cmd, env=env, capture_output=True, text=True, check=True).stdout
+            results.append(json.loads(out.strip().splitlines()[-1]))
+    finally:
+        subprocess.run([real_tmux, '-L', SOCKET, 'kill-server'], check=False)
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+    def median(key):
+        values = [r[key] for r in results if r[key] is not None]
+        return statistics.median(values) if values else float('nan')
+
+    print(f"{results[0]['pets']} pets, median of {len(results)} runs: "
+          f"first paint {median('first_paint_ms'):.0f} ms, all painted {median('all_painted_ms'):.0f} ms, "
+          f"tmux calls before first paint {median('tmux_calls_at_first_paint'):.0f}; "
+          f"in {args.window:.0f}s: {median('tmux_calls_in_window'):.0f} tmux calls, "
+          f"{median('tmux_spawns_in_window'):.0f} tmux processes")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""Headless benchmark suite for the rendering and monitoring paths
+
+Runs offscreen (QT_QPA_PLATFORM=offscreen) against the scripted fake tmux
+(benchmarks/fake_tmux.py) installed with utils.set_tmux_backend(), so call
+counting and latency metrics still see every command. The app and the fake
+share a clock.VirtualClock that advances by --tick per activity tick, so
+per-tick caches expire between ticks exactly as they would live. Covers:
+
+  paint.YadonPet          YadonPet.paintEvent (repaint of one pet)
+  bubble.construct        SpeechBubble construction + show + close
+  paint.SpeechBubble      SpeechBubble.paintEvent
+  paint.PokemonMenu       PokemonMenu.paintEvent with the pet's menu items
+  check_cli_activity      one activity tick for every pet (collect + apply)
+  check_processes         one ProcessMonitor session poll
+
+Every case reports microseconds per iteration (mean/p50/p90/max) plus the
+tmux commands issued per iteration. Results are printed as a table and, with
+--json, written as machine-readable JSON for regression tracking.
+
+    python3 benchmarks/bench_suite.py --sessions 8 --panes 4 --output-rate 5 --json out.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from fake_tmux import FakeTmux, generate_script  # noqa: E402
+
+
+def _quiesce(pet):
+    """Stop a pet's timers so only the measured calls run"""
+    for name in ('timer', 'action_timer', 'monitor_timer', 'activity_timer', 'status_timer', '_top_keepalive'):
+        timer = getattr(pet, name, None)
+        if timer is not None:
+            timer.stop()
+
+
+def _measure(name, fn, iterations, fake, warmup=3, setup=None):
+    for _ in range(warmup):
+        if setup:
+            setup()
+        fn()
+    samples = []
+    calls_before = fake.calls
+    for _ in range(iterations):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return {
+        'name': name,
+        'unit': 'us',
+        'iterations': iterations,
+        'mean': round(statistics.fmean(samples), 2),
+        'p50': round(samples[len(samples) // 2], 2),
+        'p90': round(samples[min(len(samples) - 1, int(len(samples) * 0.9))], 2),
+        'max': round(samples[-1], 2),
+        'tmux_calls_per_iteration': round((fake.calls - calls_before) / iterations, 2),
+    }
+
+
+def run_suite(args):
+    import clock
+    import config
+    from PyQt6.QtCore import PYQT_VERSION_STR, QT_VERSION_STR
+    from PyQt6.QtWidgets import QApplication
+    import utils
+    from pokemon_menu import PokemonMenu
+    from process_monitor import ProcessMonitor, get_tmux_sessions
+    from speech_bubble import SpeechBubble
+    from tmux_snapshot import invalidate_snapshot
+    from yadon_pet import YadonPet
+
+    vclock = clock.VirtualClock()
+    clock.set_clock(vclock)
+    fake = FakeTmux(generate_script(args.sessions, args.panes, args.output_rate), clock=clock.monotonic, epoch=0)
+    utils.set_tmux_backend(fake)
+
+    app = QApplication(sys.argv)
+    sessions = get_tmux_sessions()
+    pets = [YadonPet(tmux_session=s, sessions=sessions) for s in sessions]
+    for pet in pets:
+        _quiesce(pet)
+    # One pet per session even beyond MAX_YADON_COUNT, to see how the
+    # monitoring paths scale; the monitor only tracks what it would show
+    monitor = ProcessMonitor(pets[:config.MAX_YADON_COUNT])
+    monitor.stop()
+    monitor.stats_timer.stop()
+    app.processEvents()
+
+    pet = pets[0]
+    results = []
+    n = args.iterations
+
+    results.append(_measure('paint.YadonPet', pet.repaint, n, fake))
+
+    def bubble_cycle():
+        bubble = SpeechBubble('ヤドン…やるきスイッチ ON！', pet)
+        bubble.show()
+        bubble.close()
+    results.append(_measure('bubble.construct', bubble_cycle, n, fake))
+
+    bubble = SpeechBubble('ヤドン…やるきスイッチ ON！', pet)
+    bubble.show()
+    app.processEvents()  # Expose the window so repaint() reaches paintEvent
+    results.append(_measure('paint.SpeechBubble', bubble.repaint, n, fake))
+    bubble.close()
+
+    menu = PokemonMenu()
+    for text, action in (('やるきスイッチ', 'yaruki'), ('とじる', 'close'), ('さよなら', 'quit')):
+        menu.add_item(text, action)
+    menu.show()
+    app.processEvents()
+    results.append(_measure('paint.PokemonMenu', menu.repaint, n, fake))
+    menu.close()
+
+    def activity_setup():
+        # A new tick: time passes for pane output and the tick caches expire
+        vclock.advance(args.tick)
+
+    def activity_tick():
+        for p in pets:
+            p._apply_cli_activity(p._collect_cli_activity())
+    results.append(_measure('check_cli_activity', activity_tick, n, fake, setup=activity_setup))
+
+    def monitor_tick():
+        monitor._apply_sessions(get_tmux_sessions())
+    results.append(_measure('check_processes', monitor_tick, n, fake, setup=invalidate_snapshot))
+
+    for p in pets:
+        p.close()
+    return {
+        'params': {
+            'sessions': args.sessions,
+            'panes_per_session': args.panes,
+            'output_rate': args.output_rate,
+            'tick_sec': args.tick,
+            'iterations': n,
+        },
+        'environment': {
+            'python': platform.python_version(),
+            'qt': QT_VERSION_STR,
+            'pyqt': PYQT_VERSION_STR,
+            'platform': platform.platform(),
+        },
+        'results': results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=4)
+    parser.add_argument('--panes', type=int, default=2, help='panes per session')
+    parser.add_argument('--output-rate', type=float, default=5.0, help='lines per second per pane')
+    parser.add_argument('--tick', type=float, default=1.0, help='virtual seconds between activity ticks')
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--json', metavar='PATH', help='write results as JSON')
+    args = parser.parse_args()
+
+    report = run_suite(args)
+    print(f"{args.sessions} sessions x {args.panes} panes, {args.output_rate:g} lines/s per pane")
+    print(f"{'case':<22}{'mean us':>12}{'p50':>10}{'p90':>10}{'max':>10}{'tmux/it':>9}")
+    for r in report['results']:
+        print(f"{r['name']:<22}{r['mean']:>12.1f}{r['p50']:>10.1f}{r['p90']:>10.1f}{r['max']:>10.1f}"
+              f"{r['tmux_calls_per_iteration']:>9.2f}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=1)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
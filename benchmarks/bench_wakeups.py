@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Benchmark: event-loop timer wakeups per second, per-widget timers vs heartbeat
+
+Runs --pets pets offscreen against a private tmux server (with --bubbles each
+pet shows a speech bubble, with --menu one context menu is open), once with
+HEARTBEAT_ENABLED off (every widget owns its QTimers) and once with the global
+heartbeat. After --settle seconds (startup welcome bubbles) an application
+event filter timestamps every QTimerEvent; events less than 1 ms apart are
+counted as one wakeup of the event loop.
+
+    python3 benchmarks/bench_wakeups.py --pets 4 --duration 10
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+SOCKET = 'yadon-wakeups'
+
+
+def run_mode(args):
+    """Measure one configuration in this process and print a JSON result"""
+    import config
+    config.HEARTBEAT_ENABLED = args.mode == 'heartbeat'
+
+    from PyQt6.QtCore import QEvent, QObject, QTimer
+    from PyQt6.QtWidgets import QApplication
+    from process_monitor import ProcessMonitor, get_tmux_sessions
+    from speech_bubble import SpeechBubble
+    from yadon_pet import YadonPet
+
+    class TimerEventCounter(QObject):
+        def __init__(self):
+            super().__init__()
+            self.stamps = []
+
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Type.Timer:
+                self.stamps.append(time.monotonic())
+            return False
+
+    app = QApplication(sys.argv)
+    sessions = get_tmux_sessions()
+    pets = []
+    bubbles = []
+    monitor = ProcessMonitor(pets)
+    monitor.start()
+
+    def add_pet(session):
+        pet = YadonPet(tmux_session=session)
+        pets.append(pet)
+        monitor.last_count = len(pets)
+        if args.bubbles:
+            # Owned by the benchmark so welcome/goodbye messages cannot close it
+            bubbles.append(SpeechBubble('ヤドン…', pet))
+            bubbles[-1].show()
+        if args.menu and len(pets) == 1:
+            pet.show_context_menu(pet.mapToGlobal(pet.rect().center()))
+
+    # Pets normally appear at unrelated times (sessions come and go), so
+    # their timers start out of phase
+    for i, session in enumerate(sessions[:args.pets]):
+        QTimer.singleShot(int(i * args.spread_ms), lambda s=session: add_pet(s))
+
+    counter = TimerEventCounter()
+    QTimer.singleShot(int(args.settle * 1000), lambda: app.installEventFilter(counter))
+    QTimer.singleShot(int((args.settle + args.duration) * 1000), app.quit)
+    app.exec()
+
+    wakeups = 0
+    last = None
+    for stamp in counter.stamps:
+        if last is None or stamp - last > 0.001:
+            wakeups += 1
+        last = stamp
+    print(json.dumps({
+        'mode': args.mode,
+        'pets': len(pets),
+        'timer_events_per_s': len(counter.stamps) / args.duration,
+        'wakeups_per_s': wakeups / args.duration,
+    }))
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pets', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds to measure per mode')
+    parser.add_argument('--settle', type=float, default=5.0, help='seconds to wait before measuring')
+    parser.add_argument('--spread-ms', type=float, default=130.0, help='delay between creating pets')
+    parser.add_argument('--bubbles', action='store_true', help='keep a speech bubble open per pet')
+    parser.add_argument('--menu', action='store_true', help='keep a context menu open')
+    parser.add_argument('--mode', choices=['legacy', 'heartbeat'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.mode:
+        return run_mode(args)
+
+    real_tmux = shutil.which('tmux')
+    if not real_tmux:
+        print('tmux not found; skipping')
+        return 0
+    tmpdir = tempfile.mkdtemp(prefix='yadon-wakeups-')
+    wrapper = os.path.join(tmpdir, 'tmux')
+    with open(wrapper, 'w') as f:
+        f.write(f'#!/bin/sh\nexec {real_tmux} -L {SOCKET} "$@"\n')
+    os.chmod(wrapper, 0o755)
+    for i in range(args.pets):
+        subprocess.run([real_tmux, '-L', SOCKET, 'new-session', '-d', '-s', f'bench{i}'], check=True)
+    env = dict(os.environ, YADON_TMUX=wrapper)
+
+    results = []
+    try:
+        for mode in ('legacy', 'heartbeat'):
+            cmd = [sys.executable, os.path.abspath(__file__), '--mode', mode,
+                   '--pets', str(args.pets), '--duration', str(args.duration),
+                   '--settle', str(args.settle), '--spread-ms', str(args.spread_ms)]
+            cmd += [flag for flag, on in (('--bubbles', args.bubbles), ('--menu', args.menu)) if on]
+            out = subprocess.run(cmd, env=env, capture_output=True, text=True, check=True).stdout
+            results.append(json.loads(out.strip().splitlines()[-1]))
+    finally:
+        subprocess.run([real_tmux, '-L', SOCKET, 'kill-server'], check=False)
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+    for r in results:
+        print(f"{r['mode']:>9}: {r['pets']} pets, {r['timer_events_per_s']:6.1f} timer events/s, "
+              f"{r['wakeups_per_s']:6.1f} wakeups/s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
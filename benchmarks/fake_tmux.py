@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""Scripted fake tmux for tests and load generation
+
+Implements the subset of tmux the app uses (list-sessions, list-panes,
+capture-pane, display-message, send-keys and `;` command lists) on top of
+a script instead of a server. The state at any moment is a pure function of the script and the
+elapsed time, plus the keys sent so far:
+
+    {
+      "sessions": [
+        {"name": "work", "start": 0, "end": 60,
+         "panes": [
+           {"command": "claude", "output": [[0, 30, 5]], "prompt_at": 40, "prompt": "yes_no"}
+         ]}
+      ]
+    }
+
+`start`/`end` (seconds, end optional) make a session appear and disappear.
+`output` lists [from, to, lines per second] segments; `output_rate` is a
+shorthand for one segment over the pane's whole life. At `prompt_at` a
+prompt ("yes_no", "allow" or literal text) is printed and stays until keys
+are sent to that pane.
+
+Two ways to use it:
+
+  * As an executable, selected through YADON_TMUX:
+        FAKE_TMUX_SCRIPT=script.json YADON_TMUX=benchmarks/fake_tmux.py python3 yadon_pet.py
+    FAKE_TMUX_EPOCH (time.time() at which t=0; default: the script's mtime)
+    anchors the clock and FAKE_TMUX_LOG records send-keys so every call sees
+    the same history. Control mode (-C) is refused, so the app falls back to
+    one process per command.
+  * In process, through utils.set_tmux_backend(FakeTmux(script)); with
+    clock='virtual' time only moves when advance() is called; a callable
+    clock (e.g. the app's clock.monotonic on a VirtualClock) shares time
+    with the app.
+
+    python3 benchmarks/fake_tmux.py generate --sessions 100 --panes 2 --rate 5 > script.json
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+PROMPTS = {
+    'yes_no': 'Do you want to proceed? (y/n)',
+    'allow': 'Allow command `npm test`? [allow/deny]',
+}
+
+_FIELD = re.compile(r'#\{(\?)?([a-z_]+)(?:,([^,}]*),([^}]*))?\}|#([SIPDW])')
+_SHORT = {'S': 'session_name', 'I': 'window_index', 'P': 'pane_index', 'D': 'pane_id', 'W': 'window_name'}
+# Fields that change with the pane's output; formats using them are not cached
+_DYNAMIC = ('history_size', 'cursor_x', 'cursor_y', 'window_activity')
+_SCREEN_ROWS = 24
+
+
+def generate_script(sessions, panes, rate, prompt_at=None, churn=0.0):
+    """Uniform script: `sessions` x `panes` claude panes printing `rate` lines/s
+
+    Args:
+        prompt_at: Optional time at which every pane shows a yes/no prompt
+        churn: Seconds between session starts (0: all present from t=0)
+    """
+    script = {'sessions': []}
+    for s in range(sessions):
+        pane_list = []
+        for _ in range(panes):
+            pane = {'command': 'claude', 'output_rate': rate}
+            if prompt_at is not None:
+                pane['prompt_at'] = prompt_at
+                pane['prompt'] = 'yes_no'
+            pane_list.append(pane)
+        script['sessions'].append({'name': f'fake{s}', 'start': s * churn, 'panes': pane_list})
+    return script
+
+
+class FakeTmux:
+    """Answers tmux commands from a script
+
+    Args:
+        script: Script dict (see module docstring)
+        clock: 'wall' (seconds since `epoch`), 'virtual' (advance() only) or
+            a callable returning the current script time in seconds
+        epoch: time.time() value for t=0 on the wall clock (default: now)
+    """
+
+    def __init__(self, script, clock='wall', epoch=None):
+        self.script = script
+        self.clock = clock
+        self.epoch = time.time() if epoch is None else epoch
+        self.virtual_time = 0.0
+        self.sent = []  # (t, pane_id, keys)
+        self.calls = 0
+        self._fields_cache = {}  # pane_id -> format fields (static per pane)
+        self._list_cache = {}  # (format, live pane ids) -> rows
+        self._live_cache = (None, [])  # (t, live panes at t)
+        self._panes = []  # (session index, session, pane index, pane spec, pane_id)
+        number = 0
+        for s, session in enumerate(script.get('sessions', [])):
+            for p, pane in enumerate(session.get('panes', [{}])):
+                self._panes.append((s, session, p, pane, f'%{number}'))
+                number += 1
+
+    # -- clock -----------------------------------------------------------
+
+    def now(self) -> float:
+        if callable(self.clock):
+            return self.clock()
+        if self.clock == 'virtual':
+            return self.virtual_time
+        return time.time() - self.epoch
+
+    def advance(self, seconds):
+        self.virtual_time += seconds
+
+    # -- state -----------------------------------------------------------
+
+    @staticmethod
+    def _alive(session, t) -> bool:
+        end = session.get('end')
+        return session.get('start', 0) <= t and (end is None or t < end)
+
+    def live_panes(self, t=None):
+        t = self.now() if t is None else t
+        if self._live_cache[0] != t:
+            self._live_cache = (t, [entry for entry in self._panes if self._alive(entry[1], t)])
+        return self._live_cache[1]
+
+    def sessions(self, t=None):
+        names = []
+        for _, session, _, _, _ in self.live_panes(t):
+            if session['name'] not in names:
+                names.append(session['name'])
+        return names
+
+    def _segments(self, session, pane):
+        if 'output' in pane:
+            return pane['output']
+        rate = pane.get('output_rate', 0)
+        return [[session.get('start', 0), session.get('end') or float('inf'), rate]] if rate else []
+
+    def lines_printed(self, session, pane, t) -> int:
+        total = 0.0
+        for start, end, rate in self._segments(session, pane):
+            end = float('inf') if end is None else end
+            if t > start:
+                total += (min(t, end) - start) * rate
+        return int(total)
+
+    def prompt_showing(self, pane, pane_id, t):
+        prompt_at = pane.get('prompt_at')
+        if prompt_at is None or t < prompt_at:
+            return None
+        if any(pane_id == sent_pane and prompt_at <= sent_t for sent_t, sent_pane, _ in self.sent):
+            return None
+        return PROMPTS.get(pane.get('prompt', 'yes_no'), pane.get('prompt'))
+
+    def content(self, session, pane, pane_id, t, lines=200):
+        printed = self.lines_printed(session, pane, t)
+        out = [f'{pane_id} output line {n}' for n in range(max(0, printed - lines), printed)]
+        prompt = self.prompt_showing(pane, pane_id, t)
+        if prompt:
+            out.append(prompt)
+        out.append('> ')
+        return out[-lines:]
+
+    def last_activity(self, session, pane, pane_id, t) -> float:
+        """Script time of the pane's latest output, prompt or key press up to t"""
+        times = [session.get('start', 0)]
+        times += [min(t, float('inf') if end is None else end)
+                  for start, end, rate in self._segments(session, pane) if rate and t > start]
+        if pane.get('prompt_at') is not None and pane['prompt_at'] <= t:
+            times.append(pane['prompt_at'])
+        times += [sent_t for sent_t, sent_pane, _ in self.sent if sent_pane == pane_id and sent_t <= t]
+        return max(times)
+
+    def _fields(self, s, session, p, pane, pane_id, t=None):
+        fields = self._fields_cache.get(pane_id)
+        if fields is None:
+            fields = self._fields_cache[pane_id] = self._build_fields(s, session, p, pane, pane_id)
+        if t is None:
+            return fields
+        # Scrollback and cursor follow the printed lines; window activity is
+        # the latest activity of any pane in the (single-window) session
+        rows = self.lines_printed(session, pane, t) + 1 + bool(self.prompt_showing(pane, pane_id, t))
+        activity = max(self.last_activity(entry[1], entry[3], entry[4], t)
+                       for entry in self.live_panes(t) if entry[1] is session)
+        return dict(fields,
+                    history_size=str(max(0, rows - _SCREEN_ROWS)),
+                    cursor_x='2',
+                    cursor_y=str(min(rows, _SCREEN_ROWS) - 1),
+                    window_activity=str(int(self.epoch + activity)))
+
+    @staticmethod
+    def _build_fields(s, session, p, pane, pane_id):
+        number = int(pane_id[1:])
+        return {
+            'session_id': f'${s}',
+            'session_name': session['name'],
+            'session_windows': '1',
+            'window_index': '0',
+            'window_name': pane.get('command', 'bash'),
+            'window_active': '1',
+            'pane_index': str(p),
+            'pane_active': '1' if p == 0 else '0',
+            'pane_id': pane_id,
+            'pane_pid': str(pane.get('pid', 4000000 + number)),
+            'pane_tty': f'/dev/pts/fake{number}',
+            'pane_current_command': pane.get('command', 'bash'),
+        }
+
+    @staticmethod
+    def _format(fmt, fields):
+        def sub(m):
+            if m.group(5):
+                return fields.get(_SHORT[m.group(5)], '')
+            value = fields.get(m.group(2), '')
+            if m.group(1):
+                return m.group(3) if value not in ('', '0') else m.group(4)
+            return value
+        return _FIELD.sub(sub, fmt)
+
+    def _target(self, target, t):
+        """Live panes matching a -t target (session name or pane id)"""
+        panes = self.live_panes(t)
+        if target is None:
+            return panes
+        if target.startswith('%'):
+            return [entry for entry in panes if entry[4] == target]
+        name = target.split(':')[0]
+        return [entry for entry in panes if entry[1]['name'] == name]
+
+    # -- commands --------------------------------------------------------
+
+    def run(self, args):
+        """Execute a tmux command line; returns a CompletedProcess
+
+        Commands chained with ';' run in order and stop at the first error,
+        like tmux; the line counts as one call.
+        """
+        self.calls += 1
+        t = self.now()
+        if ';' not in args:
+            return self._run_command(list(args), t)
+        stdout = []
+        command = []
+        for arg in list(args) + [';']:
+            if arg != ';':
+                command.append(arg)
+                continue
+            res = self._run_command(command, t)
+            stdout.append(res.stdout)
+            if res.returncode != 0:
+                return subprocess.CompletedProcess(args, res.returncode, ''.join(stdout), res.stderr)
+            command = []
+        return subprocess.CompletedProcess(args, 0, ''.join(stdout), '')
+
+    def _run_command(self, args, t):
+        opts, positional = _parse(args[1:])
+        cmd = args[0] if args else ''
+
+        if not self.live_panes(t) and cmd in ('list-sessions', 'ls', 'list-panes', 'display-message'):
+            return subprocess.CompletedProcess(args, 1, '', 'no server running on /tmp/tmux-fake/default\n')
+
+        if cmd in ('list-sessions', 'ls'):
+            fmt = opts.get('-F', '#{session_name}: #{session_windows} windows')
+            seen, rows = set(), []
+            for entry in self.live_panes(t):
+                if entry[1]['name'] not in seen:
+                    seen.add(entry[1]['name'])
+                    rows.append(self._format(fmt, self._fields(*entry)))
+            return _ok(args, rows)
+
+        if cmd == 'list-panes':
+            fmt = opts.get('-F', '#{pane_index}: #{pane_id}')
+            entries = self.live_panes(t) if '-a' in opts else self._target(opts.get('-t'), t)
+            if any(name in fmt for name in _DYNAMIC):
+                rows = [self._format(fmt, self._fields(*entry, t)) for entry in entries]
+                return _ok(args, rows)
+            key = (fmt, tuple(entry[4] for entry in entries))
+            rows = self._list_cache.get(key)
+            if rows is None:
+                rows = self._list_cache[key] = [self._format(fmt, self._fields(*entry)) for entry in entries]
+            return _ok(args, rows)
+
+        if cmd == 'display-message':
+            entries = self._target(opts.get('-t'), t)
+            if not entries:
+                return _missing(args, opts.get('-t'))
+            active = next((entry for entry in entries if entry[2] == 0), entries[0])
+            fmt = positional[0] if positional else ''
+            dynamic = any(name in fmt for name in _DYNAMIC)
+            return _ok(args, [self._format(fmt, self._fields(*active, t if dynamic else None))])
+
+        if cmd == 'capture-pane':
+            entries = self._target(opts.get('-t'), t)
+            if not entries:
+                return _missing(args, opts.get('-t'))
+            _, session, _, pane, pane_id = entries[0]
+            start = opts.get('-S', '-200')
+            lines = abs(int(start)) if start.lstrip('-').isdigit() else 200
+            return _ok(args, self.content(session, pane, pane_id, t, lines))
+
+        if cmd == 'send-keys':
+            entries = self._target(opts.get('-t'), t)
+            if not entries:
+                return _missing(args, opts.get('-t'))
+            self.sent.append((t, entries[0][4], positional))
+            return _ok(args, [])
+
+        if cmd == 'has-session':
+            return _ok(args, []) if self._target(opts.get('-t'), t) else _missing(args, opts.get('-t'))
+
+        return subprocess.CompletedProcess(args, 1, '', f'unknown command: {cmd}\n')
+
+
+def _parse(args):
+    """Split tmux-style flags ({flag: value or True}) from positional arguments"""
+    with_value = {'-t', '-F', '-S', '-E', '-f'}
+    opts, positional = {}, []
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg in with_value and i + 1 < len(args):
+            opts[arg] = args[i + 1]
+            i += 2
+            continue
+        if arg.startswith('-') and len(arg) > 1 and not positional:
+            for flag in arg[1:]:
+                opts[f'-{flag}'] = True
+        else:
+            positional.append(arg)
+        i += 1
+    return opts, positional
+
+
+def _ok(args, lines):
+    return subprocess.CompletedProcess(args, 0, ''.join(f'{line}\n' for line in lines), '')
+
+
+def _missing(args, target):
+    return subprocess.CompletedProcess(args, 1, '', f"can't find pane: {target}\n")
+
+
+def _cli(argv):
+    if argv and argv[0] == 'generate':
+        import argparse
+        parser = argparse.ArgumentParser(prog='fake_tmux.py generate')
+        parser.add_argument('--sessions', type=int, default=10)
+        parser.add_argument('--panes', type=int, default=1)
+        parser.add_argument('--rate', type=float, default=5.0)
+        parser.add_argument('--prompt-at', type=float)
+        parser.add_argument('--churn', type=float, default=0.0)
+        a = parser.parse_args(argv[1:])
+        json.dump(generate_script(a.sessions, a.panes, a.rate, a.prompt_at, a.churn), sys.stdout, indent=1)
+        print()
+        return 0
+
+    if '-C' in argv or (argv and argv[0].startswith('-')):
+        # Control mode and server options are not supported
+        print('fake tmux: control mode not supported', file=sys.stderr)
+        return 1
+
+    script_path = os.environ.get('FAKE_TMUX_SCRIPT')
+    if not script_path:
+        print('fake tmux: set FAKE_TMUX_SCRIPT', file=sys.stderr)
+        return 1
+    with open(script_path) as f:
+        script = json.load(f)
+    epoch = float(os.environ.get('FAKE_TMUX_EPOCH') or script.get('epoch') or os.path.getmtime(script_path))
+    fake = FakeTmux(script, epoch=epoch)
+
+    log_path = os.environ.get('FAKE_TMUX_LOG')
+    if log_path and os.path.exists(log_path):
+        with open(log_path) as f:
+            for line in f:
+                sent_t, pane_id, keys = json.loads(line)
+                fake.sent.append((sent_t, pane_id, keys))
+    sent_before = len(fake.sent)
+
+    result = fake.run(argv)
+    if log_path and len(fake.sent) > sent_before:
+        with open(log_path, 'a') as f:
+            for entry in fake.sent[sent_before:]:
+                f.write(json.dumps(list(entry)) + '\n')
+    sys.stdout.write(result.stdout)
+    sys.stderr.write(result.stderr)
+    return result.returncode
+
+
+if __name__ == '__main__':
+    sys.exit(_cli(sys.argv[1:]))
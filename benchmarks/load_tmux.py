@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""Load harness: the app against a real tmux server with N x M busy panes
+
+Starts a private tmux server (tmux -L yadon-bench), creates --sessions
+sessions of --panes panes each and runs a synthetic CLI in every pane. The
+generator is installed as an executable named `claude`, so the panes count
+as monitored CLIs. Its behaviour cycles through --mix:
+
+  steady   one line every 1/--rate seconds
+  bursty   2 s of output at 5x --rate, then 8 s of silence
+  silent   a banner, then nothing
+  prompt   --prompt-every seconds of steady output, then an
+           "Allow command?" prompt that blocks until it is answered
+
+The app runs in a child process (offscreen, start_pets(), yaruki on for
+every pet) pointed at the socket with YADON_TMUX_SOCKET. After --settle
+seconds the parent measures the child over --duration seconds:
+
+  * CPU time of the app and of the tmux server, in % of one core
+  * RSS at the end and its peak (VmHWM)
+  * wakeups: context switches of all app threads per second, and heartbeat
+    beats per second
+  * tmux commands per second
+  * notification latency: prompt printed -> "allow" received in the pane,
+    as recorded by the generators
+
+--set NAME=JSON overrides a config setting in the app, to compare
+monitoring backends on the same load.
+
+Runs are reproducible for a given set of arguments; compare results on the
+same machine only.
+
+    python3 benchmarks/load_tmux.py --sessions 4 --panes 4 --duration 60 --json load.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+SOCKET = 'yadon-bench'
+MODES = ('steady', 'bursty', 'silent', 'prompt')
+
+GENERATOR = r'''#!/usr/bin/env python3
+import json, os, sys, time
+
+mode, rate, every, log = sys.argv[1], float(sys.argv[2]), float(sys.argv[3]), sys.argv[4]
+pane = os.environ.get('TMUX_PANE', '?')
+n = 0
+
+
+def emit(seconds, per_sec):
+    global n
+    end = time.time() + seconds
+    while time.time() < end:
+        n += 1
+        print(f"[{mode}] line {n}: " + "working " * 6, flush=True)
+        time.sleep(1.0 / per_sec)
+
+
+if mode == 'steady':
+    emit(float('inf'), rate)
+elif mode == 'bursty':
+    while True:
+        emit(2, rate * 5)
+        time.sleep(8)
+elif mode == 'prompt':
+    while True:
+        emit(every, rate)
+        print("Allow command `npm test`? [allow/deny]", flush=True)
+        shown = time.time()
+        answer = sys.stdin.readline().strip()
+        with open(log, 'a') as f:
+            f.write(json.dumps({'pane': pane, 'shown': shown, 'latency': time.time() - shown,
+                                'answer': answer}) + "\n")
+        print(f"answered {answer!r}", flush=True)
+else:
+    print("[silent] waiting", flush=True)
+    while True:
+        time.sleep(3600)
+'''
+
+
+def _proc_sample(pid):
+    """(cpu seconds, rss kB, peak rss kB, context switches of all threads)"""
+    ticks = os.sysconf('SC_CLK_TCK')
+    with open(f'/proc/{pid}/stat') as f:
+        fields = f.read().rsplit(')', 1)[1].split()
+    cpu = (int(fields[11]) + int(fields[12])) / ticks
+    rss = peak = 0
+    with open(f'/proc/{pid}/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                rss = int(line.split()[1])
+            elif line.startswith('VmHWM:'):
+                peak = int(line.split()[1])
+    switches = 0
+    for tid in os.listdir(f'/proc/{pid}/task'):
+        try:
+            with open(f'/proc/{pid}/task/{tid}/status') as f:
+                for line in f:
+                    if line.startswith(('voluntary_ctxt_switches:', 'nonvoluntary_ctxt_switches:')):
+                        switches += int(line.split()[1])
+        except OSError:
+            pass
+    return cpu, rss, peak, switches
+
+
+def run_child(args):
+    """The app itself: start_pets() with yaruki on, reporting its counters at the end"""
+    import config
+    for override in args.set:
+        # Before the app modules import their settings from config
+        name, _, value = override.partition('=')
+        setattr(config, name, json.loads(value))
+    from PyQt6.QtCore import QTimer
+    from PyQt6.QtWidgets import QApplication
+    import process_monitor
+    import yadon_pet
+    from heartbeat import get_heartbeat
+    from utils import tmux_call_count
+
+    if args.all_pets:
+        # One pet per session so that every pane is watched
+        yadon_pet.MAX_YADON_COUNT = process_monitor.MAX_YADON_COUNT = args.sessions
+
+    app = QApplication(sys.argv)
+    pets, monitor = yadon_pet.start_pets()
+    for pet in pets:
+        pet.yaruki_switch_mode = True
+
+    marks = {}
+
+    def mark():
+        marks['calls'] = tmux_call_count()
+        marks['beats'] = get_heartbeat().wakeups
+        marks['t'] = time.monotonic()
+
+    QTimer.singleShot(int(args.settle * 1000), mark)
+    QTimer.singleShot(int((args.settle + args.duration) * 1000), app.quit)
+    app.exec()
+
+    elapsed = time.monotonic() - marks['t']
+    print(json.dumps({
+        'pets': len(pets),
+        'tmux_calls_per_sec': (tmux_call_count() - marks['calls']) / elapsed,
+        'heartbeat_wakeups_per_sec': (get_heartbeat().wakeups - marks['beats']) / elapsed,
+    }))
+    return 0
+
+
+def _start_server(tmux, args, tmpdir, latency_log):
+    generator = os.path.join(tmpdir, 'claude')
+    with open(generator, 'w') as f:
+        f.write(GENERATOR)
+    os.chmod(generator, 0o755)
+    base = [tmux, '-L', SOCKET, '-f', '/dev/null']
+    mix = [m for m in args.mix.split(',') if m]
+    index = 0
+    for s in range(args.sessions):
+        name = f'bench{s}'
+        for p in range(args.panes):
+            mode = mix[index % len(mix)]
+            index += 1
+            command = f'{generator} {mode} {args.rate} {args.prompt_every} {latency_log}'
+            if p == 0:
+                subprocess.run(base + ['new-session', '-d', '-s', name, '-x', '240', '-y', '120', command],
+                               check=True)
+            else:
+                subprocess.run(base + ['split-window', '-t', name, command], check=True)
+                subprocess.run(base + ['select-layout', '-t', name, 'tiled'], check=True)
+    out = subprocess.run(base + ['display-message', '-p', '#{pid}'], capture_output=True, text=True)
+    return int(out.stdout.strip())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=4)
+    parser.add_argument('--panes', type=int, default=4, help='panes per session')
+    parser.add_argument('--mix', default=','.join(MODES), help=f'comma-separated generator modes ({", ".join(MODES)})')
+    parser.add_argument('--rate', type=float, default=5.0, help='lines per second of steady output')
+    parser.add_argument('--prompt-every', type=float, default=5.0, help='seconds of output before each prompt')
+    parser.add_argument('--settle', type=float, default=5.0, help='seconds of startup excluded from the measurements')
+    parser.add_argument('--duration', type=float, default=60.0, help='seconds measured')
+    parser.add_argument('--all-pets', action='store_true', help='one pet per session beyond MAX_YADON_COUNT')
+    parser.add_argument('--json', metavar='PATH', help='write results as JSON')
+    parser.add_argument('--set', action='append', default=[], metavar='NAME=JSON',
+                        help='override a config setting in the app, e.g. TMUX_ACTIVITY_EVENTS=false')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return run_child(args)
+
+    if any(m not in MODES for m in args.mix.split(',')):
+        parser.error(f'--mix takes {", ".join(MODES)}')
+    real_tmux = shutil.which('tmux')
+    if not real_tmux:
+        print('tmux not found; skipping')
+        return 0
+
+    tmpdir = tempfile.mkdtemp(prefix='yadon-load-')
+    latency_log = os.path.join(tmpdir, 'latency.jsonl')
+    subprocess.run([real_tmux, '-L', SOCKET, 'kill-server'], capture_output=True)
+    try:
+        server_pid = _start_server(real_tmux, args, tmpdir, latency_log)
+        env = dict(os.environ, YADON_TMUX=real_tmux, YADON_TMUX_SOCKET=SOCKET)
+        env.pop('TMUX', None)
+        cmd = [sys.executable, os.path.abspath(__file__), '--child', '--sessions', str(args.sessions),
+               '--settle', str(args.settle), '--duration', str(args.duration)]
+        if args.all_pets:
+            cmd.append('--all-pets')
+        for override in args.set:
+            cmd += ['--set', override]
+        child = subprocess.Popen(cmd, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        started = time.monotonic()
+        first = last = None
+        server_first = server_last = None
+        while child.poll() is None:
+            time.sleep(0.5)
+            try:
+                sample = (time.monotonic(),) + _proc_sample(child.pid)
+                server = (time.monotonic(), _proc_sample(server_pid)[0])
+            except (OSError, IndexError):
+                break
+            if not sample[2]:
+                continue  # Exited (a zombie has no memory or threads left)
+            if sample[0] - started >= args.settle:
+                if first is None:
+                    first, server_first = sample, server
+                last, server_last = sample, server
+        out = child.communicate()[0]
+        app = json.loads(out.strip().splitlines()[-1])
+    finally:
+        subprocess.run([real_tmux, '-L', SOCKET, 'kill-server'], capture_output=True)
+
+    latencies = []
+    if os.path.exists(latency_log):
+        with open(latency_log) as f:
+            latencies = sorted(json.loads(line)['latency'] for line in f if line.strip())
+    shutil.rmtree(tmpdir, ignore_errors=True)
+    if first is None or last is first:
+        print('run too short to measure')
+        return 1
+
+    window = last[0] - first[0]
+    prompt_panes = sum(1 for i in range(args.sessions * args.panes)
+                       if args.mix.split(',')[i % len(args.mix.split(','))] == 'prompt')
+    report = {
+        'params': {k: getattr(args, k) for k in ('sessions', 'panes', 'mix', 'rate', 'prompt_every',
+                                                  'settle', 'duration', 'all_pets', 'set')},
+        'pets': app['pets'],
+        'app_cpu_pct': round((last[1] - first[1]) / window * 100, 2),
+        'tmux_server_cpu_pct': round((server_last[1] - server_first[1]) / window * 100, 2),
+        'rss_kb': last[2],
+        'peak_rss_kb': last[3],
+        'context_switches_per_sec': round((last[4] - first[4]) / window, 1),
+        'heartbeat_wakeups_per_sec': round(app['heartbeat_wakeups_per_sec'], 2),
+        'tmux_calls_per_sec': round(app['tmux_calls_per_sec'], 2),
+        'prompt_panes': prompt_panes,
+        'prompts_answered': len(latencies),
+        'latency_p50_sec': round(statistics.median(latencies), 2) if latencies else None,
+        'latency_max_sec': round(latencies[-1], 2) if latencies else None,
+    }
+    print(f"{args.sessions} sessions x {args.panes} panes ({args.mix}), {report['pets']} pets, "
+          f"{window:.0f}s measured")
+    print(f"  app CPU {report['app_cpu_pct']:.2f}%  tmux server CPU {report['tmux_server_cpu_pct']:.2f}%  "
+          f"RSS {report['rss_kb'] / 1024:.1f} MiB (peak {report['peak_rss_kb'] / 1024:.1f})")
+    print(f"  {report['context_switches_per_sec']:.1f} context switches/s, "
+          f"{report['heartbeat_wakeups_per_sec']:.2f} heartbeats/s, {report['tmux_calls_per_sec']:.2f} tmux calls/s")
+    if latencies:
+        print(f"  prompts answered {len(latencies)} (in {prompt_panes} prompt panes), "
+              f"latency p50 {report['latency_p50_sec']:.1f}s max {report['latency_max_sec']:.1f}s")
+    else:
+        print(f"  no prompts answered ({prompt_panes} prompt panes)")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=1)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
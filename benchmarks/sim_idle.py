@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""Simulation: replay hours of pane activity through the idle logic in seconds
+
+Installs a clock.VirtualClock, an InlineRunner and the scripted fake tmux
+(sharing the virtual clock), then starts the app's pets and session monitor
+offscreen and lets VirtualClock.run_until() jump from deadline to deadline:
+heartbeat beats (activity, status and session polls) and idle deadlines.
+Nothing waits on real timers, so --hours of activity take well under a
+minute.
+
+Every pane alternates work bursts and idle gaps drawn from --seed. For each
+gap of at least IDLE_SOFT_THRESHOLD_SEC the expected soft hint is matched
+with the one the app raised; the report shows how many were raised, how
+late they came (relative to output stop + threshold) and how many yaruki
+key sends happened.
+
+    python3 benchmarks/sim_idle.py --sessions 4 --panes 2 --hours 4
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from fake_tmux import FakeTmux  # noqa: E402
+
+
+def make_script(args):
+    """Sessions of panes alternating output bursts and idle gaps"""
+    rng = random.Random(args.seed)
+    horizon = args.hours * 3600
+    script = {'sessions': []}
+    for s in range(args.sessions):
+        panes = []
+        for _ in range(args.panes):
+            segments = []
+            t = rng.uniform(0, 60)
+            while t < horizon:
+                work = rng.uniform(5, args.max_work)
+                segments.append([round(t, 2), round(min(t + work, horizon), 2), args.rate])
+                t += work + rng.expovariate(1 / args.mean_idle)
+            panes.append({'command': 'claude', 'output': segments})
+        script['sessions'].append({'name': f'sim{s}', 'panes': panes})
+    return script
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=4)
+    parser.add_argument('--panes', type=int, default=2, help='panes per session')
+    parser.add_argument('--hours', type=float, default=4.0, help='simulated hours')
+    parser.add_argument('--rate', type=float, default=5.0, help='lines per second while working')
+    parser.add_argument('--max-work', type=float, default=600.0, help='longest work burst (s)')
+    parser.add_argument('--mean-idle', type=float, default=120.0, help='mean idle gap (s)')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    import clock
+    import config
+    import utils
+    from tmux_runner import InlineRunner, set_tmux_runner
+
+    if not config.HEARTBEAT_ENABLED:
+        print('the simulation needs HEARTBEAT_ENABLED')
+        return 1
+    vclock = clock.VirtualClock()
+    clock.set_clock(vclock)
+    set_tmux_runner(InlineRunner())
+    script = make_script(args)
+    fake = FakeTmux(script, clock=clock.monotonic, epoch=0)
+    utils.set_tmux_backend(fake)
+
+    from PyQt6.QtWidgets import QApplication
+    import process_monitor
+    import yadon_pet
+    from heartbeat import get_heartbeat
+
+    # Watch every session, not just the first MAX_YADON_COUNT
+    yadon_pet.MAX_YADON_COUNT = process_monitor.MAX_YADON_COUNT = args.sessions
+    app = QApplication(sys.argv)  # noqa: F841 (widgets need it)
+    pets, monitor = yadon_pet.start_pets()
+
+    hints = []  # (t, pane_id)
+    seen = set()
+
+    def watch_hints(pet):
+        apply = pet._apply_cli_activity
+
+        def apply_and_record(observations):
+            apply(observations)
+            for pane_id, st in pet.pane_state.items():
+                if st.get('soft_notified') and (pane_id, st['last_change_ts']) not in seen:
+                    seen.add((pane_id, st['last_change_ts']))
+                    hints.append((clock.monotonic(), pane_id))
+        return apply_and_record
+
+    for pet in pets:
+        # Only the monitoring timers matter here; skip animation frames
+        for name in ('timer', 'action_timer', '_top_keepalive'):
+            getattr(pet, name).stop()
+        if pet.bubble:  # Welcome bubble; its close timer never runs here
+            pet.bubble.close()
+            pet.bubble = None
+        pet.yaruki_switch_mode = True
+        pet._show_bubble = lambda *args, **kwargs: None
+        pet._apply_cli_activity = watch_hints(pet)
+
+    started = time.perf_counter()
+    dispatches = vclock.run_until(args.hours * 3600)
+    wall = time.perf_counter() - started
+
+    # Expected hints: every gap of at least the soft threshold
+    soft = config.IDLE_SOFT_THRESHOLD_SEC
+    expected = {}
+    for entry in fake.live_panes():
+        _, session, _, pane, pane_id = entry
+        segments = pane['output']
+        ends = [seg[1] for i, seg in enumerate(segments)
+                if (segments[i + 1][0] if i + 1 < len(segments) else args.hours * 3600) - seg[1] >= soft]
+        expected[pane_id] = ends
+    lateness = []
+    matched = 0
+    for t, pane_id in hints:
+        stops = [end for end in expected.get(pane_id, []) if end <= t]
+        if stops:
+            matched += 1
+            lateness.append(t - stops[-1] - soft)
+    total_expected = sum(len(v) for v in expected.values())
+
+    print(f"{args.sessions} sessions x {args.panes} panes, {args.hours:g} h simulated in {wall:.1f} s wall "
+          f"({args.hours * 3600 / wall:.0f}x)")
+    print(f"  {dispatches} dispatches, {get_heartbeat().wakeups} heartbeats, {fake.calls} tmux commands")
+    print(f"  soft hints: {matched} raised / {total_expected} idle gaps >= {soft}s")
+    if lateness:
+        lateness.sort()
+        print(f"  hint lateness: p50 {statistics.median(lateness):.1f}s  "
+              f"p90 {lateness[int(len(lateness) * 0.9)]:.1f}s  max {lateness[-1]:.1f}s")
+    print(f"  yaruki key sends: {len(fake.sent)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
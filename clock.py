@@ -0,0 +1,102 @@
+"""Injectable monotonic clock for Yadon Desktop Pet
+
+Idle thresholds, deadlines, snapshot ages and the heartbeat read time through
+monotonic() rather than time.time(), so NTP steps and wall-clock jumps do not
+fire or postpone notifications. A simulation installs a VirtualClock with
+set_clock(); its run_until() then jumps from one scheduled deadline to the
+next (heartbeat beats, idle deadlines), replaying hours of pane activity
+without waiting on real timers.
+"""
+
+import time
+import weakref
+
+
+class SystemClock:
+    """time.monotonic(), plus time.time() for comparing with tmux timestamps"""
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def wall(self) -> float:
+        return time.time()
+
+
+class VirtualClock:
+    """Clock that only moves when told to
+
+    Args:
+        start: Initial reading in seconds
+        wall_epoch: wall() reading at monotonic() == 0
+    """
+
+    def __init__(self, start=0.0, wall_epoch=0.0):
+        self.now = float(start)
+        self.wall_epoch = wall_epoch
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def wall(self) -> float:
+        return self.wall_epoch + self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+    def run_until(self, end) -> int:
+        """Run every registered scheduler's deadlines up to `end`, in time order
+
+        Time jumps straight to each deadline. Returns the number of
+        dispatches; the clock reads `end` afterwards.
+        """
+        dispatches = 0
+        while True:
+            earliest = None
+            for scheduler in list(_schedulers):
+                deadline = scheduler.next_deadline()
+                if deadline is not None and (earliest is None or deadline < earliest[0]):
+                    earliest = (deadline, scheduler)
+            if earliest is None or earliest[0] > end:
+                break
+            self.now = max(self.now, earliest[0])
+            earliest[1].run_due()
+            dispatches += 1
+        self.now = max(self.now, end)
+        return dispatches
+
+
+_clock = SystemClock()
+# Deadline sources a VirtualClock drives: objects with next_deadline() (a
+# monotonic() value or None) and run_due()
+_schedulers = weakref.WeakSet()
+
+
+def monotonic() -> float:
+    """Current reading of the installed clock, in seconds"""
+    return _clock.monotonic()
+
+
+def wall() -> float:
+    """Wall-clock seconds of the installed clock
+
+    Only for comparing with timestamps tmux reports (e.g. window_activity);
+    durations and deadlines use monotonic().
+    """
+    return _clock.wall()
+
+
+def get_clock():
+    return _clock
+
+
+def set_clock(clock):
+    """Install a clock (SystemClock or VirtualClock) for the whole process
+
+    Install it before the heartbeat and the idle scheduler are created.
+    """
+    global _clock
+    _clock = clock
+
+
+def register_scheduler(scheduler):
+    _schedulers.add(scheduler)
@@ -95,6 +95,22 @@ PID_FONT_SIZE = 12
 FACE_ANIMATION_INTERVAL = 500  # milliseconds (normal speed)
 FACE_ANIMATION_INTERVAL_FAST = 250  # milliseconds (やる気スイッチ ON)
 
+# Global heartbeat: every periodic timer (animation, polls, menu blink) is
+# dispatched from one Qt timer. Due times are snapped to a grid of
+# min(interval, HEARTBEAT_ALIGN_MS) so equal intervals share a wakeup, and
+# anything due within HEARTBEAT_QUANTUM_MS fires together. A timer may also
+# fire up to HEARTBEAT_SLACK of its interval early or late to join a wakeup
+# that happens anyway (like Qt's coarse timers), so staggered polls ride on
+# the animation beat instead of waking the process themselves.
+HEARTBEAT_ENABLED = True
+HEARTBEAT_QUANTUM_MS = 50
+HEARTBEAT_ALIGN_MS = 1000
+HEARTBEAT_SLACK = 0.05
+# Each pet's tmux/activity/status polls get a random phase in
+# [0, POLL_PHASE_JITTER_MS) so pets created together do not query tmux in
+# lockstep (animation stays aligned). 0 disables the stagger.
+POLL_PHASE_JITTER_MS = 1000
+
 # Random action intervals (how often Yadon does something)
 RANDOM_ACTION_MIN_INTERVAL = 3000000  # 50 minutes
 RANDOM_ACTION_MAX_INTERVAL = 4200000  # 70 minutes (average ~1 hour)
@@ -140,6 +156,80 @@ CLAUDE_CHECK_INTERVAL = 5000  # 5 seconds (check tmux sessions)
 ACTIVITY_CHECK_INTERVAL_MS = 10000  # 10 seconds (check CLI activity)
 OUTPUT_IDLE_THRESHOLD_SEC = 60  # 60 seconds of no output -> notify (legacy)
 
+# Adaptive polling: (min_ms, max_ms) per subsystem. A timer runs at min_ms
+# after any change and backs off by ADAPTIVE_POLL_BACKOFF per unchanged poll.
+ADAPTIVE_POLL_INTERVALS = {
+    'status': (1000, 5000),  # Status label ("session window pane")
+    'tmux': (CLAUDE_CHECK_INTERVAL, 20000),  # Per-pet tmux up/down check
+    'sessions': (5000, 20000),  # ProcessMonitor session count
+    # The same while tmux hooks push session changes
+    'tmux_hooked': (20000, 60000),
+    'sessions_hooked': (20000, 60000),
+    'activity': (ACTIVITY_CHECK_INTERVAL_MS, 30000),  # Pane discovery / idle check
+}
+ADAPTIVE_POLL_BACKOFF = 2.0
+STATS_LOG_INTERVAL_MS = 60000  # Write monitoring stats to the debug log
+
+# Persistent tmux control-mode connection (tmux -C) shared by all pets.
+# When disabled or unavailable every call spawns a tmux process instead.
+TMUX_CONTROL_MODE = True
+TMUX_CONTROL_TIMEOUT_SEC = 5  # Max wait for a single command reply
+TMUX_CONTROL_RECONNECT_SEC = 10  # Min delay between reconnect attempts
+# Worker threads that run tmux queries off the Qt main thread
+TMUX_WORKER_THREADS = 2
+
+# Track pane output from control-mode %output notifications instead of
+# hashing capture-pane snapshots (falls back to capturing when unavailable)
+TMUX_ACTIVITY_EVENTS = True
+TMUX_STATUS_RESYNC_SEC = 10  # Re-read the status label at least this often
+# Without %output, tell pane output from the modification time of the pane's
+# tty (one stat() per pane) instead of capturing and hashing its content.
+# Linux only moves tty timestamps to a new 8-second window, so the last output
+# is known to that granularity.
+TTY_ACTIVITY_DETECTION = True
+TTY_MTIME_GRANULARITY_SEC = 8
+# tmux hooks (session-created, session-closed, pane-exited, alert-silence)
+# push events to a Unix socket the app listens on; the session polls then
+# only back them up ('*_hooked' intervals below)
+TMUX_HOOK_EVENTS = True
+TMUX_HOOK_INDEX = 79  # Slot taken in each hook array; the user's hooks stay
+# Opt-in: tmux watches the monitored windows for silence (monitor-silence at
+# IDLE_SOFT_THRESHOLD_SEC) and pushes alert-silence. tmux then also flags
+# silent windows and shows "Silence in window" messages.
+TMUX_SILENCE_ALERTS = False
+
+# All pets and the ProcessMonitor share one `list-panes -a` snapshot per tick;
+# a snapshot younger than this is reused instead of querying tmux again
+TMUX_SNAPSHOT_MAX_AGE_MS = 900
+
+# Every capture-pane a tick needs goes out as one tmux command list; the
+# contents are shared by the activity check, prompt detection and the yaruki
+# actions while younger than PANE_CAPTURE_MAX_AGE_MS
+PANE_CAPTURE_LINES = 200
+PANE_CAPTURE_MAX_AGE_MS = 900
+# Skip capture-pane for panes whose history size, cursor and window activity
+# (from the shared list-panes snapshot) show no change since their last capture
+PANE_META_CHANGE_DETECTION = True
+# Opt-in: stream each relevant pane's output through `tmux pipe-pane -o` into
+# a FIFO the app reads; idle and prompt detection then use the latest
+# PANE_STREAM_TAIL_BYTES of output instead of polling and capturing
+PANE_STREAMING = False
+PANE_STREAM_TAIL_BYTES = 8192
+
+# One process scan per monitoring tick is shared by every pane and pet;
+# the index expires (ends its tick) after this long
+PROCESS_INDEX_MAX_AGE_MS = 1000
+# 'auto' reads /proc directly where it exists (Linux) and uses ps elsewhere;
+# 'proc' or 'ps' force a backend
+PROCESS_SCAN_BACKEND = 'auto'
+# How many generations below a pane's shell to search for a wrapped CLI
+# (e.g. shell -> direnv exec -> npx -> node .../claude)
+PROCESS_TREE_MAX_DEPTH = 6
+# Pane relevance is cached per (pane_id, pane_pid, pane_current_command).
+# Panes without a CLI are re-inspected this often in case one was started
+# in the background without changing the pane's foreground command.
+RELEVANCE_RECHECK_SEC = 60
+
 # Two-stage idle thresholds
 IDLE_SOFT_THRESHOLD_SEC = 10  # First gentle nudge
 IDLE_FORCE_THRESHOLD_SEC = 30  # 30 seconds for strong action
@@ -160,3 +250,19 @@ YARUKI_SEND_KEYS = ['Up', 'Enter']
 
 # Debug log location
 DEBUG_LOG = '/tmp/yadon_debug.log'
+# Minimum level written to DEBUG_LOG: 'DEBUG' traces every poll, 'INFO'
+# keeps only stats and lifecycle events. YADON_DEBUG=1 starts with DEBUG;
+# sending SIGUSR1 toggles DEBUG tracing while running.
+DEBUG_LOG_LEVEL = 'INFO'
+# The log rotates at this size, keeping DEBUG_LOG_BACKUPS old files
+DEBUG_LOG_MAX_BYTES = 1024 * 1024
+DEBUG_LOG_BACKUPS = 2
+
+# Latency histograms for tmux commands, activity checks and painting.
+# Sending SIGUSR2 writes them to METRICS_DUMP_PATH as JSON.
+METRICS_ENABLED = True
+METRICS_DUMP_PATH = '/tmp/yadon_metrics.json'
+# Bucket upper bounds in milliseconds (plus an overflow bucket)
+METRICS_BUCKETS_MS = (
+    0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000,
+)
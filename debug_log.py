@@ -0,0 +1,161 @@
+"""Buffered debug logging for Yadon Desktop Pet
+
+Callers only append (time, level, text) to an in-memory queue; a background
+thread drains it in batches, writes each batch to DEBUG_LOG with a single
+flush and rotates the file by size. Messages below the current level return
+after one comparison, so per-poll tracing is free in production. Tracing can
+be switched on at runtime with set_debug_enabled() (SIGUSR1 toggles it,
+YADON_DEBUG=1 enables it at start).
+"""
+
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+from config import DEBUG_LOG, DEBUG_LOG_LEVEL, DEBUG_LOG_MAX_BYTES, DEBUG_LOG_BACKUPS
+
+DEBUG = logging.DEBUG
+INFO = logging.INFO
+WARNING = logging.WARNING
+ERROR = logging.ERROR
+
+# Longest a queued line waits before it reaches the file
+FLUSH_INTERVAL_SEC = 0.5
+# Lines per write; bounds how far one batch can overshoot the rotation size
+_MAX_BATCH = 256
+
+_base_level = logging.getLevelName(str(DEBUG_LOG_LEVEL).upper())
+if not isinstance(_base_level, int):
+    _base_level = INFO
+if os.environ.get('YADON_DEBUG', '') not in ('', '0'):
+    _base_level = DEBUG
+_level = _base_level
+
+_queue = queue.SimpleQueue()
+_writer = None
+_closed = False
+_setup_lock = threading.Lock()
+_STOP = object()
+
+
+class _LogWriter(threading.Thread):
+    """Drain the queue into a size-rotated file"""
+
+    def __init__(self, path, max_bytes, backups):
+        super().__init__(name='yadon-log', daemon=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._file = None
+
+    def run(self):
+        stopping = False
+        while not stopping:
+            try:
+                batch = [_queue.get(timeout=FLUSH_INTERVAL_SEC)]
+            except queue.Empty:
+                continue
+            # Take whatever else piled up so the batch costs one write + flush
+            while len(batch) < _MAX_BATCH:
+                try:
+                    batch.append(_queue.get_nowait())
+                except queue.Empty:
+                    break
+            if _STOP in batch:
+                stopping = True
+                batch = [item for item in batch if item is not _STOP]
+            self._write(batch)
+        if self._file is not None:
+            self._file.close()
+
+    def _write(self, batch):
+        if not batch:
+            return
+        lines = []
+        for stamp, level, text in batch:
+            when = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(stamp))
+            lines.append(f"{when}.{int(stamp % 1 * 1000):03d} {logging.getLevelName(level)} {text}\n")
+        try:
+            if self._file is None:
+                self._file = open(self.path, 'a', encoding='utf-8')
+            self._file.write(''.join(lines))
+            self._file.flush()
+            if self.max_bytes > 0 and self._file.tell() >= self.max_bytes:
+                self._rotate()
+        except Exception:
+            pass
+
+    def _rotate(self):
+        """debug.log -> debug.log.1 -> ... -> debug.log.N (oldest dropped)"""
+        self._file.close()
+        self._file = None
+        if self.backups <= 0:
+            os.truncate(self.path, 0)
+            return
+        for i in range(self.backups - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+
+def _start():
+    """Start the writer thread (first use only)"""
+    global _writer
+    with _setup_lock:
+        if _writer is not None or _closed:
+            return
+        _writer = _LogWriter(DEBUG_LOG, DEBUG_LOG_MAX_BYTES, DEBUG_LOG_BACKUPS)
+        _writer.start()
+        atexit.register(shutdown)
+
+
+def log(component: str, message: str, level=DEBUG):
+    """Queue a message for the debug log
+
+    Args:
+        component: Name of the component (e.g., 'yadon_pet', 'process_monitor')
+        message: Message text
+        level: logging level; dropped immediately when below the current level
+    """
+    if level < _level:
+        return
+    if _writer is None:
+        if _closed:
+            return
+        _start()
+    _queue.put((time.time(), level, f"[{component}] {message}"))
+
+
+def is_enabled(level=DEBUG) -> bool:
+    """Whether messages at level are currently written (guard costly messages)"""
+    return level >= _level
+
+
+def set_level(level):
+    global _level
+    _level = level
+
+
+def set_debug_enabled(enabled: bool):
+    """Switch per-poll debug tracing on or off at runtime"""
+    set_level(DEBUG if enabled else max(_base_level, INFO))
+    log('debug_log', f"debug tracing {'enabled' if enabled else 'disabled'}", INFO)
+
+
+def toggle_debug():
+    set_debug_enabled(_level > DEBUG)
+
+
+def shutdown(timeout=2.0):
+    """Write out queued messages and stop the writer thread"""
+    global _closed
+    with _setup_lock:
+        _closed = True
+        writer = _writer
+    if writer is not None and writer.is_alive():
+        _queue.put(_STOP)
+        writer.join(timeout)
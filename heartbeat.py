@@ -0,0 +1,208 @@
+"""Global heartbeat for Yadon Desktop Pet
+
+All periodic work (face animation, tmux polls, menu cursor blink, ...) is
+multiplexed onto one Qt timer. Due times are snapped to a shared grid so
+that timers with the same interval fire in the same wakeup: every pet's
+animation frame updates together and the process wakes once per grid step
+instead of once per timer. Each timer also has a slack window around its due
+time; the heartbeat wakes at the end of the earliest window and fires every
+timer whose window has opened, so polls with their own phase join the next
+animation beat.
+
+HeartbeatTimer mirrors the parts of the QTimer API the app uses, so call
+sites only change the class they instantiate.
+"""
+
+import math
+import random
+import weakref
+
+from PyQt6.QtCore import QObject, Qt, QTimer, pyqtSignal
+
+from clock import monotonic, register_scheduler
+from config import (
+    HEARTBEAT_ENABLED, HEARTBEAT_QUANTUM_MS, HEARTBEAT_ALIGN_MS, HEARTBEAT_SLACK, POLL_PHASE_JITTER_MS,
+)
+from utils import log_debug
+
+
+def _log_debug(message: str):
+    log_debug('heartbeat', message)
+
+
+class Heartbeat(QObject):
+    """Dispatch every active HeartbeatTimer from a single precise timer"""
+
+    def __init__(self):
+        super().__init__()
+        self._timers = weakref.WeakSet()
+        self._epoch = monotonic()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self._tick)
+        self.wakeups = 0
+        register_scheduler(self)
+
+    def now_ms(self) -> float:
+        return (monotonic() - self._epoch) * 1000
+
+    def next_due(self, interval_ms, phase_ms=0, after=None) -> float:
+        """Due time one interval after `after` (default: now), snapped to the shared grid"""
+        if after is None:
+            after = self.now_ms()
+        # Grid step: the interval itself for short timers (so equal intervals
+        # line up), HEARTBEAT_ALIGN_MS for long ones (so they share seconds).
+        # Snapping every beat keeps odd adaptive intervals on the grid too.
+        step = max(HEARTBEAT_QUANTUM_MS, min(interval_ms, HEARTBEAT_ALIGN_MS))
+        step = math.ceil(step / HEARTBEAT_QUANTUM_MS) * HEARTBEAT_QUANTUM_MS
+        target = after + interval_ms - phase_ms
+        return math.ceil(target / step) * step + phase_ms
+
+    def add(self, timer):
+        self._timers.add(timer)
+        self._arm()
+
+    def remove(self, timer):
+        self._timers.discard(timer)
+        self._arm()
+
+    @staticmethod
+    def _slack(timer) -> float:
+        return timer._interval * HEARTBEAT_SLACK
+
+    def _wake_at(self):
+        """Latest time (ms) that still fires every timer within its slack, or None"""
+        late = [t._due + self._slack(t) for t in self._timers if t._active]
+        return min(late) if late else None
+
+    def _arm(self):
+        wake_at = self._wake_at()
+        if wake_at is None:
+            self._timer.stop()
+            return
+        delay = max(0, math.ceil(wake_at - self.now_ms()))
+        self._timer.start(delay)
+
+    def next_deadline(self):
+        """Next wakeup as a clock.monotonic() value, or None"""
+        wake_at = self._wake_at()
+        return self._epoch + wake_at / 1000 if wake_at is not None else None
+
+    def run_due(self):
+        """Fire the timers that are due now (a VirtualClock calls this)"""
+        self._tick()
+
+    def _tick(self):
+        self.wakeups += 1
+        # Everything due within the current quantum, or whose slack window
+        # has opened, fires in this wakeup
+        horizon = self.now_ms() + HEARTBEAT_QUANTUM_MS / 2
+        fired = []
+        for timer in list(self._timers):
+            if not timer._active or timer._due - self._slack(timer) > horizon:
+                continue
+            if timer._single_shot:
+                timer._active = False
+            else:
+                # Beats missed while the loop was busy are skipped, not replayed
+                after = timer._due if timer._due + timer._interval > horizon else horizon
+                timer._due = self.next_due(timer._interval, timer._phase_ms, after)
+            fired.append(timer)
+        self._arm()
+        for timer in fired:
+            try:
+                timer.timeout.emit()
+            except RuntimeError:
+                # The owning widget was deleted without stopping its timer
+                self._timers.discard(timer)
+            except Exception as e:
+                _log_debug(f"timer callback error: {e}")
+
+    def wakeups_per_second(self) -> float:
+        elapsed = max(self.now_ms() / 1000, 1e-6)
+        return self.wakeups / elapsed
+
+
+_heartbeat = None
+
+
+def get_heartbeat() -> Heartbeat:
+    """Return the shared heartbeat (create it on the GUI thread first)"""
+    global _heartbeat
+    if _heartbeat is None:
+        _heartbeat = Heartbeat()
+    return _heartbeat
+
+
+def random_phase() -> int:
+    """Random grid offset in ms for polls that should not fire in lockstep"""
+    if POLL_PHASE_JITTER_MS <= 0:
+        return 0
+    return random.randrange(0, POLL_PHASE_JITTER_MS, HEARTBEAT_QUANTUM_MS)
+
+
+class HeartbeatTimer(QObject):
+    """QTimer look-alike scheduled by the global heartbeat
+
+    With HEARTBEAT_ENABLED off it simply wraps its own QTimer.
+    """
+
+    timeout = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._interval = 0
+        self._phase_ms = 0
+        self._active = False
+        self._single_shot = False
+        self._due = 0.0
+        self._qtimer = None
+        if not HEARTBEAT_ENABLED:
+            self._qtimer = QTimer(self)
+            self._qtimer.timeout.connect(self.timeout)
+
+    def start(self, msec=None):
+        if msec is not None:
+            self._interval = max(int(msec), 1)
+        if self._qtimer is not None:
+            self._qtimer.start(self._interval)
+            return
+        heartbeat = get_heartbeat()
+        self._active = True
+        self._due = heartbeat.next_due(self._interval, self._phase_ms)
+        heartbeat.add(self)
+
+    def stop(self):
+        if self._qtimer is not None:
+            self._qtimer.stop()
+            return
+        if self._active:
+            self._active = False
+            get_heartbeat().remove(self)
+
+    def setInterval(self, msec):
+        self._interval = max(int(msec), 1)
+        if self._qtimer is not None:
+            self._qtimer.setInterval(self._interval)
+        elif self._active:
+            self.start()
+
+    def interval(self) -> int:
+        return self._interval
+
+    def setPhase(self, phase_ms):
+        """Offset this timer's beats from the shared grid (heartbeat only)"""
+        self._phase_ms = int(phase_ms)
+        if self._active:
+            self.start()
+
+    def isActive(self) -> bool:
+        if self._qtimer is not None:
+            return self._qtimer.isActive()
+        return self._active
+
+    def setSingleShot(self, single_shot):
+        self._single_shot = bool(single_shot)
+        if self._qtimer is not None:
+            self._qtimer.setSingleShot(single_shot)
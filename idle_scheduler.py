@@ -0,0 +1,108 @@
+"""Deadline scheduler for idle thresholds in Yadon Desktop Pet
+
+Each pane's next soft/force idle deadline lives in one min-heap shared by
+all pets, and a single single-shot timer is armed for the earliest one.
+Notifications therefore fire on time instead of on the next activity poll,
+and panes that are simply idle cost nothing between deadlines.
+"""
+
+import heapq
+import itertools
+
+from PyQt6.QtCore import QObject, Qt, QTimer
+
+from clock import monotonic, register_scheduler
+from utils import log_debug
+
+
+def _log_debug(message: str):
+    log_debug('idle_scheduler', message)
+
+
+class IdleScheduler(QObject):
+    """Min-heap of (deadline, key) driving one precise single-shot timer"""
+
+    def __init__(self):
+        super().__init__()
+        self._heap = []  # (deadline, seq, key); stale items are skipped lazily
+        self._entries = {}  # key -> (deadline, callback)
+        self._seq = itertools.count()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        # Coarse timers may fire up to 5% early, which matters for 30 s waits
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self._fire)
+        register_scheduler(self)
+
+    def schedule(self, key, deadline, callback):
+        """(Re)schedule callback() for key at deadline (a clock.monotonic() value)"""
+        current = self._entries.get(key)
+        if current is not None and current[0] == deadline and current[1] == callback:
+            return
+        self._entries[key] = (deadline, callback)
+        heapq.heappush(self._heap, (deadline, next(self._seq), key))
+        if len(self._heap) > 4 * len(self._entries) + 64:
+            self._compact()
+        self._arm()
+
+    def cancel(self, key):
+        if self._entries.pop(key, None) is not None:
+            self._arm()
+
+    def pending(self):
+        return len(self._entries)
+
+    def _is_current(self, item) -> bool:
+        entry = self._entries.get(item[2])
+        return entry is not None and entry[0] == item[0]
+
+    def _compact(self):
+        self._heap = [item for item in self._heap if self._is_current(item)]
+        heapq.heapify(self._heap)
+
+    def _arm(self):
+        while self._heap and not self._is_current(self._heap[0]):
+            heapq.heappop(self._heap)
+        if not self._heap:
+            self._timer.stop()
+            return
+        delay_ms = max(0, int((self._heap[0][0] - monotonic()) * 1000) + 1)
+        self._timer.start(delay_ms)
+
+    def next_deadline(self):
+        """Earliest pending deadline, or None"""
+        while self._heap and not self._is_current(self._heap[0]):
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def run_due(self):
+        """Run the callbacks whose deadline has passed (a VirtualClock calls this)"""
+        self._fire()
+
+    def _fire(self):
+        now = monotonic()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            item = heapq.heappop(self._heap)
+            if not self._is_current(item):
+                continue
+            _, callback = self._entries.pop(item[2])
+            if callback not in due:
+                due.append(callback)
+        self._arm()
+        for callback in due:
+            try:
+                callback()
+            except Exception as e:
+                _log_debug(f"deadline callback error: {e}")
+
+
+_scheduler = None
+
+
+def get_idle_scheduler() -> IdleScheduler:
+    """Return the shared scheduler (create it on the GUI thread first)"""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = IdleScheduler()
+    return _scheduler
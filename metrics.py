@@ -0,0 +1,162 @@
+"""Latency histograms for Yadon Desktop Pet
+
+Hot paths (every tmux command by subcommand, pane discovery, activity
+checks, paintEvent per widget class, bubble creation) record their duration
+into fixed-bucket histograms: a bisect and a few adds under an uncontended
+lock per sample. dump_metrics() writes all histograms to a JSON file; main()
+calls it on SIGUSR2.
+"""
+
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+
+import debug_log
+from config import METRICS_ENABLED, METRICS_BUCKETS_MS, METRICS_DUMP_PATH
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency counters (milliseconds)
+
+    Args:
+        bounds: Ascending bucket upper bounds; a final overflow bucket
+            catches everything slower
+    """
+
+    def __init__(self, bounds=METRICS_BUCKETS_MS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, ms):
+        index = bisect.bisect_left(self.bounds, ms)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total_ms += ms
+            if ms > self.max_ms:
+                self.max_ms = ms
+
+    def percentile(self, q) -> float:
+        """Upper bound of the bucket holding the q-th quantile (0 < q <= 1)"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                return self.bounds[index] if index < len(self.bounds) else self.max_ms
+        return self.max_ms
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                'count': self.count,
+                'total_ms': round(self.total_ms, 3),
+                'mean_ms': round(self.total_ms / self.count, 4) if self.count else 0.0,
+                'max_ms': round(self.max_ms, 3),
+                'p50_ms': self.percentile(0.5),
+                'p90_ms': self.percentile(0.9),
+                'p99_ms': self.percentile(0.99),
+                'buckets': [[le, n] for le, n in zip(list(self.bounds) + ['inf'], self.counts) if n],
+            }
+
+
+_histograms = {}
+_histograms_lock = threading.Lock()
+
+
+def histogram(name) -> LatencyHistogram:
+    hist = _histograms.get(name)
+    if hist is None:
+        with _histograms_lock:
+            hist = _histograms.setdefault(name, LatencyHistogram())
+    return hist
+
+
+def record(name, ms):
+    """Add one duration sample (milliseconds) to the named histogram"""
+    if METRICS_ENABLED:
+        histogram(name).record(ms)
+
+
+class timed:
+    """Context manager recording the block's duration under name"""
+
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, (time.perf_counter() - self.start) * 1000)
+        return False
+
+
+def instrumented(name):
+    """Decorator recording every call's duration under name"""
+    def decorate(fn):
+        if not METRICS_ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                histogram(name).record((time.perf_counter() - start) * 1000)
+        return wrapper
+    return decorate
+
+
+def snapshot() -> dict:
+    """{name: summary} for every histogram recorded so far"""
+    with _histograms_lock:
+        items = sorted(_histograms.items())
+    return {name: hist.summary() for name, hist in items}
+
+
+def dump_metrics(path=None) -> str:
+    """Write all histograms as JSON
+
+    Args:
+        path: Output file (default: METRICS_DUMP_PATH)
+
+    Returns:
+        The path written, or None when it could not be written (the error
+        goes to the debug log; a signal-triggered dump must not raise)
+    """
+    path = path or METRICS_DUMP_PATH
+    data = {
+        'pid': os.getpid(),
+        'dumped_at': time.time(),
+        'bucket_bounds_ms': list(METRICS_BUCKETS_MS),
+        'histograms': snapshot(),
+    }
+    tmp = f"{path}.tmp"
+    try:
+        with open(tmp, 'w') as f:
+            json.dump(data, f, indent=1)
+        os.replace(tmp, path)
+    except OSError as e:
+        debug_log.log('metrics', f"writing latency histograms to {path} failed: {e}", debug_log.WARNING)
+        return None
+    debug_log.log('metrics', f"latency histograms written to {path}", debug_log.INFO)
+    return path
+
+
+def reset():
+    with _histograms_lock:
+        _histograms.clear()
@@ -0,0 +1,145 @@
+"""Batched pane capture and per-tick content store for Yadon Desktop Pet
+
+Every pane a tick needs is captured by one tmux invocation: the
+capture-pane commands are chained with ``;`` and each one is preceded by a
+display-message marker that splits the combined output back into panes. The
+results are kept in a store for the rest of the tick, so the activity check,
+prompt detection and the yaruki actions read the same capture instead of
+each running their own.
+"""
+
+import os
+import secrets
+import threading
+
+from clock import monotonic
+from config import PANE_CAPTURE_LINES, PANE_CAPTURE_MAX_AGE_MS
+from utils import log_debug, run_tmux
+
+
+def _log_debug(message: str):
+    log_debug('pane_capture', message)
+
+
+# Printed before each pane's capture; random so pane text cannot fake it
+_MARKER = f"@yadon-capture-{os.getpid()}-{secrets.token_hex(4)}@"
+
+
+def _batch_args(pane_ids, lines):
+    args = []
+    for pane_id in pane_ids:
+        if args:
+            args.append(';')
+        args += ['display-message', '-p', f'{_MARKER} {pane_id}', ';',
+                 'capture-pane', '-p', '-J', '-t', pane_id, '-S', f'-{lines}']
+    return args
+
+
+def _split_batch(output):
+    """{pane_id: content} for every pane whose marker was printed"""
+    contents = {}
+    chunks = ('\n' + output).split(f'\n{_MARKER} ')
+    for i, chunk in enumerate(chunks[1:], 1):
+        pane_id, _, content = chunk.partition('\n')
+        # The separator took the newline ending this pane's last line
+        if content and i < len(chunks) - 1:
+            content += '\n'
+        contents[pane_id.strip()] = content
+    return contents
+
+
+def capture_panes(pane_ids, lines=PANE_CAPTURE_LINES, component='pane_capture'):
+    """Capture several panes with as few tmux invocations as possible
+
+    tmux stops a command list at the first pane that no longer exists; that
+    pane is dropped and the rest are captured in a further call.
+
+    Args:
+        pane_ids: Panes to capture (e.g. ['%1', '%4'])
+        lines: History lines to include above the visible screen
+
+    Returns:
+        {pane_id: content}; panes that could not be captured are missing
+    """
+    contents = {}
+    remaining = list(dict.fromkeys(pane_ids))
+    while remaining:
+        res = run_tmux(_batch_args(remaining, lines), component, metric='capture-pane-batch')
+        if res is None:
+            break
+        got = _split_batch(res.stdout or '')
+        if res.returncode != 0 and remaining:
+            # The last pane whose marker was printed is the one that failed
+            # (its capture produced no output before the error)
+            started = [p for p in remaining if p in got]
+            if not started:
+                _log_debug(f"capture failed: {(res.stderr or '').strip()}")
+                break
+            failed = started[-1]
+            got.pop(failed, None)
+            _log_debug(f"capture failed for {failed}: {(res.stderr or '').strip()}")
+            contents.update(got)
+            remaining = [p for p in remaining if p not in got and p != failed]
+            continue
+        contents.update(got)
+        break
+    return contents
+
+
+class PaneContentStore:
+    """pane_id -> latest capture, shared by every reader within a tick"""
+
+    def __init__(self, max_age_ms=PANE_CAPTURE_MAX_AGE_MS):
+        self.max_age_ms = max_age_ms
+        self._entries = {}  # pane_id -> (taken_at, lines, content)
+        self._lock = threading.Lock()
+
+    def _fresh(self, pane_id, lines, now):
+        entry = self._entries.get(pane_id)
+        if entry is None or entry[1] < lines or (now - entry[0]) * 1000 >= self.max_age_ms:
+            return None
+        return entry
+
+    def get_many(self, pane_ids, lines=PANE_CAPTURE_LINES):
+        """Contents of the given panes, capturing the stale ones in one batch
+
+        A capture with more history lines than asked for is reused as is;
+        readers only look at the tail.
+
+        Returns:
+            {pane_id: content}; panes that could not be captured are missing
+        """
+        now = monotonic()
+        result = {}
+        missing = []
+        with self._lock:
+            for pane_id in pane_ids:
+                entry = self._fresh(pane_id, lines, now)
+                if entry is None:
+                    missing.append(pane_id)
+                else:
+                    result[pane_id] = entry[2]
+        if missing:
+            captured = capture_panes(missing, lines)
+            taken_at = monotonic()
+            with self._lock:
+                for pane_id, content in captured.items():
+                    self._entries[pane_id] = (taken_at, lines, content)
+            result.update(captured)
+        return result
+
+    def get(self, pane_id, lines=PANE_CAPTURE_LINES):
+        """Content of one pane ('' when it cannot be captured)"""
+        return self.get_many([pane_id], lines).get(pane_id, '')
+
+    def invalidate(self, pane_id):
+        """Drop a pane's capture (e.g. after sending it keys)"""
+        with self._lock:
+            self._entries.pop(pane_id, None)
+
+
+_store = PaneContentStore()
+
+
+def get_pane_store() -> PaneContentStore:
+    return _store
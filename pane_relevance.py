@@ -0,0 +1,95 @@
+"""Cached detection of panes running a monitored CLI for Yadon Desktop Pet
+
+Whether a pane runs one of TMUX_CLI_NAMES only changes when its process or
+foreground command changes. Results are cached per pane and keyed by
+(pane_id, pane_pid, pane_current_command), so steady-state ticks do not
+inspect the process tree at all.
+"""
+
+import os
+import threading
+
+from clock import monotonic
+from config import TMUX_CLI_NAMES, RELEVANCE_RECHECK_SEC
+from process_index import get_process_index
+from utils import log_debug
+
+
+def _log_debug(message: str):
+    log_debug('pane_relevance', message)
+
+
+def _pid_alive(pid) -> bool:
+    try:
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except Exception:
+        return False
+
+
+class RelevanceCache:
+    """pane -> CLI command cache shared by every pet"""
+
+    def __init__(self):
+        # pane_id -> (pane_pid, pane_current_command, cmd or None, matched pid, checked_at)
+        self._entries = {}
+        self._synced = None
+        self._lock = threading.Lock()
+
+    def sync(self, snapshot):
+        """Forget panes that are gone from the tmux snapshot"""
+        with self._lock:
+            if snapshot is self._synced or not snapshot.ok:
+                return
+            self._synced = snapshot
+            live = {pane.pane_id for pane in snapshot.panes}
+            for pane_id in list(self._entries):
+                if pane_id not in live:
+                    del self._entries[pane_id]
+
+    def cli_command(self, pane):
+        """Return the lowercased CLI command for a pane, or None if not relevant
+
+        Args:
+            pane: PaneRecord from the tmux snapshot
+        """
+        entry = self._entries.get(pane.pane_id)
+        if entry is not None and entry[0] == pane.pane_pid and entry[1] == pane.pane_current_command:
+            cmd, matched_pid, checked_at = entry[2], entry[3], entry[4]
+            if cmd is not None:
+                # A hit stays valid while the matched process is alive
+                if matched_pid is None or _pid_alive(matched_pid):
+                    return cmd
+            elif monotonic() - checked_at < RELEVANCE_RECHECK_SEC:
+                return None
+        cmd, matched_pid = self._detect(pane)
+        with self._lock:
+            self._entries[pane.pane_id] = (
+                pane.pane_pid, pane.pane_current_command, cmd, matched_pid, monotonic()
+            )
+        return cmd
+
+    def _detect(self, pane):
+        cmd_l = pane.pane_current_command.lower().strip()
+        if any(name in cmd_l for name in TMUX_CLI_NAMES):
+            return cmd_l, None
+        # Look for a target CLI anywhere below the pane's process, using the
+        # process index shared by every pane this tick
+        try:
+            match = get_process_index().find_descendant(int(pane.pane_pid), TMUX_CLI_NAMES)
+        except ValueError:
+            match = None
+        if match:
+            return match[1], match[0]
+        return None, None
+
+
+_cache = RelevanceCache()
+
+
+def get_relevance_cache() -> RelevanceCache:
+    return _cache
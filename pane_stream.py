@@ -0,0 +1,275 @@
+"""Streaming pane output through tmux pipe-pane for Yadon Desktop Pet
+
+Opt-in (PANE_STREAMING). Each relevant pane gets ``pipe-pane -o`` into a
+FIFO the app owns, in a private temporary directory. One reader thread
+drains every FIFO and keeps, per pane, a byte counter, the time of the
+latest output and a bounded tail of what was written, so idle and prompt
+detection read from memory instead of capturing. Unlike a redrawn screen the
+tail keeps a prompt's text after it is answered, so tail() only returns
+output written since keys were last sent to the pane (mark_input()).
+
+Pipes are closed with a bare ``pipe-pane`` when a pane goes away or the app
+quits (main() turns SIGTERM into a normal quit; atexit is the fallback). A
+pipe whose reader is gone ends on its own: its ``cat`` gets SIGPIPE.
+"""
+
+import atexit
+import os
+import re
+import selectors
+import shlex
+import shutil
+import tempfile
+import threading
+
+from clock import monotonic
+from config import PANE_STREAMING, PANE_STREAM_TAIL_BYTES
+from utils import log_debug, run_tmux, get_tmux_backend
+
+
+def _log_debug(message: str):
+    log_debug('pane_stream', message)
+
+
+# Terminal control sequences (CSI, OSC, two-byte escapes) and carriage returns
+_CONTROL = re.compile(r'\x1b\[[0-?]*[ -/]*[@-~]|\x1b\][^\x07\x1b]*(?:\x07|\x1b\\)?|\x1b[@-_]|\r')
+
+
+class _Stream:
+    """One pane's FIFO and what has been read from it"""
+
+    def __init__(self, path, fd, keep_fd, seed):
+        self.path = path
+        self.fd = fd
+        self.keep_fd = keep_fd  # Our own writer, so a restarted cat never means EOF
+        self.bytes = 0
+        self.last_output = None
+        self.tail = bytearray(seed)
+        self.total = len(seed)  # Bytes ever added to the tail
+        self.input_at = 0  # total when keys were last sent to the pane
+
+
+class PaneStreamer:
+    """pipe-pane every attached pane into a FIFO and track its output"""
+
+    def __init__(self, tail_bytes=PANE_STREAM_TAIL_BYTES):
+        self.tail_bytes = tail_bytes
+        self._streams = {}  # pane_id -> _Stream
+        self._refused = set()  # Panes that could not be piped (e.g. already piped elsewhere)
+        self._lock = threading.Lock()
+        self._dir = None
+        self._selector = selectors.DefaultSelector()
+        self._changes = []  # ('add' | 'remove', pane_id, _Stream), applied by the reader thread
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ)
+        self._reader = None
+        self._closed = False
+
+    def attach(self, pane_id) -> bool:
+        """Stream a pane's output (idempotent)
+
+        The pane's current screen seeds the tail, so a prompt that is already
+        showing is seen without waiting for new output.
+
+        Returns:
+            True when the pane is being streamed; otherwise callers should
+            fall back to polling it.
+        """
+        with self._lock:
+            if pane_id in self._streams:
+                return True
+            if self._closed or pane_id in self._refused:
+                return False
+        try:
+            if self._dir is None:
+                self._dir = tempfile.mkdtemp(prefix='yadon-stream-')
+            path = os.path.join(self._dir, pane_id.lstrip('%') + '.fifo')
+            if os.path.exists(path):
+                os.unlink(path)
+            os.mkfifo(path, 0o600)
+            fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+            keep_fd = os.open(path, os.O_WRONLY | os.O_NONBLOCK)
+        except OSError as e:
+            _log_debug(f"fifo for {pane_id} failed: {e}")
+            with self._lock:
+                self._refused.add(pane_id)
+            return False
+        # pipe-pane replaces (and with -o just closes) a pipe that already
+        # exists, so leave panes someone else is piping alone
+        res = run_tmux(['display-message', '-p', '-t', pane_id, '#{pane_pipe}', ';',
+                        'capture-pane', '-p', '-J', '-t', pane_id], 'pane_stream')
+        first, _, screen = (res.stdout if res else '').partition('\n')
+        if res is not None and res.returncode == 0 and first.strip() == '0':
+            res = run_tmux(['pipe-pane', '-o', '-t', pane_id, f'exec cat > {shlex.quote(path)}'], 'pane_stream')
+            reason = (res.stderr or '').strip() if res is not None else 'tmux failed'
+        else:
+            reason = 'already piped' if res is not None and res.returncode == 0 else 'pane not found'
+        if res is None or res.returncode != 0 or first.strip() != '0':
+            _log_debug(f"not streaming {pane_id}: {reason}")
+            self._close_fds(_Stream(path, fd, keep_fd, b''))
+            with self._lock:
+                self._refused.add(pane_id)
+            return False
+        seed = (screen.rstrip('\n') + '\n').lstrip('\n').encode('utf-8', 'replace')
+        stream = _Stream(path, fd, keep_fd, seed[-self.tail_bytes:])
+        with self._lock:
+            self._streams[pane_id] = stream
+            self._changes.append(('add', pane_id, stream))
+            if self._reader is None:
+                self._reader = threading.Thread(target=self._read_loop, name='yadon-stream', daemon=True)
+                self._reader.start()
+        self._wake()
+        _log_debug(f"streaming {pane_id}")
+        return True
+
+    def streaming(self, pane_id) -> bool:
+        return pane_id in self._streams
+
+    def last_output_ts(self, pane_id):
+        """clock.monotonic() of the latest output streamed from a pane, or None"""
+        stream = self._streams.get(pane_id)
+        return stream.last_output if stream else None
+
+    def bytes_read(self, pane_id) -> int:
+        stream = self._streams.get(pane_id)
+        return stream.bytes if stream else 0
+
+    def tail(self, pane_id) -> str:
+        """Latest output of a pane since the last mark_input(), as plain text
+
+        Control sequences are removed.
+        """
+        with self._lock:
+            stream = self._streams.get(pane_id)
+            if stream is None:
+                data = b''
+            else:
+                start = max(0, stream.input_at - (stream.total - len(stream.tail)))
+                data = bytes(stream.tail[start:])
+        return _CONTROL.sub('', data.decode('utf-8', 'replace'))
+
+    def mark_input(self, pane_id):
+        """Note that keys are about to be sent to a pane
+
+        Whatever prompt the tail showed is being answered; later tail() calls
+        only see what the pane writes from now on.
+        """
+        with self._lock:
+            stream = self._streams.get(pane_id)
+            if stream is not None:
+                stream.input_at = stream.total
+
+    def detach(self, pane_id):
+        """Stop streaming a pane and close its pipe (if the pane still exists)"""
+        with self._lock:
+            self._refused.discard(pane_id)
+            stream = self._streams.pop(pane_id, None)
+            if stream is None:
+                return
+            self._changes.append(('remove', pane_id, stream))
+        run_tmux(['pipe-pane', '-t', pane_id], 'pane_stream')
+        self._wake()
+        _log_debug(f"stopped streaming {pane_id}")
+
+    def close(self):
+        """Close every pipe, stop the reader and remove the FIFOs"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            pane_ids = list(self._streams)
+        for pane_id in pane_ids:
+            self.detach(pane_id)
+        self._wake()
+        if self._reader is not None:
+            self._reader.join(timeout=1)
+        if self._dir:
+            shutil.rmtree(self._dir, ignore_errors=True)
+
+    def _wake(self):
+        try:
+            os.write(self._wake_w, b'\0')
+        except OSError:
+            pass  # Pipe full: the reader is already due to wake up
+
+    def _close_fds(self, stream):
+        for fd in (stream.fd, stream.keep_fd):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        try:
+            os.unlink(stream.path)
+        except OSError:
+            pass
+
+    def _apply_changes(self):
+        with self._lock:
+            changes, self._changes = self._changes, []
+        for action, pane_id, stream in changes:
+            if action == 'add':
+                self._selector.register(stream.fd, selectors.EVENT_READ, (pane_id, stream))
+            else:
+                try:
+                    self._selector.unregister(stream.fd)
+                except (KeyError, ValueError):
+                    pass
+                self._close_fds(stream)
+
+    def _read_loop(self):
+        while True:
+            self._apply_changes()
+            if self._closed and not self._streams:
+                break
+            for key, _ in self._selector.select():
+                if key.fd == self._wake_r:
+                    try:
+                        while os.read(self._wake_r, 512):
+                            pass
+                    except BlockingIOError:
+                        pass
+                    continue
+                pane_id, stream = key.data
+                try:
+                    data = os.read(stream.fd, 65536)
+                except BlockingIOError:
+                    continue
+                except OSError as e:
+                    _log_debug(f"read error on {pane_id}: {e}")
+                    continue
+                if not data:
+                    continue
+                with self._lock:
+                    stream.bytes += len(data)
+                    stream.last_output = monotonic()
+                    stream.tail += data
+                    stream.total += len(data)
+                    if len(stream.tail) > self.tail_bytes:
+                        del stream.tail[:-self.tail_bytes]
+        self._apply_changes()
+
+
+_streamer = None
+_streamer_lock = threading.Lock()
+
+
+def get_pane_streamer():
+    """Return the process-wide pane streamer, or None when disabled"""
+    global _streamer
+    if not PANE_STREAMING or get_tmux_backend() is not None:
+        return None
+    with _streamer_lock:
+        if _streamer is None:
+            _streamer = PaneStreamer()
+            atexit.register(_streamer.close)
+        return _streamer
+
+
+def close_pane_streamer():
+    """Close every pipe if streaming was started (idempotent)"""
+    with _streamer_lock:
+        streamer = _streamer
+    if streamer is not None:
+        streamer.close()
@@ -1,40 +1,63 @@
-"""Pixel data builder for Yadon Desktop Pet"""
+"""Pixel data builder for Yadon Desktop Pet
+
+The sprite is stored once as a 16x16 palette-indexed byte buffer; each
+variant only contributes a palette built from COLOR_SCHEMES.
+"""
+
+from array import array
 
 from config import COLOR_SCHEMES
 
+SPRITE_SIZE = 16
 
-def build_pixel_data(variant='normal'):
-    """Build pixel data for a specific Yadon variant"""
+# Palette indices
+TRANSPARENT = 0
+OUTLINE = 1
+HEAD = 2
+BODY = 3
+FOREHEAD = 4  # Head colour, or the accent colour on Galarian variants
+
+_SPRITE_ROWS = (
+    "0011100000111000",
+    "0122211111222100",
+    "0121224444212100",
+    "0113334443331100",
+    "0013132223131000",
+    "0013332223331000",
+    "0133333333333100",
+    "0133111111133100",
+    "0013333333331000",
+    "0001111111110000",
+    "0001222222221000",
+    "0001222222221000",
+    "0012222222222100",
+    "0012222222222100",
+    "0001221112221000",
+    "0000110001110000",
+)
+
+SPRITE_INDICES = bytes(int(ch) for row in _SPRITE_ROWS for ch in row)
+
+GALARIAN_VARIANTS = ('galarian', 'galarian_shiny')
+
+
+def build_palette(variant='normal'):
+    """Return the variant's palette as hex colour strings (None = transparent)"""
     colors = COLOR_SCHEMES.get(variant, COLOR_SCHEMES['normal'])
-    
-    pixel_data = [
-        ["#FFFFFF", "#FFFFFF", "#000000", "#000000", "#000000", "#FFFFFF", "#FFFFFF", "#FFFFFF", "#FFFFFF", "#FFFFFF", "#000000", "#000000", "#000000", "#FFFFFF", "#FFFFFF", "#FFFFFF"],
-        ["#FFFFFF", "#000000", colors['head'], colors['head'], colors['head'], "#000000", "#000000", "#000000", "#000000", "#000000", colors['head'], colors['head'], colors['head'], "#000000", "#FFFFFF", "#FFFFFF"],
-        ["#FFFFFF", "#000000", colors['head'], "#000000", colors['head'], colors['head'], colors['head'], colors['head'], colors['head'], colors['head'], colors['head'], "#000000", colors['head'], "#000000", "#FFFFFF", "#FFFFFF"],
-        ["#FFFFFF", "#000000", "#000000", colors['body'], colors['body'], colors['body'], colors['head'], colors['head'], colors['head'], colors['body'], colors['body'], colors['body'], "#000000", "#000000", "#FFFFFF", "#FFFFFF"],
-        ["#FFFFFF", "#FFFFFF", "#000000", colors['body'], "#000000", colors['body'], colors['head'], colors['head'], colors['head'], colors['body'], "#000000", colors['body'], "#000000", "#FFFFFF", "#FFFFFF", "#FFFFFF"],
-        ["#FFFFFF", "#FFFFFF", "#000000", colors['body'], colors['body'], colors['body'], colors['head'], colors['head'], colors['head'], colors['body'], colors['body'], colors['body'], "#000000", "#FFFFFF", "#FFFFFF", "#FFFFFF"],
-        ["#FFFFFF", "#000000", colors['body'], colors['body'], colors['body'], colors['body'], colors['body'], colors['body'], colors['body'], colors['body'], colors['body'], colors['body'], colors['body'], "#000000", "#FFFFFF", "#FFFFFF"],
-        ["#FFFFFF", "#000000", colors['body'], colors['body'], "#000000", "#000000", "#000000", "#000000", "#000000", "#000000", "#000000", colors['body'], colors['body'], "#000000", "#FFFFFF", "#FFFFFF"],
-        ["#FFFFFF", "#FFFFFF", "#000000", colors['body'], colors['body'], colors['body'], colors['body'], colors['body'], colors['body'], colors['body'], colors['body'], colors['body'], "#000000", "#FFFFFF", "#FFFFFF", "#FFFFFF"],
-        ["#FFFFFF", "#FFFFFF", "#FFFFFF", "#000000", "#000000", "#000000", "#000000", "#000000", "#000000", "#000000", "#000000", "#000000", "#FFFFFF", "#FFFFFF", "#FFFFFF", "#FFFFFF"],
-        ["#FFFFFF", "#FFFFFF", "#FFFFFF", "#000000", colors['head'], colors['head'], colors['head'], colors['head'], colors['head'], colors['head'], colors['head'], colors['head'], "#000000", "#FFFFFF", "#FFFFFF", "#FFFFFF"],
-        ["#FFFFFF", "#FFFFFF", "#FFFFFF", "#000000", colors['head'], colors['head'], colors['head'], colors['head'], colors['head'], colors['head'], colors['head'], colors['head'], "#000000", "#FFFFFF", "#FFFFFF", "#FFFFFF"],
-        ["#FFFFFF", "#FFFFFF", "#000000", colors['head'], colors['head'], colors['head'], colors['head'], colors['head'], colors['head'], colors['head'], colors['head'], colors['head'], colors['head'], "#000000", "#FFFFFF", "#FFFFFF"],
-        ["#FFFFFF", "#FFFFFF", "#000000", colors['head'], colors['head'], colors['head'], colors['head'], colors['head'], colors['head'], colors['head'], colors['head'], colors['head'], colors['head'], "#000000", "#FFFFFF", "#FFFFFF"],
-        ["#FFFFFF", "#FFFFFF", "#FFFFFF", "#000000", colors['head'], colors['head'], "#000000", "#000000", "#000000", colors['head'], colors['head'], colors['head'], "#000000", "#FFFFFF", "#FFFFFF", "#FFFFFF"],
-        ["#FFFFFF", "#FFFFFF", "#FFFFFF", "#FFFFFF", "#000000", "#000000", "#FFFFFF", "#FFFFFF", "#FFFFFF", "#000000", "#000000", "#000000", "#FFFFFF", "#FFFFFF", "#FFFFFF", "#FFFFFF"]
+    forehead = colors['accent'] if variant in GALARIAN_VARIANTS else colors['head']
+    return [None, "#000000", colors['head'], colors['body'], forehead]
+
+
+def build_argb_buffer(variant='normal') -> array:
+    """Expand the index buffer into 32-bit ARGB pixels (QImage.Format_ARGB32)"""
+    argb = [0 if c is None else 0xFF000000 | int(c[1:], 16) for c in build_palette(variant)]
+    return array('I', [argb[i] for i in SPRITE_INDICES])
+
+
+def build_pixel_data(variant='normal'):
+    """Build pixel data for a specific Yadon variant as rows of hex strings"""
+    palette = ["#FFFFFF" if c is None else c for c in build_palette(variant)]
+    return [
+        [palette[SPRITE_INDICES[y * SPRITE_SIZE + x]] for x in range(SPRITE_SIZE)]
+        for y in range(SPRITE_SIZE)
     ]
-    
-    # Add Galarian forehead mark if Galarian variant
-    if variant in ['galarian', 'galarian_shiny']:
-        # Add yellow forehead mark (row 2-3, columns 6-9)
-        pixel_data[2][6] = colors['accent']
-        pixel_data[2][7] = colors['accent']
-        pixel_data[2][8] = colors['accent']
-        pixel_data[2][9] = colors['accent']
-        pixel_data[3][6] = colors['accent']
-        pixel_data[3][7] = colors['accent']
-        pixel_data[3][8] = colors['accent']
-    
-    return pixel_data
\ No newline at end of file
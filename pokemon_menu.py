@@ -2,9 +2,12 @@
 """Pokemon-style retro menu widget for Yadon Desktop Pet"""
 
 from PyQt6.QtWidgets import QWidget, QApplication
-from PyQt6.QtCore import Qt, QRect, pyqtSignal, QTimer, QEvent
+from PyQt6.QtCore import Qt, QRect, pyqtSignal, QEvent
 from PyQt6.QtGui import QPainter, QColor, QFont, QKeyEvent, QMouseEvent, QPen
 
+from heartbeat import HeartbeatTimer
+import metrics
+
 
 class PokemonMenu(QWidget):
     """A retro Pokemon Red/Blue style menu widget"""
@@ -19,7 +22,7 @@ class PokemonMenu(QWidget):
         self.item_height = 24
         self.padding = 8
         self.border_width = 2
-        self.cursor_blink_timer = QTimer()
+        self.cursor_blink_timer = HeartbeatTimer()
         self.cursor_visible = True
         
         # Style configuration
@@ -94,6 +97,7 @@ class PokemonMenu(QWidget):
         self.selected_index = 0
         self.update()
     
+    @metrics.instrumented('paint.PokemonMenu')
     def paintEvent(self, event):
         """Paint the Pokemon-style menu"""
         painter = QPainter(self)
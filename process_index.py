@@ -0,0 +1,273 @@
+"""Per-tick process tree index for Yadon Desktop Pet
+
+Finding the CLI behind a tmux pane means looking at the children of the
+pane's shell. Instead of running ``ps`` for every pane, one scan per
+monitoring tick is turned into pid -> children / cmdline maps that every
+pane and pet can query in O(1).
+
+On Linux the index reads ``/proc`` directly and never spawns a process;
+``ps`` remains the backend everywhere else (macOS).
+"""
+
+import glob
+import os
+import subprocess
+import threading
+
+from clock import monotonic
+from config import PROCESS_INDEX_MAX_AGE_MS, PROCESS_SCAN_BACKEND, PROCESS_TREE_MAX_DEPTH
+from utils import log_debug
+
+
+def _log_debug(message: str):
+    log_debug('process_index', message)
+
+
+class ProcessIndex:
+    """pid -> children and pid -> command line maps from one process scan"""
+
+    def __init__(self, entries):
+        """
+        Args:
+            entries: Iterable of (pid, ppid, command) tuples
+        """
+        self.built_at = monotonic()
+        self._commands = {}
+        self._children = {}
+        self._matches = {}
+        for pid, ppid, command in entries:
+            self._commands[pid] = command
+            self._children.setdefault(ppid, []).append(pid)
+
+    def __len__(self):
+        return len(self._commands)
+
+    def __contains__(self, pid):
+        return pid in self._commands
+
+    def children_of(self, pid):
+        return self._children.get(pid, ())
+
+    def command(self, pid) -> str:
+        return self._commands.get(pid, '')
+
+    def find_descendant(self, pid, names, max_depth=PROCESS_TREE_MAX_DEPTH):
+        """Find a process below pid whose command line contains one of names
+
+        Catches CLIs started through wrappers (npx, node, shell scripts,
+        direnv exec, ...). Results are memoized per subtree for the life of
+        the index, so every process is visited at most once per tick.
+
+        Args:
+            pid: Root of the subtree (usually a tmux pane pid)
+            names: Lowercase substrings to look for
+            max_depth: How many generations below pid to search
+
+        Returns:
+            (pid, lowercased command line) of the shallowest match in the
+            first matching branch, or None
+        """
+        names = tuple(names)
+        memo = self._matches.setdefault(names, {})
+        cmdline = self.command(pid).lower()
+        if any(name in cmdline for name in names):
+            return pid, cmdline
+        return self._walk(pid, names, max_depth, memo)
+
+    def _walk(self, pid, names, depth, memo):
+        cached = memo.get(pid)
+        # A hit stays a hit; a miss is only reusable if it searched as deep
+        if cached is not None and (cached[0] is not None or cached[1] >= depth):
+            return cached[0]
+        found = None
+        if depth > 0:
+            children = self.children_of(pid)
+            # Prefer the closest match before descending further
+            for child in children:
+                cmdline = self.command(child).lower()
+                if any(name in cmdline for name in names):
+                    found = (child, cmdline)
+                    break
+            if found is None:
+                for child in children:
+                    found = self._walk(child, names, depth - 1, memo)
+                    if found is not None:
+                        break
+        memo[pid] = (found, depth)
+        return found
+
+
+class ProcProcessIndex(ProcessIndex):
+    """Lazy /proc backed index (Linux)
+
+    Children are read from ``/proc/<pid>/task/*/children`` when the kernel
+    provides it, otherwise from a single pass over ``/proc/*/stat``. Command
+    lines are only read for the pids that are actually asked about.
+    """
+
+    def __init__(self, use_children_files=None):
+        self.built_at = monotonic()
+        self._commands = {}
+        self._children = {}
+        self._matches = {}
+        self._scanned = False
+        self._scan_lock = threading.Lock()  # The index is shared by the tmux workers
+        if use_children_files is None:
+            use_children_files = _proc_children_supported()
+        self._use_children_files = use_children_files
+
+    def _scan(self):
+        if self._scanned:
+            return
+        with self._scan_lock:
+            if self._scanned:
+                return
+            # Built aside and published whole: another worker that sees
+            # _scanned set must find the complete map
+            children = {}
+            for pid, ppid in _scan_proc_stat():
+                children.setdefault(ppid, []).append(pid)
+                self._commands.setdefault(pid, None)
+            self._children = children
+            self._scanned = True
+
+    def __len__(self):
+        self._scan()
+        return len(self._commands)
+
+    def __contains__(self, pid):
+        if self._scanned:
+            return pid in self._commands
+        return os.path.exists(f'/proc/{pid}')
+
+    def children_of(self, pid):
+        if not self._use_children_files:
+            self._scan()
+            return self._children.get(pid, ())
+        children = self._children.get(pid)
+        if children is None:
+            children = []
+            for path in glob.glob(f'/proc/{pid}/task/*/children'):
+                try:
+                    with open(path, 'rb') as f:
+                        children.extend(int(c) for c in f.read().split())
+                except (OSError, ValueError):
+                    continue
+            self._children[pid] = children
+        return children
+
+    def command(self, pid) -> str:
+        command = self._commands.get(pid)
+        if command is None:
+            command = _read_proc_cmdline(pid)
+            self._commands[pid] = command
+        return command
+
+
+def _proc_children_supported() -> bool:
+    # CONFIG_PROC_CHILDREN exposes the file for every task of every process
+    return os.path.exists(f'/proc/{os.getpid()}/task/{os.getpid()}/children')
+
+
+def _scan_proc_stat():
+    """Yield (pid, ppid) for every process from /proc/<pid>/stat"""
+    for name in os.listdir('/proc'):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f'/proc/{name}/stat', 'rb') as f:
+                stat = f.read()
+            # The comm field is parenthesised and may itself contain spaces or ')'
+            ppid = int(stat[stat.rindex(b')') + 2:].split(None, 2)[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        yield int(name), ppid
+
+
+def _read_proc_cmdline(pid) -> str:
+    try:
+        with open(f'/proc/{pid}/cmdline', 'rb') as f:
+            raw = f.read()
+    except OSError:
+        return ''
+    command = raw.replace(b'\0', b' ').strip().decode('utf-8', 'replace')
+    if command:
+        return command
+    # Kernel threads and zombies have no cmdline; ps shows the comm instead
+    try:
+        with open(f'/proc/{pid}/comm', 'rb') as f:
+            return f.read().strip().decode('utf-8', 'replace')
+    except OSError:
+        return ''
+
+
+def _use_proc() -> bool:
+    if PROCESS_SCAN_BACKEND == 'ps':
+        return False
+    if PROCESS_SCAN_BACKEND == 'proc':
+        return True
+    return os.path.isdir('/proc/self/task')
+
+
+def _scan_ps():
+    """Yield (pid, ppid, command) for every process using ps"""
+    ps = subprocess.run(['ps', 'ax', '-o', 'pid=,ppid=,command='], capture_output=True, text=True)
+    if ps.returncode != 0:
+        _log_debug(f"ps failed: rc={ps.returncode} err={ps.stderr.strip()}")
+        return
+    for line in ps.stdout.splitlines():
+        parts = line.split(None, 2)
+        if len(parts) < 2:
+            continue
+        try:
+            yield int(parts[0]), int(parts[1]), parts[2] if len(parts) > 2 else ''
+        except ValueError:
+            continue
+
+
+def build_process_index(backend=None) -> ProcessIndex:
+    """Build an index with the configured backend
+
+    Args:
+        backend: 'proc' or 'ps' to override PROCESS_SCAN_BACKEND
+
+    Returns:
+        ProcessIndex (empty when the scan failed)
+    """
+    try:
+        use_proc = _use_proc() if backend is None else backend == 'proc'
+        if use_proc:
+            return ProcProcessIndex()
+        return ProcessIndex(_scan_ps())
+    except Exception as e:
+        _log_debug(f"process scan error: {e}")
+        return ProcessIndex(())
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_process_index(max_age_ms=PROCESS_INDEX_MAX_AGE_MS) -> ProcessIndex:
+    """Return the current tick's process index, building it when stale
+
+    Args:
+        max_age_ms: Reuse an index built at most this long ago
+
+    Returns:
+        ProcessIndex shared by every caller within the tick
+    """
+    global _index
+    with _index_lock:
+        index = _index
+        if index is None or (monotonic() - index.built_at) * 1000 >= max_age_ms:
+            index = build_process_index()
+            _index = index
+        return index
+
+
+def invalidate_process_index():
+    """End the current tick; the next lookup rescans processes"""
+    global _index
+    with _index_lock:
+        _index = None
@@ -1,38 +1,108 @@
 """Tmux session monitoring functionality for Yadon Desktop Pet"""
 
-from PyQt6.QtCore import QTimer
+import time
+
 from PyQt6.QtWidgets import QApplication
 
-from config import VARIANT_ORDER, MAX_YADON_COUNT
-from utils import log_debug, run_tmux
+import debug_log
+from adaptive_poll import AdaptiveInterval, interval_summary, retime
+from config import VARIANT_ORDER, MAX_YADON_COUNT, STATS_LOG_INTERVAL_MS
+from heartbeat import HeartbeatTimer, get_heartbeat
+from tmux_client import get_tmux_client
+from tmux_hooks import get_tmux_hooks
+from tmux_runner import get_tmux_runner
+from tmux_snapshot import get_snapshot, invalidate_snapshot
+from utils import log_debug, log_info, tmux_call_count
 
 
 def _log_debug(message: str):
     log_debug('process_monitor', message)
 
 
-def _run_tmux(args):
-    """Run tmux with resolved binary, return CompletedProcess or None."""
-    return run_tmux(args, 'process_monitor')
-
-
-class ProcessMonitor(QTimer):
+class ProcessMonitor(HeartbeatTimer):
     """Monitor tmux sessions and manage Yadon instances"""
     def __init__(self, initial_pets):
         super().__init__()
         self.pets = initial_pets
         self.last_count = len(initial_pets)
+        self._pending = False
+        hooks = get_tmux_hooks()
+        self.poll = AdaptiveInterval('sessions_hooked' if hooks else 'sessions')
         self.timeout.connect(self.check_processes)
-        self.setInterval(5000)  # Check every 5 seconds
+        self.setInterval(self.poll.min_ms)  # Backs off while sessions are stable
+        # tmux pushes %sessions-changed to control clients; poll right away then
+        client = get_tmux_client()
+        if client is not None:
+            client.add_listener(self._on_notification)
+        # ...and session hooks push session-created/closed in any mode
+        if hooks is not None:
+            hooks.pushed.connect(self._on_hook_event)
+        # Periodic monitoring stats in the debug log
+        self._stats_calls = tmux_call_count()
+        self._stats_at = time.monotonic()
+        self._stats_wakeups = get_heartbeat().wakeups
+        self.stats_timer = HeartbeatTimer()
+        self.stats_timer.timeout.connect(self.log_stats)
+        self.stats_timer.start(STATS_LOG_INTERVAL_MS)
+
+    def _on_notification(self, line):
+        # Runs on the control client's reader thread
+        if line.startswith('%sessions-changed'):
+            get_tmux_runner().call_soon(self._sessions_changed)
+
+    def _on_hook_event(self, hook, args):
+        if hook in ('session-created', 'session-closed'):
+            self._sessions_changed()
+
+    def _sessions_changed(self, _=None):
+        invalidate_snapshot()
+        self.setInterval(self.poll.reset())
+        self.check_processes()
+        for pet in list(self.pets):
+            try:
+                pet.check_tmux()
+            except Exception as e:
+                _log_debug(f"pet check_tmux error: {e}")
+
+    def log_stats(self):
+        """Write tmux call rate, heartbeat wakeups and poll intervals to the debug log"""
+        now = time.monotonic()
+        calls = tmux_call_count()
+        wakeups = get_heartbeat().wakeups
+        minutes = max(now - self._stats_at, 1e-6) / 60
+        rate = (calls - self._stats_calls) / minutes
+        wakeup_rate = (wakeups - self._stats_wakeups) / (minutes * 60)
+        self._stats_calls, self._stats_wakeups, self._stats_at = calls, wakeups, now
+        intervals = ', '.join(
+            f"{name}={low}-{high}ms x{count}"
+            for name, (count, low, high) in sorted(interval_summary().items())
+        )
+        log_info(
+            'process_monitor',
+            f"stats: tmux calls/min={rate:.1f} (total {calls}); "
+            f"wakeups/s={wakeup_rate:.2f}; poll intervals: {intervals}"
+        )
     
     def check_processes(self):
-        current_count = count_tmux_sessions()
-        _log_debug(f"check_processes: last_count={self.last_count}, current_count={current_count}")
+        # Query tmux on a worker so a stalled server never blocks the GUI
+        if self._pending:
+            return
+        self._pending = True
+        get_tmux_runner().submit(get_tmux_sessions, self._apply_sessions)
+
+    def _apply_sessions(self, sessions_now):
+        self._pending = False
+        if sessions_now is None:
+            return
+        # The shared snapshot answers both "how many" and "which" sessions
+        current_count = len(sessions_now)
+        if debug_log.is_enabled():
+            _log_debug(f"check_processes: last_count={self.last_count}, current_count={current_count}")
         current_count = min(current_count, MAX_YADON_COUNT) if current_count > 0 else 0
+        retime(self, self.poll.update(current_count != self.last_count))
 
         # 既存ペットがセッション未設定（起動時に tmux が無かった）なら割り当てを試みる
         if current_count > 0:
-            sessions_now = get_tmux_sessions()
             for idx, pet in enumerate(self.pets):
                 if not getattr(pet, 'tmux_session', None):
                     if idx < len(sessions_now):
@@ -53,7 +123,7 @@ class ProcessMonitor(QTimer):
                 spacing = 10  # Space between Yadons
                 
                 # Get current tmux session names
-                sessions = get_tmux_sessions()
+                sessions = sessions_now
                 _log_debug(f"adding pets for sessions={sessions}")
                 
                 for i in range(self.last_count, current_count):
@@ -64,7 +134,7 @@ class ProcessMonitor(QTimer):
                     session_name = sessions[i] if i < len(sessions) else None
                     # Randomly select variant with equal probability
                     variant = random.choice(VARIANT_ORDER)
-                    pet = YadonPet(tmux_session=session_name, variant=variant)
+                    pet = YadonPet(tmux_session=session_name, variant=variant, sessions=sessions)
                     
                     # Position in bottom-right, stacking from right to left
                     from config import WINDOW_WIDTH, WINDOW_HEIGHT
@@ -100,14 +170,7 @@ class ProcessMonitor(QTimer):
 def count_tmux_sessions():
     """Count the number of tmux sessions"""
     try:
-        result = _run_tmux(['list-sessions', '-F', '#{session_name}'])
-        if result is None or result.returncode != 0:
-            return 0
-        output = result.stdout.strip()
-        if not output:
-            return 0
-        sessions = [line.strip() for line in output.split('\n') if line.strip()]
-        return len(sessions)
+        return len(get_snapshot().sessions)
     except Exception:
         return 0
 
@@ -115,11 +178,7 @@ def count_tmux_sessions():
 def get_tmux_sessions():
     """Get list of tmux session names"""
     try:
-        result = _run_tmux(['list-sessions', '-F', '#{session_name}'])
-        if result is None or result.returncode != 0:
-            return []
-        sessions = [line.strip() for line in result.stdout.strip().split('\n') if line.strip()]
-        return sessions
+        return get_snapshot().sessions
     except Exception:
         return []
 
@@ -1,13 +1,14 @@
 """Speech bubble widget for Yadon Desktop Pet"""
 
 from PyQt6.QtWidgets import QWidget, QApplication
-from PyQt6.QtCore import Qt, QTimer, QPoint
+from PyQt6.QtCore import Qt, QPoint, QEvent
 from PyQt6.QtGui import QPainter, QColor, QBrush, QPen, QPolygon, QFont
 
 from config import (
     BUBBLE_MAX_WIDTH, BUBBLE_MIN_WIDTH, BUBBLE_HEIGHT,
     BUBBLE_PADDING, BUBBLE_FONT_FAMILY, BUBBLE_FONT_SIZE
 )
+import metrics
 
 
 class SpeechBubble(QWidget):
@@ -67,10 +68,17 @@ class SpeechBubble(QWidget):
         # Position above parent
         self.update_position()
         
-        # Timer to continuously update position during animation
-        self.follow_timer = QTimer()
-        self.follow_timer.timeout.connect(self.update_position)
-        self.follow_timer.start(50)  # Update every 50ms for smooth following
+        # Follow the parent's moves (including its animation) as they happen
+        # instead of polling its position, so an open bubble costs no wakeups
+        self.parent_widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if obj is self.parent_widget:
+            if event.type() == QEvent.Type.Move:
+                self.update_position()
+            elif event.type() in (QEvent.Type.Hide, QEvent.Type.Close):
+                self.close()
+        return False
     
     def update_position(self):
         if not self.parent_widget or not self.parent_widget.isVisible():
@@ -114,12 +122,15 @@ class SpeechBubble(QWidget):
         self.move(bubble_x, bubble_y)
     
     def close(self):
-        if hasattr(self, 'follow_timer') and self.follow_timer:
-            self.follow_timer.stop()
-            self.follow_timer = None
+        if self.parent_widget is not None:
+            try:
+                self.parent_widget.removeEventFilter(self)
+            except RuntimeError:
+                pass  # Parent already deleted
         self.parent_widget = None  # Clear parent reference
         super().close()
     
+    @metrics.instrumented('paint.SpeechBubble')
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing, False)  # Pixelated look
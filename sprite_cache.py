@@ -0,0 +1,57 @@
+"""Pre-rendered Yadon sprites for Yadon Desktop Pet
+
+Every variant's three animation frames (face offset -1, 0, +1) are painted
+once into QPixmaps and shared by all pets of that variant, so a paintEvent
+is a single drawPixmap instead of a per-pixel fillRect loop.
+"""
+
+from PyQt6.QtCore import Qt, QRect
+from PyQt6.QtGui import QImage, QPainter, QPixmap
+
+from config import PIXEL_SIZE, WINDOW_WIDTH
+from pixel_data import SPRITE_SIZE, build_argb_buffer
+
+FACE_OFFSETS = (-1, 0, 1)
+FACE_ROWS = 10  # Only the top rows move when the face animates
+
+_frames = {}  # variant -> {face_offset: QPixmap}
+_buffers = {}  # variant -> ARGB buffer backing the variant's QImage
+
+
+def build_sprite_image(variant='normal') -> QImage:
+    """Wrap the variant's ARGB buffer in a 16x16 QImage without copying it"""
+    buf = build_argb_buffer(variant)
+    # QImage does not own the memory; keep the buffer alive with the cache
+    _buffers[variant] = buf
+    return QImage(buf, SPRITE_SIZE, SPRITE_SIZE, SPRITE_SIZE * 4, QImage.Format.Format_ARGB32)
+
+
+def _render_frame(scaled: QImage, face_offset) -> QPixmap:
+    pixmap = QPixmap(WINDOW_WIDTH, SPRITE_SIZE * PIXEL_SIZE)
+    pixmap.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(pixmap)
+    face_height = FACE_ROWS * PIXEL_SIZE
+    # Face rows move by 1 pixel, not 1 block
+    painter.drawImage(face_offset, 0, scaled, 0, 0, scaled.width(), face_height)
+    body = QRect(0, face_height, scaled.width(), scaled.height() - face_height)
+    painter.drawImage(body, scaled, body)
+    painter.end()
+    return pixmap
+
+
+def get_sprite_frames(variant='normal'):
+    """Return {face_offset: QPixmap} for a variant, rendering it on first use
+
+    Requires a QGuiApplication to exist.
+    """
+    frames = _frames.get(variant)
+    if frames is None:
+        image = build_sprite_image(variant)
+        scaled = image.scaled(
+            SPRITE_SIZE * PIXEL_SIZE, SPRITE_SIZE * PIXEL_SIZE,
+            Qt.AspectRatioMode.IgnoreAspectRatio,
+            Qt.TransformationMode.FastTransformation,
+        )
+        frames = {offset: _render_frame(scaled, offset) for offset in FACE_OFFSETS}
+        _frames[variant] = frames
+    return frames
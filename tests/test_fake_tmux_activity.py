@@ -0,0 +1,138 @@
+"""Idle hints and yaruki actions against the fake tmux, for Yadon Desktop Pet
+
+One simulation drives the app's pets through benchmarks/fake_tmux.py on a
+virtual clock (as benchmarks/sim_idle.py does), with three sessions:
+
+  calm     output until STOP, yaruki switch off: one soft hint, no keys
+  yaruki   output until STOP and again later, yaruki switch on: soft hint,
+           then YARUKI_SEND_KEYS once per idle gap at the force threshold
+  allow    a Codex "Allow command?" prompt at PROMPT_AT, yaruki switch on:
+           answered with 'allow' + Enter exactly once
+
+The tests check what the pets showed and which keys reached the fake.
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from fake_tmux import FakeTmux  # noqa: E402
+
+STOP = 20
+RESUME = 70
+PROMPT_AT = 25
+END = 130
+
+SCRIPT = {'sessions': [
+    {'name': 'calm', 'panes': [{'command': 'claude', 'output': [[0, STOP, 5]]}]},
+    {'name': 'yaruki', 'panes': [{'command': 'claude', 'output': [[0, STOP, 5], [RESUME, RESUME + 10, 5]]}]},
+    {'name': 'allow', 'panes': [{'command': 'codex', 'output': [[0, STOP, 5]],
+                                 'prompt_at': PROMPT_AT, 'prompt': 'allow'}]},
+]}
+
+
+@pytest.fixture(scope='module')
+def simulation():
+    """Run SCRIPT for END virtual seconds; bubbles and key sends per session"""
+    import clock
+    import config
+    import utils
+    from tmux_runner import InlineRunner, set_tmux_runner
+
+    if not config.HEARTBEAT_ENABLED:
+        pytest.skip('the simulation needs HEARTBEAT_ENABLED')
+    random.seed(1)  # Poll phases and messages
+    vclock = clock.VirtualClock()
+    clock.set_clock(vclock)
+    set_tmux_runner(InlineRunner())
+    fake = FakeTmux(SCRIPT, clock=clock.monotonic, epoch=0)
+    utils.set_tmux_backend(fake)
+
+    from PyQt6.QtWidgets import QApplication
+    import yadon_pet
+
+    app = QApplication.instance() or QApplication(sys.argv)  # noqa: F841 (widgets need it)
+    pets, monitor = yadon_pet.start_pets()
+    bubbles = {}  # session -> [(t, bubble_type, message)]
+    for pet in pets:
+        # Only the monitoring timers matter here; skip animation frames
+        for name in ('timer', 'action_timer', '_top_keepalive'):
+            getattr(pet, name).stop()
+        if pet.bubble:  # Welcome bubble; its close timer never runs here
+            pet.bubble.close()
+            pet.bubble = None
+        session = pet.tmux_session
+        pet.yaruki_switch_mode = session != 'calm'
+        bubbles[session] = []
+        pet._show_bubble = (lambda message, bubble_type='normal', display_time=None, shown=bubbles[session]:
+                            shown.append((clock.monotonic(), bubble_type, message)))
+    try:
+        vclock.run_until(END)
+        pane_ids = {entry[1]['name']: entry[4] for entry in fake.live_panes()}
+        sent = {session: [(t, keys) for t, pane_id, keys in fake.sent if pane_id == pane_ids[session]]
+                for session in pane_ids}
+        yield {'bubbles': bubbles, 'sent': sent}
+    finally:
+        monitor.stop()
+        for pet in pets:
+            pet.close()
+        utils.set_tmux_backend(None)
+        set_tmux_runner(None)
+        clock.set_clock(clock.SystemClock())
+
+
+def _hints(shown):
+    from config import YARUKI_FORCE_MESSAGE
+    force_suffix = YARUKI_FORCE_MESSAGE.split('}', 1)[1]
+    return [t for t, kind, message in shown if kind == 'hook' and not message.endswith(force_suffix)]
+
+
+def _forces(shown):
+    from config import YARUKI_FORCE_MESSAGE
+    force_suffix = YARUKI_FORCE_MESSAGE.split('}', 1)[1]
+    return [t for t, kind, message in shown if kind == 'hook' and message.endswith(force_suffix)]
+
+
+def test_soft_hint_once_after_soft_threshold(simulation):
+    from config import ACTIVITY_CHECK_INTERVAL_MS, IDLE_SOFT_THRESHOLD_SEC
+    hints = _hints(simulation['bubbles']['calm'])
+    assert len(hints) == 1, hints
+    # Not before the threshold; at most one activity poll late
+    earliest = STOP + IDLE_SOFT_THRESHOLD_SEC
+    assert earliest <= hints[0] <= earliest + ACTIVITY_CHECK_INTERVAL_MS / 1000 + 1, hints
+
+
+def test_no_force_without_yaruki_switch(simulation):
+    assert _forces(simulation['bubbles']['calm']) == []
+    assert simulation['sent']['calm'] == []
+
+
+def test_force_sends_keys_once_per_idle_gap(simulation):
+    from config import IDLE_FORCE_THRESHOLD_SEC, YARUKI_SEND_KEYS
+    sent = simulation['sent']['yaruki']
+    assert [keys for _, keys in sent] == [list(YARUKI_SEND_KEYS)] * 2, sent
+    first, second = (t for t, _ in sent)
+    assert STOP + IDLE_FORCE_THRESHOLD_SEC <= first < RESUME, sent
+    assert RESUME + 10 + IDLE_FORCE_THRESHOLD_SEC <= second <= END, sent
+    # The gentle hint comes first, then the force bubble with the keys
+    hints = _hints(simulation['bubbles']['yaruki'])
+    forces = _forces(simulation['bubbles']['yaruki'])
+    assert len(forces) == 2 and hints and hints[0] < forces[0], (hints, forces)
+
+
+def test_allow_prompt_answered_once(simulation):
+    from config import IDLE_FORCE_THRESHOLD_SEC
+    sent = simulation['sent']['allow']
+    answers = [(t, keys) for t, keys in sent if keys == ['allow']]
+    assert len(answers) == 1, sent
+    # Typed and confirmed as soon as the prompt holds still, before the
+    # force threshold would resend the previous command
+    assert sent[0][1] == ['allow'] and sent[1][1] == ['Enter'], sent
+    assert PROMPT_AT <= sent[0][0] < PROMPT_AT + IDLE_FORCE_THRESHOLD_SEC, sent
@@ -0,0 +1,128 @@
+"""Timers keep running while tmux stalls, for Yadon Desktop Pet
+
+A private tmux server is wrapped so that every call blocks for STALL_SEC,
+and a pet plus the ProcessMonitor run offscreen against it in a child
+process (the tmux binary, the control client and the Qt application are
+process-wide). The child reports how its timers fired; the test fails when
+the GUI thread, the heartbeat or the face animation stopped while tmux
+calls were hanging.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+SOCKET = 'yadon-stall-test'
+STALL_SEC = 1.0
+DURATION_SEC = 5.0
+# Longest a 50 ms QTimer may wait: the GUI thread must never block on tmux
+MAX_PROBE_GAP_MS = 250
+# Face animation beats (FACE_ANIMATION_INTERVAL) plus heartbeat slack
+MAX_FACE_GAP_MS = 800
+MAX_FACE_FIRST_MS = 1200
+
+
+def run_scenario(duration):
+    """Child process: run a pet against the stalling tmux and print the result"""
+    sys.path.insert(0, ROOT)
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+    # Every query must pay the stall: no persistent control connection, no
+    # hooks or pipes that would keep the private server busy
+    import config
+    config.TMUX_CONTROL_MODE = False
+    config.TMUX_ACTIVITY_EVENTS = False
+    config.TMUX_HOOK_EVENTS = False
+    config.PANE_STREAMING = False
+
+    from PyQt6.QtCore import QTimer
+    from PyQt6.QtWidgets import QApplication
+    from heartbeat import get_heartbeat
+    from process_monitor import ProcessMonitor
+    from yadon_pet import YadonPet
+
+    app = QApplication(sys.argv)
+    pet = YadonPet(tmux_session='stall')
+    monitor = ProcessMonitor([pet])
+    monitor.start()
+
+    probe_stamps = []
+    face_stamps = []
+    probe_timer = QTimer()
+    probe_timer.timeout.connect(lambda: probe_stamps.append(time.monotonic()))
+    probe_timer.start(50)
+    pet.timer.timeout.connect(lambda: face_stamps.append(time.monotonic()))
+    # Poll hard so that several stalled calls overlap the run
+    pet.status_timer.start(200)
+    pet.activity_timer.start(500)
+    monitor.setInterval(500)
+
+    QTimer.singleShot(int(duration * 1000), app.quit)
+    start = time.monotonic()
+    wakeups = get_heartbeat().wakeups
+    app.exec()
+    end = time.monotonic()
+
+    def max_gap_ms(points):
+        return max(b - a for a, b in zip(points, points[1:])) * 1000 if len(points) > 1 else float('inf')
+
+    print(json.dumps({
+        'elapsed': end - start,
+        'probe_max_gap_ms': max_gap_ms([start] + probe_stamps + [end]),
+        'face_ticks': len(face_stamps),
+        # The first beat waits for the next grid step, up to two intervals
+        'face_first_ms': (face_stamps[0] - start) * 1000 if face_stamps else float('inf'),
+        'face_max_gap_ms': max_gap_ms(face_stamps + [end]),
+        'heartbeat_wakeups': get_heartbeat().wakeups - wakeups,
+    }))
+    return 0
+
+
+@pytest.fixture
+def stalling_tmux(tmp_path):
+    """Path of a tmux wrapper that logs and stalls every call"""
+    real_tmux = shutil.which('tmux')
+    if not real_tmux:
+        pytest.skip('tmux not installed')
+    calls = tmp_path / 'calls'
+    wrapper = tmp_path / 'tmux'
+    wrapper.write_text(f'#!/bin/sh\necho "$1" >> {calls}\nsleep {STALL_SEC}\n'
+                       f'exec {real_tmux} -L {SOCKET} "$@"\n')
+    wrapper.chmod(0o755)
+    subprocess.run([real_tmux, '-L', SOCKET, 'new-session', '-d', '-s', 'stall'], check=True)
+    try:
+        yield wrapper, calls
+    finally:
+        subprocess.run([real_tmux, '-L', SOCKET, 'kill-server'], check=False)
+
+
+def test_timers_keep_firing_while_tmux_stalls(stalling_tmux):
+    wrapper, calls = stalling_tmux
+    env = dict(os.environ, YADON_TMUX=str(wrapper), QT_QPA_PLATFORM='offscreen')
+    env.pop('YADON_TMUX_SOCKET', None)
+    proc = subprocess.run([sys.executable, os.path.abspath(__file__), str(DURATION_SEC)],
+                          env=env, capture_output=True, text=True, timeout=DURATION_SEC + 60)
+    assert proc.returncode == 0, proc.stderr
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    # Several stalled calls overlapped the run (the worker serializes them)
+    started = calls.read_text().split() if calls.exists() else []
+    assert len(started) >= 2, started
+
+    assert result['probe_max_gap_ms'] < MAX_PROBE_GAP_MS, result
+    assert result['face_first_ms'] < MAX_FACE_FIRST_MS, result
+    assert result['face_max_gap_ms'] < MAX_FACE_GAP_MS, result
+    # 500 ms face animation: about two beats a second, all from the heartbeat
+    assert result['face_ticks'] >= int(result['elapsed'] * 2) - 2, result
+    assert result['heartbeat_wakeups'] >= result['face_ticks'], result
+
+
+if __name__ == '__main__':
+    sys.exit(run_scenario(float(sys.argv[1])))
@@ -0,0 +1,290 @@
+"""Persistent tmux control-mode client for Yadon Desktop Pet
+
+A single long-lived ``tmux -C`` connection is shared by every pet and the
+ProcessMonitor. Commands are written to its stdin one per line and their
+replies are read back from the ``%begin``/``%end`` blocks, so a query costs
+one pipe round-trip instead of a process spawn.
+"""
+
+import atexit
+import re
+import subprocess
+import threading
+import time
+from collections import deque
+
+from config import (
+    TMUX_CONTROL_MODE, TMUX_CONTROL_TIMEOUT_SEC, TMUX_CONTROL_RECONNECT_SEC,
+)
+from utils import log_debug, get_tmux_backend, get_tmux_command
+
+
+def _log_debug(message: str):
+    log_debug('tmux_client', message)
+
+
+# Characters that can be passed to the tmux command parser without quoting
+_SAFE_ARG = re.compile(r'^[A-Za-z0-9_@%+=:,./-]+$')
+
+
+def quote_tmux_arg(arg) -> str:
+    """Quote a single argument for the tmux command parser
+
+    Args:
+        arg: Argument to quote
+
+    Returns:
+        Argument safe to place on a control-mode command line
+    """
+    s = str(arg)
+    if s == ';':
+        return s  # Command separator, as in `tmux a \; b`
+    if s and _SAFE_ARG.match(s):
+        return s
+    # Single quotes disable all expansion; embedded quotes are spliced in
+    return "'" + s.replace("'", "'\\''") + "'"
+
+
+def _join_lines(lines) -> str:
+    return '\n'.join(lines) + '\n' if lines else ''
+
+
+class _Pending:
+    """A command line waiting for its %begin/%end replies
+
+    A line chaining commands with ';' gets one block per command; tmux stops
+    at the first failing command, so the reply ends after `blocks` blocks or
+    at the first %error.
+    """
+    __slots__ = ('args', 'event', 'lines', 'error', 'disconnected', 'blocks', 'block_start')
+
+    def __init__(self, args):
+        self.args = args
+        self.event = threading.Event()
+        self.lines = []
+        self.error = False
+        self.disconnected = False
+        self.blocks = args.count(';') + 1
+        self.block_start = 0  # Index in lines where the current block began
+
+
+class TmuxControlClient:
+    """``tmux -C`` connection with a subprocess fallback
+
+    Args:
+        session: Session to attach to (default: tmux picks the most recent one)
+        output: Whether tmux should stream %output notifications for the
+            attached session's panes
+    """
+
+    def __init__(self, session=None, output=False):
+        self.session = session
+        self.output = output
+        self._proc = None
+        self._reader = None
+        self._lock = threading.Lock()
+        self._pending = deque()
+        self._listeners = []
+        self._last_connect_attempt = 0.0
+
+    @property
+    def connected(self) -> bool:
+        return self._proc is not None and self._proc.poll() is None
+
+    def add_listener(self, callback):
+        """Register callback(line) for notification lines such as %output
+
+        Callbacks run on the reader thread and must not touch Qt widgets.
+        """
+        self._listeners.append(callback)
+
+    def ensure_connected(self) -> bool:
+        """Connect now if needed (subject to the reconnect delay)"""
+        with self._lock:
+            return self._connect()
+
+    def _connect(self) -> bool:
+        """Attach a control client to the tmux server (caller holds the lock)"""
+        if self.connected:
+            return True
+        now = time.monotonic()
+        if now - self._last_connect_attempt < TMUX_CONTROL_RECONNECT_SEC:
+            return False
+        self._last_connect_attempt = now
+        self._shutdown()
+        # ignore-size keeps our 80x24 client from resizing real windows,
+        # no-output stops tmux from streaming pane output we do not read.
+        cmd = [*get_tmux_command(), '-C', 'attach-session']
+        if self.session:
+            cmd += ['-t', str(self.session)]
+        cmd += ['-f', 'ignore-size' if self.output else 'ignore-size,no-output']
+        try:
+            proc = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                bufsize=1,
+            )
+        except Exception as e:
+            _log_debug(f"control client spawn failed: {e}")
+            return False
+        self._proc = proc
+        # The attach command itself answers with a block not flagged as ours:
+        # %end once attached, %error and %exit when the session (or the
+        # server) does not exist. Only report the connection after that reply.
+        attach = _Pending(cmd)
+        self._reader = threading.Thread(target=self._read_loop, args=(proc, attach), daemon=True)
+        self._reader.start()
+        if not attach.event.wait(TMUX_CONTROL_TIMEOUT_SEC) or attach.error or attach.disconnected:
+            reason = ' '.join(attach.lines) or 'no reply'
+            _log_debug(f"control client attach failed: {reason}")
+            self._shutdown()
+            return False
+        _log_debug(f"control client started pid={proc.pid}")
+        return True
+
+    def _read_loop(self, proc, attach=None):
+        current = None  # (number, _Pending or None)
+        chained = None  # Pending whose command line has more blocks to come
+        try:
+            for raw in proc.stdout:
+                line = raw.rstrip('\n')
+                if current is not None:
+                    if line.startswith(('%end ', '%error ')):
+                        parts = line.split(' ')
+                        if len(parts) >= 3 and parts[2] == current[0]:
+                            pending = current[1]
+                            if pending is not None:
+                                pending.error = line.startswith('%error')
+                                pending.blocks -= 1
+                                if pending.blocks > 0 and not pending.error:
+                                    chained = pending
+                                else:
+                                    chained = None
+                                    pending.event.set()
+                            current = None
+                            continue
+                    if current[1] is not None:
+                        current[1].lines.append(line)
+                    continue
+                if line.startswith('%begin '):
+                    parts = line.split(' ')
+                    ours = len(parts) >= 4 and parts[3] == '1'
+                    pending = None
+                    if ours and chained is not None:
+                        pending = chained
+                        pending.block_start = len(pending.lines)
+                    elif ours:
+                        with self._lock:
+                            pending = self._pending.popleft() if self._pending else None
+                    elif attach is not None and not attach.event.is_set():
+                        pending = attach
+                    current = (parts[2] if len(parts) >= 3 else '', pending)
+                    continue
+                if line.startswith('%exit'):
+                    break
+                # Anything else is an asynchronous notification
+                if attach is not None and not attach.event.is_set():
+                    attach.event.set()  # Only an attached client gets these
+                for callback in self._listeners:
+                    try:
+                        callback(line)
+                    except Exception as e:
+                        _log_debug(f"notification listener error: {e}")
+        except Exception as e:
+            _log_debug(f"control client read error: {e}")
+        finally:
+            if attach is not None and not attach.event.is_set():
+                attach.disconnected = True
+                attach.event.set()
+            for pending in (chained, current[1] if current else None):
+                if pending is not None and pending is not attach:
+                    pending.disconnected = True
+                    pending.event.set()
+            self._fail_pending(proc)
+
+    def _fail_pending(self, proc):
+        with self._lock:
+            if self._proc is proc:
+                self._shutdown()
+
+    def _shutdown(self):
+        """Terminate the control process and fail its waiters (caller holds the lock)"""
+        while self._pending:
+            pending = self._pending.popleft()
+            pending.disconnected = True
+            pending.event.set()
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            if proc.poll() is None:
+                proc.stdin.close()
+                proc.terminate()
+        except Exception:
+            pass
+
+    def close(self):
+        with self._lock:
+            self._shutdown()
+
+    def run(self, args, timeout=None):
+        """Run a tmux command through the control connection
+
+        Args:
+            args: List of arguments as they would be passed to the tmux binary
+            timeout: Seconds to wait for the reply (default: TMUX_CONTROL_TIMEOUT_SEC)
+
+        Returns:
+            CompletedProcess, or None when no control connection is available
+        """
+        args = [str(a) for a in args]
+        # The control protocol is line based; embedded newlines need a real process
+        if any('\n' in a for a in args):
+            return None
+        line = ' '.join(quote_tmux_arg(a) for a in args) + '\n'
+        pending = _Pending(args)
+        with self._lock:
+            if not self._connect():
+                return None
+            proc = self._proc
+            try:
+                self._pending.append(pending)
+                proc.stdin.write(line)
+                proc.stdin.flush()
+            except Exception as e:
+                _log_debug(f"control client write failed: {e}")
+                self._shutdown()
+                return None
+        if not pending.event.wait(TMUX_CONTROL_TIMEOUT_SEC if timeout is None else timeout):
+            # Replies are matched in order, so a lost one desynchronises the stream
+            _log_debug(f"control client timeout: {' '.join(args)}")
+            with self._lock:
+                if self._proc is proc:
+                    self._shutdown()
+            return None
+        if pending.disconnected:
+            return None
+        if pending.error:
+            # Like a tmux process: what earlier commands printed, then the error
+            return subprocess.CompletedProcess(args, 1, _join_lines(pending.lines[:pending.block_start]),
+                                               _join_lines(pending.lines[pending.block_start:]))
+        return subprocess.CompletedProcess(args, 0, _join_lines(pending.lines), '')
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_tmux_client():
+    """Return the process-wide control client, or None when disabled"""
+    global _client
+    if not TMUX_CONTROL_MODE or get_tmux_backend() is not None:
+        return None
+    with _client_lock:
+        if _client is None:
+            _client = TmuxControlClient()
+            atexit.register(_client.close)
+        return _client
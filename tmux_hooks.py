@@ -0,0 +1,248 @@
+"""tmux hooks that push events to Yadon Desktop Pet
+
+The app binds a Unix datagram socket in a private temporary directory and
+installs global hooks whose ``run-shell`` commands send one datagram per
+event to it (through the app's own Python, so no nc/socat is needed):
+
+  session-created, session-closed   the session monitor re-checks at once
+  pane-exited                       the pet owning the pane re-checks it
+  alert-silence                     the window's panes are known to have
+                                    been silent since the alert minus
+                                    monitor-silence; the pet re-checks
+
+The hooks take slot TMUX_HOOK_INDEX of each hook array, so the user's own
+hooks are left alone, and are removed again when the app quits (main()
+turns SIGTERM into a normal quit) or, as a fallback, at interpreter exit.
+Polling only backs them up while they are installed.
+
+alert-silence needs monitor-silence on the watched windows and silence-action
+``any`` on their sessions, and tmux flags silent windows in the status line;
+it is opt-in (TMUX_SILENCE_ALERTS). Options are only set where the window or
+session does not set them itself, and unset again at exit.
+"""
+
+import atexit
+import os
+import re
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+
+from PyQt6.QtCore import QObject, QSocketNotifier, pyqtSignal
+
+import debug_log
+from config import (
+    TMUX_HOOK_EVENTS, TMUX_HOOK_INDEX, TMUX_SILENCE_ALERTS, IDLE_SOFT_THRESHOLD_SEC,
+)
+from tmux_client import quote_tmux_arg
+from utils import log_debug, run_tmux, get_tmux_backend
+
+
+def _log_debug(message: str):
+    log_debug('tmux_hooks', message)
+
+
+# Arguments each hook sends after its name, expanded by tmux when it fires.
+# Sessions are sent as ids ($N, quoted so that sh keeps the $): a name comes
+# back escaped by tmux and would not compare equal to the pet's session.
+_HOOK_ARGS = {
+    'session-created': '#{q:hook_session}',
+    'session-closed': '#{q:hook_session}',
+    'pane-exited': '#{hook_pane}',
+    'alert-silence': '#{q:session_id} #{window_index} #{pane_id} #{monitor-silence}',
+}
+_SENDER = ('import socket,sys;'
+           'socket.socket(socket.AF_UNIX,socket.SOCK_DGRAM).sendto(chr(9).join(sys.argv[2:]).encode(),sys.argv[1])')
+# Session options alert-silence depends on, and the values they get
+_SILENCE_SESSION_OPTIONS = (('silence-action', 'any'), ('visual-silence', 'on'))
+
+
+def _double_quote(s) -> str:
+    """Quote for sh without single quotes (the hook is single-quoted for tmux)"""
+    return '"' + re.sub(r'(["\\$`])', r'\\\1', str(s)) + '"'
+
+
+class TmuxHookEvents(QObject):
+    """Install the hooks and turn their datagrams into Qt signals"""
+
+    # (hook name, its arguments); emitted on the GUI thread
+    pushed = pyqtSignal(str, list)
+
+    def __init__(self, index=TMUX_HOOK_INDEX):
+        super().__init__()
+        self.index = index
+        self.installed = False
+        self._dir = None
+        self._sock = None
+        self._notifier = None
+        self._lock = threading.Lock()
+        self._silence_panes = set()  # Panes whose window got monitor-silence from us
+        self._silence_seen = set()  # Panes whose window and session were looked at
+        self._silence_sessions = {}  # pane_id standing for a session -> options we set
+
+    def install(self) -> bool:
+        """Bind the socket and set the hooks
+
+        Returns:
+            True when events will be pushed
+        """
+        try:
+            self._dir = tempfile.mkdtemp(prefix='yadon-hooks-')
+            path = os.path.join(self._dir, 'events.sock')
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            self._sock.bind(path)
+            self._sock.setblocking(False)
+        except OSError as e:
+            _log_debug(f"event socket failed: {e}")
+            self._cleanup()
+            return False
+        # Hooks left at our index by an instance that was killed before it
+        # could remove them point at a socket that is gone
+        self._remove_hooks()
+        args = []
+        for hook, hook_args in _HOOK_ARGS.items():
+            # A failed send (app gone) must not make tmux report an error
+            command = (f"{_double_quote(sys.executable)} -c {_double_quote(_SENDER)} {_double_quote(path)} "
+                       f"{hook} {hook_args} 2>/dev/null || true")
+            if args:
+                args.append(';')
+            args += ['set-hook', '-g', f'{hook}[{self.index}]', f'run-shell -b {quote_tmux_arg(command)}']
+        res = run_tmux(args, 'tmux_hooks')
+        if res is None or res.returncode != 0:
+            _log_debug(f"installing hooks failed: {(res.stderr or '').strip() if res else 'tmux failed'}")
+            self._remove_hooks()
+            self._cleanup()
+            return False
+        self._notifier = QSocketNotifier(self._sock.fileno(), QSocketNotifier.Type.Read, self)
+        self._notifier.activated.connect(self._read)
+        self.installed = True
+        _log_debug(f"hooks installed at index {self.index}")
+        return True
+
+    def uninstall(self):
+        """Remove the hooks and the options set for silence alerts"""
+        if not self.installed:
+            return
+        self.installed = False
+        self._remove_hooks()
+        with self._lock:
+            panes = list(self._silence_panes)
+            sessions = dict(self._silence_sessions)
+            self._silence_panes.clear()
+            self._silence_sessions.clear()
+        # One call each: a pane that is gone would stop a command list
+        for pane_id in panes:
+            run_tmux(['set-option', '-w', '-u', '-t', pane_id, 'monitor-silence'], 'tmux_hooks')
+        for pane_id, names in sessions.items():
+            for name in names:
+                run_tmux(['set-option', '-u', '-t', pane_id, name], 'tmux_hooks')
+        try:
+            if self._notifier is not None:
+                self._notifier.setEnabled(False)
+        except RuntimeError:
+            pass  # Already deleted along with the application at exit
+        self._cleanup()
+        _log_debug("hooks removed")
+
+    def watch_silence(self, pane_id):
+        """Have tmux watch a pane's window for silence (TMUX_SILENCE_ALERTS)
+
+        Idempotent; safe to call from a worker thread.
+        """
+        if not TMUX_SILENCE_ALERTS or not self.installed:
+            return
+        with self._lock:
+            if pane_id in self._silence_seen:
+                return
+            self._silence_seen.add(pane_id)
+        res = run_tmux(['show-options', '-w', '-q', '-v', '-t', pane_id, 'monitor-silence'], 'tmux_hooks')
+        if res is not None and res.returncode == 0 and not res.stdout.strip():
+            res = run_tmux(['set-option', '-w', '-t', pane_id, 'monitor-silence', str(IDLE_SOFT_THRESHOLD_SEC)],
+                           'tmux_hooks')
+            if res is not None and res.returncode == 0:
+                with self._lock:
+                    self._silence_panes.add(pane_id)
+        names = []
+        for name, value in _SILENCE_SESSION_OPTIONS:
+            res = run_tmux(['show-options', '-q', '-v', '-t', pane_id, name], 'tmux_hooks')
+            if res is None or res.returncode != 0 or res.stdout.strip():
+                continue  # Set by the user for this session
+            res = run_tmux(['set-option', '-t', pane_id, name, value], 'tmux_hooks')
+            if res is not None and res.returncode == 0:
+                names.append(name)
+        if names:
+            with self._lock:
+                self._silence_sessions[pane_id] = names
+
+    def rearm_silence(self, pane_id):
+        """Clear a window's silence flag so that tmux alerts for it again
+
+        tmux alerts a window that is not current in an attached session only
+        once until it is visited. `kill-session -C` only clears the alert
+        flags of the session's windows; the session itself stays.
+        """
+        run_tmux(['kill-session', '-C', '-t', pane_id], 'tmux_hooks')
+
+    def _read(self, *_):
+        while True:
+            try:
+                data = self._sock.recv(4096)
+            except BlockingIOError:
+                break
+            except OSError as e:
+                _log_debug(f"event socket error: {e}")
+                break
+            parts = data.decode('utf-8', 'replace').split('\t')
+            if parts[0] in _HOOK_ARGS:
+                if debug_log.is_enabled():
+                    _log_debug(f"event: {' '.join(parts)}")
+                self.pushed.emit(parts[0], parts[1:])
+
+    def _remove_hooks(self):
+        args = []
+        for hook in _HOOK_ARGS:
+            if args:
+                args.append(';')
+            args += ['set-hook', '-g', '-u', f'{hook}[{self.index}]']
+        run_tmux(args, 'tmux_hooks')
+
+    def _cleanup(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        if self._dir:
+            shutil.rmtree(self._dir, ignore_errors=True)
+            self._dir = None
+
+
+_hooks = None
+_hooks_lock = threading.Lock()
+
+
+def get_tmux_hooks():
+    """Return the installed hook events, or None when disabled or unavailable
+
+    The first call (on the GUI thread) installs the hooks.
+    """
+    global _hooks
+    if not TMUX_HOOK_EVENTS or get_tmux_backend() is not None:
+        return None
+    with _hooks_lock:
+        if _hooks is None:
+            hooks = TmuxHookEvents()
+            if hooks.install():
+                atexit.register(hooks.uninstall)
+                _hooks = hooks
+            else:
+                _hooks = False
+        return _hooks or None
+
+
+def uninstall_tmux_hooks():
+    """Remove the hooks if they were installed (idempotent)"""
+    with _hooks_lock:
+        hooks = _hooks
+    if hooks:
+        hooks.uninstall()
@@ -0,0 +1,116 @@
+"""Non-blocking tmux execution for Yadon Desktop Pet
+
+tmux queries run on a small worker thread pool; their results come back to
+the Qt main thread through a queued signal. A slow or stuck tmux server then
+delays monitoring results instead of freezing animation, dragging and menus.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
+
+from config import TMUX_WORKER_THREADS
+from utils import log_debug, run_tmux
+
+
+def _log_debug(message: str):
+    log_debug('tmux_runner', message)
+
+
+class TmuxRunner(QObject):
+    """Run blocking tmux work off the GUI thread"""
+
+    # (callback, result) delivered on the thread this object lives in
+    _finished = pyqtSignal(object, object)
+
+    def __init__(self, workers=TMUX_WORKER_THREADS):
+        super().__init__()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='yadon-tmux')
+        # Queued even when emitted on the GUI thread, so call_soon() from
+        # there runs the callback on a later event loop pass, not inline
+        self._finished.connect(self._deliver, Qt.ConnectionType.QueuedConnection)
+
+    def submit(self, fn, callback=None, *args):
+        """Run fn(*args) on a worker and hand its result to callback on the GUI thread
+
+        Args:
+            fn: Blocking function; must not touch Qt widgets
+            callback: Called as callback(result) on the GUI thread, or None
+                for fire-and-forget work. result is None if fn raised.
+        """
+        def job():
+            try:
+                result = fn(*args)
+            except Exception as e:
+                _log_debug(f"worker error in {getattr(fn, '__name__', fn)}: {e}")
+                result = None
+            if callback is not None:
+                self._finished.emit(callback, result)
+        try:
+            self._pool.submit(job)
+        except RuntimeError:
+            # Pool already shut down (application exiting)
+            pass
+
+    def call_soon(self, callback, result=None):
+        """Run callback(result) on the GUI thread, after the caller returns; safe from any thread"""
+        self._finished.emit(callback, result)
+
+    def run_tmux(self, args, callback=None, component='tmux_runner'):
+        """Asynchronous run_tmux; callback receives the CompletedProcess or None"""
+        self.submit(run_tmux, callback, args, component)
+
+    def _deliver(self, callback, result):
+        try:
+            callback(result)
+        except Exception as e:
+            _log_debug(f"callback error in {getattr(callback, '__name__', callback)}: {e}")
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+class InlineRunner:
+    """TmuxRunner stand-in that runs work and callbacks synchronously
+
+    Used by simulations on a VirtualClock, where results must be applied
+    before the clock moves on.
+    """
+
+    def submit(self, fn, callback=None, *args):
+        try:
+            result = fn(*args)
+        except Exception as e:
+            _log_debug(f"inline error in {getattr(fn, '__name__', fn)}: {e}")
+            result = None
+        if callback is not None:
+            self.call_soon(callback, result)
+
+    def call_soon(self, callback, result=None):
+        try:
+            callback(result)
+        except Exception as e:
+            _log_debug(f"callback error in {getattr(callback, '__name__', callback)}: {e}")
+
+    def run_tmux(self, args, callback=None, component='tmux_runner'):
+        self.submit(run_tmux, callback, args, component)
+
+    def shutdown(self):
+        pass
+
+
+_runner = None
+
+
+def get_tmux_runner() -> TmuxRunner:
+    """Return the shared runner (create it on the GUI thread first)"""
+    global _runner
+    if _runner is None:
+        _runner = TmuxRunner()
+    return _runner
+
+
+def set_tmux_runner(runner):
+    """Replace the shared runner (e.g. with InlineRunner for simulations)"""
+    global _runner
+    _runner = runner
@@ -0,0 +1,131 @@
+"""Shared per-tick tmux snapshot for Yadon Desktop Pet
+
+One ``list-panes -a`` call collects every field the pets and the
+ProcessMonitor need. The parsed result is cached for a short tick so that
+all consumers polling within the same tick share a single tmux call, and the
+number of calls no longer grows with the number of pets.
+"""
+
+import threading
+from collections import namedtuple
+
+from clock import monotonic, wall
+from config import TMUX_SNAPSHOT_MAX_AGE_MS
+from utils import log_debug, run_tmux
+
+
+def _log_debug(message: str):
+    log_debug('tmux_snapshot', message)
+
+
+PaneRecord = namedtuple('PaneRecord', [
+    'session_id', 'session_name',
+    'window_index', 'window_active',
+    'pane_index', 'pane_active',
+    'pane_id', 'pane_pid', 'pane_tty', 'pane_current_command',
+    'history_size', 'cursor_x', 'cursor_y', 'window_activity',
+])
+
+# Tab separated so that names containing spaces or '::' still parse
+_FORMAT = '\t'.join([
+    '#{session_id}', '#{session_name}',
+    '#{window_index}', '#{?window_active,1,0}',
+    '#{pane_index}', '#{?pane_active,1,0}',
+    '#{pane_id}', '#{pane_pid}', '#{pane_tty}', '#{pane_current_command}',
+    '#{history_size}', '#{cursor_x}', '#{cursor_y}', '#{window_activity}',
+])
+
+
+class TmuxSnapshot:
+    """Parsed view of all tmux panes at one point in time"""
+
+    def __init__(self, panes, ok=True):
+        self.panes = panes
+        self.ok = ok  # False when tmux could not be queried
+        self.taken_at = monotonic()
+        # Same time base as window_activity (epoch seconds)
+        self.taken_wall = wall()
+        self._by_session = {}
+        for pane in panes:
+            self._by_session.setdefault(pane.session_name, []).append(pane)
+
+    @property
+    def sessions(self):
+        """Session names in tmux order"""
+        return list(self._by_session)
+
+    def has_session(self, session) -> bool:
+        return session in self._by_session
+
+    def panes_for(self, session):
+        """This session's slice of the snapshot"""
+        return self._by_session.get(session, [])
+
+    def active_pane(self, session):
+        """The active pane of the session's active window (or its first pane)"""
+        panes = self.panes_for(session)
+        for pane in panes:
+            if pane.window_active and pane.pane_active:
+                return pane
+        return panes[0] if panes else None
+
+
+def pane_meta(pane):
+    """Cheap change signature of a pane, or None if tmux does not report it
+
+    (history_size, cursor_x, cursor_y, window_activity): output scrolls the
+    history, moves the cursor or bumps the window's activity time.
+    """
+    if not pane.window_activity.isdigit():
+        return None
+    return (pane.history_size, pane.cursor_x, pane.cursor_y, pane.window_activity)
+
+
+def parse_snapshot(output: str) -> TmuxSnapshot:
+    panes = []
+    for line in output.splitlines():
+        parts = line.split('\t')
+        if len(parts) != len(PaneRecord._fields):
+            continue
+        parts[3] = parts[3] == '1'
+        parts[5] = parts[5] == '1'
+        panes.append(PaneRecord(*parts))
+    return TmuxSnapshot(panes)
+
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+
+def get_snapshot(max_age_ms=TMUX_SNAPSHOT_MAX_AGE_MS) -> TmuxSnapshot:
+    """Return the current tick's snapshot, refreshing it when stale
+
+    Args:
+        max_age_ms: Reuse a snapshot taken at most this long ago
+
+    Returns:
+        TmuxSnapshot (empty with ok=False when tmux is unavailable)
+    """
+    global _snapshot
+    with _snapshot_lock:
+        snap = _snapshot
+        if snap is not None and (monotonic() - snap.taken_at) * 1000 < max_age_ms:
+            return snap
+        try:
+            res = run_tmux(['list-panes', '-a', '-F', _FORMAT], 'tmux_snapshot')
+            if res is None or res.returncode != 0:
+                snap = TmuxSnapshot([], ok=False)
+            else:
+                snap = parse_snapshot(res.stdout)
+        except Exception as e:
+            _log_debug(f"snapshot error: {e}")
+            snap = TmuxSnapshot([], ok=False)
+        _snapshot = snap
+        return snap
+
+
+def invalidate_snapshot():
+    """Drop the cached snapshot so the next reader queries tmux"""
+    global _snapshot
+    with _snapshot_lock:
+        _snapshot = None
@@ -0,0 +1,120 @@
+"""Pane output detection from tty timestamps for Yadon Desktop Pet
+
+The kernel updates the modification time of a pane's pty (#{pane_tty})
+when the program in it writes, so one os.stat() tells whether a pane has
+produced output without asking tmux for its content. Linux only moves tty
+timestamps to a new TTY_MTIME_GRANULARITY_SEC window (so they do not leak
+keystroke timing); the latest output is then only known to lie before the
+end of the window the mtime falls in, and that bound is what gets reported.
+
+Panes whose tty cannot be stat'ed, or whose content changed while the mtime
+said nothing was written, are left to content hashing.
+"""
+
+import os
+import threading
+
+from clock import monotonic, wall
+from config import TTY_ACTIVITY_DETECTION, TTY_MTIME_GRANULARITY_SEC
+from utils import log_debug, get_tmux_backend
+
+
+def _log_debug(message: str):
+    log_debug('tty_activity', message)
+
+
+class TtyActivityMonitor:
+    """Track per-pane output timestamps from tty modification times"""
+
+    def __init__(self, granularity=TTY_MTIME_GRANULARITY_SEC):
+        self.granularity = granularity
+        self._panes = {}  # pane_id -> [tty, mtime, last output ts or None]
+        self._captures = {}  # pane_id -> (mtime, content hash, wall() at capture)
+        self._unreliable = set()
+        self._lock = threading.Lock()
+
+    def _window_end(self, mtime) -> float:
+        if self.granularity <= 0:
+            return mtime
+        return (mtime // self.granularity + 1) * self.granularity
+
+    def track(self, pane_id, tty) -> bool:
+        """Stat a pane's tty and note any new output
+
+        Returns:
+            True when the pane's output can be read from its tty; otherwise
+            callers should fall back to hashing its content.
+        """
+        if not tty or pane_id in self._unreliable:
+            return False
+        try:
+            mtime = os.stat(tty).st_mtime
+        except OSError as e:
+            self.mark_unreliable(pane_id, f"stat failed: {e}")
+            return False
+        with self._lock:
+            entry = self._panes.get(pane_id)
+            if entry is None or entry[0] != tty:
+                # Output before this point is not known; like %output, the
+                # first timestamp comes with the first write seen
+                self._panes[pane_id] = [tty, mtime, None]
+            elif mtime != entry[1]:
+                entry[1] = mtime
+                entry[2] = monotonic() + (self._window_end(mtime) - wall())
+        return True
+
+    def last_output_ts(self, pane_id):
+        """clock.monotonic() bound on the latest output seen for a pane, or None"""
+        entry = self._panes.get(pane_id)
+        return entry[2] if entry else None
+
+    def check_content(self, pane_id, content):
+        """Cross-check a capture against the tty timestamp
+
+        Content that changed although the mtime stayed put past the end of its
+        window means this tty's timestamps do not follow the pane's output.
+        """
+        entry = self._panes.get(pane_id)
+        if entry is None or content is None:
+            return
+        # Stat again after the capture: output between the tick's stat and
+        # the capture is in the content but not in that mtime
+        try:
+            mtime = os.stat(entry[0]).st_mtime
+        except OSError as e:
+            self.mark_unreliable(pane_id, f"stat failed: {e}")
+            return
+        h = hash(content)
+        previous = self._captures.get(pane_id)
+        self._captures[pane_id] = (mtime, h, wall())
+        if previous and previous[0] == mtime and previous[1] != h \
+                and previous[2] >= self._window_end(mtime):
+            self.mark_unreliable(pane_id, "content changed without a tty write")
+
+    def mark_unreliable(self, pane_id, reason=''):
+        with self._lock:
+            self._unreliable.add(pane_id)
+            self._panes.pop(pane_id, None)
+            self._captures.pop(pane_id, None)
+        _log_debug(f"{pane_id}: falling back to content hashing ({reason})")
+
+    def forget(self, pane_id):
+        with self._lock:
+            self._panes.pop(pane_id, None)
+            self._captures.pop(pane_id, None)
+            self._unreliable.discard(pane_id)
+
+
+_monitor = None
+_monitor_lock = threading.Lock()
+
+
+def get_tty_monitor():
+    """Return the process-wide tty monitor, or None when disabled"""
+    global _monitor
+    if not TTY_ACTIVITY_DETECTION or get_tmux_backend() is not None:
+        return None
+    with _monitor_lock:
+        if _monitor is None:
+            _monitor = TtyActivityMonitor()
+        return _monitor
@@ -1,31 +1,56 @@
 """Common utility functions for Yadon Desktop Pet"""
 
+import functools
 import os
 import shutil
 import subprocess
-from config import DEBUG_LOG
+import threading
+import time
+
+import debug_log
+import metrics
+
+
+_tmux_calls = 0
+_tmux_calls_lock = threading.Lock()
+_tmux_backend = None
+
+
+def tmux_call_count() -> int:
+    """Number of tmux commands issued by this process so far"""
+    return _tmux_calls
 
 
 def log_debug(component: str, message: str):
     """Write debug message to log file
 
+    Messages are queued and written by a background thread; they are dropped
+    without cost unless debug tracing is enabled (see debug_log).
+
     Args:
         component: Name of the component (e.g., 'yadon_pet', 'process_monitor')
         message: Debug message to log
     """
-    try:
-        with open(DEBUG_LOG, 'a') as f:
-            f.write(f"[{component}] {message}\n")
-    except Exception:
-        pass
+    debug_log.log(component, message, debug_log.DEBUG)
 
 
+def log_info(component: str, message: str):
+    """Write a message that is kept even with debug tracing off (stats, lifecycle)"""
+    debug_log.log(component, message, debug_log.INFO)
+
+
+@functools.lru_cache(maxsize=None)
 def get_tmux_binary() -> str:
-    """Resolve tmux binary path robustly
+    """Resolve tmux binary path robustly (resolved once per process)
 
     Returns:
         Path to tmux binary
     """
+    # Explicit override (e.g. a wrapper script for benchmarks)
+    override = os.environ.get('YADON_TMUX')
+    if override:
+        return override
+
     # Try environment PATH first
     path = shutil.which('tmux')
     if path:
@@ -40,21 +65,82 @@ def get_tmux_binary() -> str:
     return 'tmux'
 
 
-def run_tmux(args, component='utils'):
+@functools.lru_cache(maxsize=None)
+def get_tmux_command() -> tuple:
+    """tmux binary plus server selection, the prefix of every tmux command
+
+    YADON_TMUX_SOCKET names a private server (tmux -L), e.g. the one the
+    load harness in benchmarks/ starts; by default the usual server is used.
+    """
+    socket_name = os.environ.get('YADON_TMUX_SOCKET')
+    if socket_name:
+        return (get_tmux_binary(), '-L', socket_name)
+    return (get_tmux_binary(),)
+
+
+def set_tmux_backend(backend):
+    """Route every run_tmux() call to backend.run(args) instead of tmux
+
+    Args:
+        backend: Object whose run(args) returns a CompletedProcess (e.g. the
+            scripted fake in benchmarks/fake_tmux.py), or None to use tmux.
+            While a backend is set the control-mode client and the activity
+            engine stay off, since both talk to a real server.
+    """
+    global _tmux_backend
+    _tmux_backend = backend
+
+
+def get_tmux_backend():
+    return _tmux_backend
+
+
+def run_tmux(args, component='utils', metric=None):
     """Run tmux command with resolved binary
 
+    Commands go through the shared control-mode client when it is connected
+    and fall back to spawning the tmux binary otherwise. Each call's latency
+    is recorded in the tmux.<subcommand> histogram.
+
     Args:
         args: List of arguments to pass to tmux
         component: Component name for logging
+        metric: Histogram name after 'tmux.' (default: the first subcommand);
+            name chained command lists by what they mostly do
 
     Returns:
         CompletedProcess or None if failed
     """
-    cmd = [get_tmux_binary()] + args
+    global _tmux_calls
+    with _tmux_calls_lock:
+        _tmux_calls += 1
+    start = time.perf_counter()
+    try:
+        return _invoke_tmux(args, component)
+    finally:
+        metrics.record(f"tmux.{metric or (args[0] if args else '?')}", (time.perf_counter() - start) * 1000)
+
+
+def _invoke_tmux(args, component):
+    if _tmux_backend is not None:
+        return _tmux_backend.run(args)
+    # Imported here to avoid a circular import (tmux_client uses this module)
+    from tmux_client import get_tmux_client
+    client = get_tmux_client()
+    if client is not None:
+        result = client.run(args)
+        if result is not None:
+            if result.returncode != 0:
+                if debug_log.is_enabled():
+                    log_debug(component, f"tmux call failed: {' '.join(args)} | rc={result.returncode} | err={result.stderr.strip()}")
+            return result
+
+    cmd = [*get_tmux_command(), *args]
     try:
         result = subprocess.run(cmd, capture_output=True, text=True)
         if result.returncode != 0:
-            log_debug(component, f"tmux call failed: {' '.join(cmd)} | rc={result.returncode} | err={result.stderr.strip()}")
+            if debug_log.is_enabled():
+                log_debug(component, f"tmux call failed: {' '.join(cmd)} | rc={result.returncode} | err={result.stderr.strip()}")
         return result
     except Exception as e:
         log_debug(component, f"tmux invoke error: {e}")
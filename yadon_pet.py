@@ -15,13 +15,13 @@ from pokemon_menu import PokemonMenu
 
 from config import (
     COLOR_SCHEMES, RANDOM_MESSAGES, WELCOME_MESSAGES, GOODBYE_MESSAGES,
-    PIXEL_SIZE, WINDOW_WIDTH, WINDOW_HEIGHT,
+    WINDOW_WIDTH, WINDOW_HEIGHT,
     FACE_ANIMATION_INTERVAL, RANDOM_ACTION_MIN_INTERVAL, RANDOM_ACTION_MAX_INTERVAL,
-    CLAUDE_CHECK_INTERVAL, MOVEMENT_DURATION,
+    MOVEMENT_DURATION,
     TINY_MOVEMENT_RANGE, SMALL_MOVEMENT_RANGE, TINY_MOVEMENT_PROBABILITY,
     BUBBLE_DISPLAY_TIME, PID_FONT_FAMILY, PID_FONT_SIZE,
     VARIANT_ORDER, MAX_YADON_COUNT,
-    TMUX_CLI_NAMES, ACTIVITY_CHECK_INTERVAL_MS, OUTPUT_IDLE_THRESHOLD_SEC,
+    TMUX_CLI_NAMES, OUTPUT_IDLE_THRESHOLD_SEC,
     IDLE_HINT_MESSAGES,
     IDLE_SOFT_THRESHOLD_SEC, IDLE_FORCE_THRESHOLD_SEC,
     YARUKI_SWITCH_MODE, YARUKI_SEND_KEYS,
@@ -29,11 +29,26 @@ from config import (
     FRIENDLY_TOOL_NAMES,
     YARUKI_SWITCH_ON_MESSAGE, YARUKI_SWITCH_OFF_MESSAGE, YARUKI_FORCE_MESSAGE,
     YARUKI_MENU_ON_TEXT, YARUKI_MENU_OFF_TEXT,
+    TMUX_STATUS_RESYNC_SEC, PANE_CAPTURE_LINES, PANE_META_CHANGE_DETECTION,
 )
 from speech_bubble import SpeechBubble
-from process_monitor import ProcessMonitor, count_tmux_sessions, get_tmux_sessions, find_tmux_session
+from process_monitor import ProcessMonitor, get_tmux_sessions, find_tmux_session
 # Hook handling removed (hooks are no longer used)
-from pixel_data import build_pixel_data
+from sprite_cache import get_sprite_frames
+from clock import monotonic
+from heartbeat import HeartbeatTimer, random_phase
+import debug_log
+import metrics
+from activity_engine import get_activity_engine
+from tmux_snapshot import get_snapshot, invalidate_snapshot, pane_meta
+from pane_relevance import get_relevance_cache
+from pane_capture import get_pane_store
+from tty_activity import get_tty_monitor
+from pane_stream import get_pane_streamer, close_pane_streamer
+from tmux_hooks import get_tmux_hooks, uninstall_tmux_hooks
+from tmux_runner import get_tmux_runner
+from idle_scheduler import get_idle_scheduler
+from adaptive_poll import AdaptiveInterval, retime
 from utils import log_debug, run_tmux
 
 def _log_debug(msg: str):
@@ -100,13 +115,27 @@ class YadonPet(QWidget):
     # Class variable to track active menu across all instances
     _active_menu = None
     
-    def __init__(self, tmux_session=None, variant='normal'):
+    def __init__(self, tmux_session=None, variant='normal', sessions=None):
+        """
+        Args:
+            tmux_session: Session this pet watches (default: the first one)
+            variant: Color scheme key
+            sessions: Session names from a discovery pass the caller already
+                made; the pet then skips its own initial tmux queries
+        """
         super().__init__()
-        self.tmux_session = tmux_session if tmux_session else find_tmux_session()
+        if not tmux_session:
+            if sessions is not None:
+                tmux_session = sessions[0] if sessions else None
+            else:
+                tmux_session = find_tmux_session()
+        self.tmux_session = tmux_session
         self.variant = variant
         
-        # Build pixel data with variant colors
-        self.pixel_data = build_pixel_data(variant)
+        # Pre-rendered animation frames, shared by every pet of this variant
+        self.sprite_frames = get_sprite_frames(variant)
+        self._status_font = QFont(PID_FONT_FAMILY, PID_FONT_SIZE)
+        self._status_font.setBold(True)
         
         self.face_offset = 0
         self.animation_direction = 1
@@ -122,18 +151,34 @@ class YadonPet(QWidget):
         self.tmux_active = False
         
         # Activity monitoring state per tmux pane
-        self.pane_state = {}  # pane_id -> {last_hash, last_change_ts, soft_notified, force_done, name}
+        self.pane_state = {}  # pane_id -> {last_hash, last_output_ts, last_change_ts, soft_notified, force_done, name}
+        # Pushed %output timestamps (None when disabled; then panes are hashed)
+        self.activity_engine = get_activity_engine()
+        # Events pushed by tmux hooks (None when only polling)
+        self.tmux_hooks = get_tmux_hooks()
         # Motivation switch (toggle via right-click menu)
         self.yaruki_switch_mode = bool(YARUKI_SWITCH_MODE)
         # Tmux status text cache ("session window pane")
         self.tmux_status_text = self.tmux_session or 'N/A'
+        self._status_layout_version = None
+        self._status_refreshed_at = 0.0
+        # tmux work in flight on the worker pool (one of each at a time)
+        self._status_pending = False
+        self._activity_pending = False
+        self._tmux_check_pending = False
+        # Poll rates back off while nothing changes
+        self._status_poll = AdaptiveInterval('status')
+        self._tmux_poll = AdaptiveInterval('tmux_hooked' if self.tmux_hooks else 'tmux')
+        self._activity_poll = AdaptiveInterval('activity')
         
         self.init_ui()
         self.setup_animation()
         self.setup_random_actions()
-        self.setup_tmux_monitor()
+        self.setup_tmux_monitor(sessions)
         self.setup_activity_monitor()
         self.setup_status_updater()
+        if self.tmux_hooks:
+            self.tmux_hooks.pushed.connect(self._on_tmux_event)
     
     def closeEvent(self, event):
         """Clean up when closing the widget"""
@@ -153,6 +198,21 @@ class YadonPet(QWidget):
         if hasattr(self, 'monitor_timer'):
             self.monitor_timer.stop()
         # hook_timer removed (hooks are not used)
+        if hasattr(self, 'activity_timer'):
+            self.activity_timer.stop()
+        for pane_id in self.pane_state:
+            self._cancel_idle_deadlines(pane_id)
+        streams = get_pane_streamer()
+        if streams:
+            for pane_id in self.pane_state:
+                get_tmux_runner().submit(streams.detach, None, pane_id)
+        if self.activity_engine and self.tmux_session:
+            self.activity_engine.unwatch(self.tmux_session)
+        if self.tmux_hooks:
+            try:
+                self.tmux_hooks.pushed.disconnect(self._on_tmux_event)
+            except TypeError:
+                pass
         super().closeEvent(event)
     
     def init_ui(self):
@@ -182,12 +242,12 @@ class YadonPet(QWidget):
         self.raise_()
         # Apply mac top-most non-activating level after show, and keep asserting
         QTimer.singleShot(0, lambda: _mac_set_top_nonactivating(self))
-        self._top_keepalive = QTimer(self)
+        self._top_keepalive = HeartbeatTimer(self)
         self._top_keepalive.timeout.connect(lambda: _mac_set_top_nonactivating(self))
         self._top_keepalive.start(5000)
         
     def setup_animation(self):
-        self.timer = QTimer()
+        self.timer = HeartbeatTimer()
         self.timer.timeout.connect(self.animate_face)
         self.update_animation_speed()
 
@@ -199,72 +259,108 @@ class YadonPet(QWidget):
             self.timer.start(interval)
     
     def setup_random_actions(self):
-        self.action_timer = QTimer()
+        self.action_timer = HeartbeatTimer()
         self.action_timer.timeout.connect(self.random_action)
         self.action_timer.start(random.randint(RANDOM_ACTION_MIN_INTERVAL, RANDOM_ACTION_MAX_INTERVAL))
     
-    def setup_tmux_monitor(self):
+    def setup_tmux_monitor(self, sessions=None):
         """Monitor tmux sessions"""
-        self.monitor_timer = QTimer()
+        self.monitor_timer = HeartbeatTimer()
         self.monitor_timer.timeout.connect(self.check_tmux)
-        self.monitor_timer.start(CLAUDE_CHECK_INTERVAL)
-        # Initial check
-        self.check_tmux()
+        self.monitor_timer.setPhase(random_phase())
+        self.monitor_timer.start(self._tmux_poll.min_ms)
+        # Initial check, answered from the caller's discovery pass if given
+        # (queued, so the welcome bubble does not delay the first paint)
+        if sessions is not None:
+            get_tmux_runner().call_soon(self._apply_tmux_check, list(sessions))
+        else:
+            self.check_tmux()
 
     def setup_activity_monitor(self):
         """Monitor tmux panes for CLI output activity and notify on idle."""
-        self.activity_timer = QTimer()
+        if self.activity_engine and self.tmux_session:
+            # Attaching spawns a control client; keep it off the startup path
+            get_tmux_runner().submit(self.activity_engine.watch, None, self.tmux_session)
+        self.activity_timer = HeartbeatTimer()
         self.activity_timer.timeout.connect(self.check_cli_activity)
-        self.activity_timer.start(ACTIVITY_CHECK_INTERVAL_MS)
+        self.activity_timer.setPhase(random_phase())
+        self.activity_timer.start(self._activity_poll.min_ms)
 
     def setup_status_updater(self):
         """Refresh tmux status text (session window pane) periodically."""
-        self.status_timer = QTimer()
+        self.status_timer = HeartbeatTimer()
         self.status_timer.timeout.connect(self.update_tmux_status)
-        self.status_timer.start(1000)
+        self.status_timer.setPhase(random_phase())
+        self.status_timer.start(self._status_poll.min_ms)
 
     def update_tmux_status(self):
+        # tmux is queried on a worker; the label is updated when it answers
+        if self._status_pending:
+            return
+        self._status_pending = True
+        get_tmux_runner().submit(self._fetch_tmux_status, self._apply_tmux_status)
+
+    def _fetch_tmux_status(self):
+        """Worker side of update_tmux_status: (session, status text or None, layout version)"""
+        session = self.tmux_session
+        if not session:
+            # Auto-startケースで tmux 起動前にプロセスが立ち上がった場合、
+            # 後からセッションができたら自動でアタッチする
+            session = find_tmux_session()
+            if not session:
+                return None, 'N/A', None
+        # With notifications streaming, only re-query after a focus/layout
+        # change (plus an occasional resync for anything tmux does not report)
+        version = None
+        engine = self.activity_engine
+        if engine and engine.watch(session):
+            version = engine.layout_version(session)
+            if (version == self._status_layout_version
+                    and monotonic() - self._status_refreshed_at < TMUX_STATUS_RESYNC_SEC):
+                return session, None, version
+        # Determine the active window + pane within this session
+        chosen = None
+        pane = get_snapshot().active_pane(str(session))
+        if pane:
+            chosen = f"{pane.session_name} {pane.window_index} {pane.pane_index}"
+        # Final fallback via display-message
+        if not chosen:
+            res2 = self._tmux_run(['display-message', '-p', '-t', str(session), '#S #I #P'])
+            if res2 and res2.returncode == 0:
+                chosen = res2.stdout.strip()
+        return session, chosen or '', version
+
+    def _apply_tmux_status(self, result):
+        self._status_pending = False
+        changed = False
+        # Answered from the activity engine's layout counter: a tick costs a
+        # dict lookup, so keep the fastest rate instead of backing off
+        free = bool(result) and result[2] is not None
         try:
-            if not self.tmux_session:
-                # Auto-startケースで tmux 起動前にプロセスが立ち上がった場合、
-                # 後からセッションができたら自動でアタッチする
-                new_session = find_tmux_session()
-                if new_session:
-                    self.tmux_session = new_session
-                    _log_debug(f"update_tmux_status: attached to late session {new_session}")
-                else:
+            if not result:
+                return
+            session, chosen, version = result
+            if session is None:
+                if not self.tmux_session:
                     self.tmux_status_text = 'N/A'
-                    return
-            # Determine the active window + pane within this session
-            fmt = '#{?window_active,1,0} #{?pane_active,1,0} #{session_name} #{window_index} #{pane_index}'
-            res = self._tmux_run(['list-panes', '-t', str(self.tmux_session), '-F', fmt])
-            chosen = None
-            if res and res.returncode == 0:
-                for line in res.stdout.splitlines():
-                    parts = line.strip().split()
-                    if len(parts) >= 5:
-                        win_act, pane_act, sess, win_idx, pane_idx = parts[:5]
-                        if win_act == '1' and pane_act == '1':
-                            chosen = f"{sess} {win_idx} {pane_idx}"
-                            break
-                if not chosen:
-                    # Fallback to first pane line
-                    for line in res.stdout.splitlines():
-                        parts = line.strip().split()
-                        if len(parts) >= 5:
-                            _, _, sess, win_idx, pane_idx = parts[:5]
-                            chosen = f"{sess} {win_idx} {pane_idx}"
-                            break
-            # Final fallback via display-message
-            if not chosen:
-                res2 = self._tmux_run(['display-message', '-p', '-t', str(self.tmux_session), '#S #I #P'])
-                if res2 and res2.returncode == 0:
-                    chosen = res2.stdout.strip()
+                return
+            if not self.tmux_session:
+                self.tmux_session = session
+                changed = True
+                _log_debug(f"update_tmux_status: attached to late session {session}")
+            if chosen is None:
+                return  # Nothing changed since the last query
+            self._status_layout_version = version
+            self._status_refreshed_at = monotonic()
             if chosen and self.tmux_status_text != chosen:
                 self.tmux_status_text = chosen
+                changed = True
                 self.update()
         except Exception as e:
-            _log_debug(f"update_tmux_status error: {e}")
+            if debug_log.is_enabled():
+                _log_debug(f"update_tmux_status error: {e}")
+        finally:
+            retime(self.status_timer, self._status_poll.reset() if free else self._status_poll.update(changed))
     
     def animate_face(self):
         self.face_offset += self.animation_direction
@@ -274,8 +370,10 @@ class YadonPet(QWidget):
             self.animation_direction = 1
         self.update()
     
+    @metrics.instrumented('paint.YadonPet')
     def paintEvent(self, event):
-        if not self.pixel_data:
+        frame = self.sprite_frames.get(self.face_offset)
+        if frame is None:
             return
             
         painter = QPainter(self)
@@ -283,37 +381,16 @@ class YadonPet(QWidget):
         
         # Clear background with transparency
         painter.fillRect(self.rect(), QColor(0, 0, 0, 0))
-        
-        pixel_size = PIXEL_SIZE
-        
-        for y in range(16):
-            for x in range(16):
-                color_hex = self.pixel_data[y][x]
-                
-                # Apply face offset only to face rows (top 10 rows)
-                # Move only by 1 pixel, not 1 block
-                if y < 10:
-                    draw_x = x * pixel_size + self.face_offset
-                else:
-                    draw_x = x * pixel_size
-                
-                draw_y = y * pixel_size
-                
-                # Draw non-white pixels
-                if color_hex != "#FFFFFF":
-                    color = QColor(color_hex)
-                    painter.fillRect(draw_x, draw_y, pixel_size, pixel_size, color)
+        painter.drawPixmap(0, 0, frame)
         
         # Draw tmux status (session window pane) below Yadon with white background
         session_text = f"{self.tmux_status_text if self.tmux_status_text else (self.tmux_session or 'N/A')}"
-        font = QFont(PID_FONT_FAMILY, PID_FONT_SIZE)
-        font.setBold(True)
-        painter.setFont(font)
+        painter.setFont(self._status_font)
         
         # Calculate text size
-        metrics = painter.fontMetrics()
-        text_width = metrics.horizontalAdvance(session_text)
-        text_height = metrics.height()
+        font_metrics = painter.fontMetrics()
+        text_width = font_metrics.horizontalAdvance(session_text)
+        text_height = font_metrics.height()
         
         # Draw white background for PID
         bg_rect = QRect((self.width() - text_width - 4) // 2, 66, text_width + 4, text_height + 2)
@@ -328,54 +405,50 @@ class YadonPet(QWidget):
     def _tmux_run(self, args):
         return run_tmux(args, 'yadon_pet')
 
+    @metrics.instrumented('list_relevant_panes')
     def _list_relevant_panes(self):
         """Return list of panes in this session that run target CLIs."""
         panes = []
         if not self.tmux_session:
             return panes
         try:
-            # Get pane id, pid, current command with safe delimiter
-            res = self._tmux_run(['list-panes', '-t', str(self.tmux_session), '-F', '#{pane_id}::#{pane_pid}::#{pane_current_command}'])
-            if not res or res.returncode != 0:
-                return panes
-            lines = [l for l in res.stdout.strip().split('\n') if l.strip()]
-            for line in lines:
-                parts = line.split('::')
-                if len(parts) != 3:
-                    continue
-                pane_id, pane_pid, cmd = parts
-                cmd_l = cmd.lower().strip()
-                relevant = any(name in cmd_l for name in TMUX_CLI_NAMES)
-                if not relevant:
-                    # Try to detect child processes of the pane pid containing target names
-                    try:
-                        ps = subprocess.run(['ps', 'ax', '-o', 'pid=,ppid=,command='], capture_output=True, text=True)
-                        if ps.returncode == 0:
-                            for pl in ps.stdout.splitlines():
-                                try:
-                                    ppid = int(pl.split(None, 2)[1])
-                                    if str(ppid) == pane_pid:
-                                        cmdline = pl.split(None, 2)[2].lower()
-                                        if any(name in cmdline for name in TMUX_CLI_NAMES):
-                                            relevant = True
-                                            cmd_l = cmdline
-                                            break
-                                except Exception:
-                                    continue
-                    except Exception:
-                        pass
-                if relevant:
-                    panes.append({'pane_id': pane_id, 'pane_pid': pane_pid, 'cmd': cmd_l})
+            # This session's slice of the shared per-tick snapshot; relevance
+            # is cached per (pane, pid, command) and only recomputed on change
+            snapshot = get_snapshot()
+            relevance = get_relevance_cache()
+            relevance.sync(snapshot)
+            for rec in snapshot.panes_for(str(self.tmux_session)):
+                cmd_l = relevance.cli_command(rec)
+                if cmd_l:
+                    panes.append({'pane_id': rec.pane_id, 'pane_pid': rec.pane_pid, 'cmd': cmd_l,
+                                  'session_id': rec.session_id, 'window': rec.window_index, 'tty': rec.pane_tty, 'meta': pane_meta(rec), 'seen_at': snapshot.taken_wall})
             return panes
         except Exception as e:
-            _log_debug(f"list panes error: {e}")
+            if debug_log.is_enabled():
+                _log_debug(f"list panes error: {e}")
             return []
 
-    def _capture_pane_tail(self, pane_id, lines=200):
-        res = self._tmux_run(['capture-pane', '-p', '-J', '-t', pane_id, '-S', f'-{lines}'])
-        if not res or res.returncode != 0:
-            return ''
-        return res.stdout[-2000:]  # limit
+    def _pane_quiet(self, pane, st) -> bool:
+        """Whether a pane provably has not changed since its last capture
+
+        Its history size, cursor and window activity must match those seen
+        with that capture, and the window's last activity must predate the
+        second that snapshot was taken in (window_activity has one-second
+        resolution, so output later in that second would not show).
+        """
+        if not PANE_META_CHANGE_DETECTION or not st or st.get('last_content') is None:
+            return False
+        meta = pane.get('meta')
+        if meta is None or meta != st.get('meta'):
+            return False
+        return int(meta[3]) < int(st.get('meta_seen_at') or 0)
+
+    def _capture_pane_tail(self, pane_id, lines=PANE_CAPTURE_LINES):
+        streams = get_pane_streamer()
+        if streams and streams.streaming(pane_id):
+            return streams.tail(pane_id)[-2000:]
+        # Served from this tick's batched capture when there is one
+        return get_pane_store().get(pane_id, lines)[-2000:]  # limit
 
     def _friendly_cli_name(self, name: str) -> str:
         try:
@@ -393,21 +466,97 @@ class YadonPet(QWidget):
             return name
 
     def check_cli_activity(self):
+        # Pane discovery and captures run on a worker; idle decisions and
+        # bubbles are applied on the GUI thread once the results arrive
+        if self._activity_pending:
+            return
+        self._activity_pending = True
+        get_tmux_runner().submit(self._collect_cli_activity, self._apply_cli_activity)
+
+    @metrics.instrumented('check_cli_activity.collect')
+    def _collect_cli_activity(self):
+        """Worker side of check_cli_activity: one observation per relevant pane"""
+        observations = []
+        panes = self._list_relevant_panes()
+        # When tmux pushes %output for this session, the timestamps tell us
+        # whether a pane is busy and content is only captured for prompts
+        engine = self.activity_engine
+        live = bool(engine and engine.watch(self.tmux_session))
+        # Otherwise a stat() of each pane's tty does the same where it can;
+        # streamed panes (opt-in) bring their own timestamps and output
+        ttys = None if live else get_tty_monitor()
+        streams = get_pane_streamer()
+        hooks = self.tmux_hooks
+        sources = {}  # pane_id -> object with last_output_ts(), or None to hash content
+        needed = set()
+        to_capture = []
+        contents = {}
+        for pane in panes:
+            pane_id = pane['pane_id']
+            st = self.pane_state.get(pane_id)
+            if hooks:
+                hooks.watch_silence(pane_id)
+            if streams and streams.attach(pane_id):
+                source = streams
+            elif live:
+                source = engine
+            elif ttys and ttys.track(pane_id, pane.get('tty')):
+                source = ttys
+            else:
+                source = None
+            sources[pane_id] = source
+            if source is not None and not (self.yaruki_switch_mode and not (st and st.get('allow_done'))):
+                continue
+            needed.add(pane_id)
+            if source is not None and source is streams:
+                contents[pane_id] = streams.tail(pane_id)[-2000:]
+            # Unchanged metadata: the previous content still stands
+            elif self._pane_quiet(pane, st):
+                contents[pane_id] = st['last_content']
+            else:
+                to_capture.append(pane_id)
+        # All captures this tick needs in one tmux call
+        if to_capture:
+            captured = get_pane_store().get_many(to_capture)
+            for pane_id in to_capture:
+                contents[pane_id] = captured.get(pane_id, '')[-2000:]
+                if sources[pane_id] is not None and sources[pane_id] is ttys:
+                    ttys.check_content(pane_id, contents[pane_id])
+        for pane in panes:
+            pane_id = pane['pane_id']
+            source = sources[pane_id]
+            content = contents[pane_id] if pane_id in needed else None
+            output_ts = source.last_output_ts(pane_id) if source is not None else None
+            observations.append((pane, source is not None, content, output_ts))
+        return observations
+
+    @metrics.instrumented('check_cli_activity.apply')
+    def _apply_cli_activity(self, observations):
+        self._activity_pending = False
+        if observations is None:
+            return
+        any_changed = set(self.pane_state) != set(obs[0]['pane_id'] for obs in observations)
         try:
-            import time
-            now = time.time()
-            panes = self._list_relevant_panes()
-            for pane in panes:
+            now = monotonic()
+            engine = self.activity_engine
+            for pane, live, content, output_ts in observations:
                 pid = pane['pane_pid']
                 pane_id = pane['pane_id']
                 name = pane['cmd']
-                content = self._capture_pane_tail(pane_id)
-                h = hash(content)
-                st = self.pane_state.get(pane_id, {'last_hash': None, 'last_change_ts': now, 'soft_notified': False, 'force_done': False, 'allow_done': False, 'name': name})
+                st = self.pane_state.get(pane_id, {'last_hash': None, 'last_output_ts': None, 'last_change_ts': now, 'soft_notified': False, 'force_done': False, 'allow_done': False, 'name': name})
+                if live:
+                    changed = output_ts is not None and output_ts != st.get('last_output_ts')
+                    change_ts = output_ts
+                else:
+                    h = hash(content)
+                    changed = st['last_hash'] != h
+                    change_ts = now
                 # Detect change
-                if st['last_hash'] != h:
-                    st['last_hash'] = h
-                    st['last_change_ts'] = now
+                if changed:
+                    any_changed = True
+                    st['last_hash'] = None if live else h
+                    st['last_output_ts'] = output_ts if live else None
+                    st['last_change_ts'] = change_ts
                     st['soft_notified'] = False
                     st['force_done'] = False
                     st['allow_done'] = False
@@ -417,13 +566,15 @@ class YadonPet(QWidget):
                     if self.yaruki_switch_mode and not st.get('allow_done'):
                         if self._detect_codex_allow_prompt(content):
                             # Prefer typing 'allow' then Enter to be explicit
-                            self._tmux_run(['send-keys', '-t', pane_id, '-l', 'allow'])
-                            self._tmux_send_keys(pane_id, ['Enter'])
+                            get_tmux_runner().submit(self._send_allow, None, pane_id)
                             st['allow_done'] = True
                             _log_debug(f"yaruki: auto-allowed command on {pane_id}")
-                    idle = now - st['last_change_ts']
+                    # Compared as deadlines, exactly like the idle scheduler
+                    # computes them, so a check fired at a deadline always
+                    # sees it as reached
+                    last_change = st['last_change_ts']
                     # First stage: soft hint
-                    if idle >= IDLE_SOFT_THRESHOLD_SEC and not st.get('soft_notified'):
+                    if now >= last_change + IDLE_SOFT_THRESHOLD_SEC and not st.get('soft_notified'):
                         # Show blue bubble (gentle)
                         friendly = self._friendly_cli_name(name)
                         try:
@@ -434,29 +585,121 @@ class YadonPet(QWidget):
                         self._show_bubble(msg, 'hook')
                         st['soft_notified'] = True
                     # Second stage: force if enabled
-                    if idle >= IDLE_FORCE_THRESHOLD_SEC and not st.get('force_done'):
+                    if now >= last_change + IDLE_FORCE_THRESHOLD_SEC and not st.get('force_done'):
                         if self.yaruki_switch_mode:
-                            self._yaruki_force(pane_id)
+                            get_tmux_runner().submit(self._yaruki_force, None, pane_id)
                             # Optional feedback bubble
                             friendly = self._friendly_cli_name(name)
                             hard_msg = YARUKI_FORCE_MESSAGE.format(name=friendly)
                             self._show_bubble(hard_msg, 'hook')
                         st['force_done'] = True
+                if content is not None:
+                    # What the next tick compares its metadata against
+                    st['last_content'] = content
+                    st['meta'] = pane.get('meta')
+                    st['meta_seen_at'] = pane.get('seen_at')
+                st['session_id'] = pane.get('session_id')
+                st['window'] = pane.get('window')
                 self.pane_state[pane_id] = st
             # Cleanup state for panes that disappeared
-            existing_ids = set(p['pane_id'] for p in panes)
+            existing_ids = set(obs[0]['pane_id'] for obs in observations)
             for key in list(self.pane_state.keys()):
                 if key not in existing_ids:
                     del self.pane_state[key]
+                    self._cancel_idle_deadlines(key)
+                    get_pane_store().invalidate(key)
+                    if engine:
+                        engine.forget(key)
+                    ttys = get_tty_monitor()
+                    if ttys:
+                        ttys.forget(key)
+                    streams = get_pane_streamer()
+                    if streams:
+                        get_tmux_runner().submit(streams.detach, None, key)
+            # Arm the next threshold of every pane from its latest output
+            next_due = None
+            for pane_id, st in self.pane_state.items():
+                due = self._schedule_idle_deadlines(pane_id, st)
+                if due is not None and (next_due is None or due < next_due):
+                    next_due = due
+            # Back off while there is nothing to watch; poll again no later
+            # than the next threshold when a pane is getting close to one
+            due_in_ms = None if next_due is None else max(0, (next_due - now) * 1000)
+            interval = self._activity_poll.update(any_changed, idle=not observations, due_in_ms=due_in_ms)
+            retime(self.activity_timer, interval)
         except Exception as e:
-            _log_debug(f"check_cli_activity error: {e}")
+            if debug_log.is_enabled():
+                _log_debug(f"check_cli_activity error: {e}")
+
+    def _on_tmux_event(self, hook, args):
+        """React to an event pushed by the tmux hooks"""
+        if hook == 'pane-exited':
+            if args and args[0] in self.pane_state:
+                invalidate_snapshot()
+                self.check_cli_activity()
+        elif hook == 'alert-silence':
+            # args: session id, window index, pane id, monitor-silence seconds
+            if len(args) < 4 or not args[3].isdigit():
+                return
+            window = (args[0], args[1])
+            panes = [st for st in self.pane_state.values() if (st.get('session_id'), st.get('window')) == window]
+            if not panes:
+                return  # Another pet's window
+            # Nothing in that window has written since, so output of its
+            # panes stopped no later than this
+            silent_since = monotonic() - int(args[3])
+            for st in panes:
+                if st['last_change_ts'] > silent_since:
+                    st['last_change_ts'] = silent_since
+            get_tmux_runner().submit(self.tmux_hooks.rearm_silence, None, args[2])
+            self.check_cli_activity()
+
+    def _schedule_idle_deadlines(self, pane_id, st):
+        """Ask for a re-check exactly when this pane's next threshold is due
+
+        Returns:
+            The earliest pending deadline, or None when both stages are done
+        """
+        scheduler = get_idle_scheduler()
+        earliest = None
+        for stage, done_key, threshold in (
+            ('soft', 'soft_notified', IDLE_SOFT_THRESHOLD_SEC),
+            ('force', 'force_done', IDLE_FORCE_THRESHOLD_SEC),
+        ):
+            if st.get(done_key):
+                scheduler.cancel((pane_id, stage))
+            else:
+                deadline = st['last_change_ts'] + threshold
+                scheduler.schedule((pane_id, stage), deadline, self.check_cli_activity)
+                if earliest is None or deadline < earliest:
+                    earliest = deadline
+        return earliest
+
+    def _cancel_idle_deadlines(self, pane_id):
+        scheduler = get_idle_scheduler()
+        scheduler.cancel((pane_id, 'soft'))
+        scheduler.cancel((pane_id, 'force'))
+
+    def _before_keys(self, pane_id):
+        """A prompt in the pane is being answered: stop reading it from the stream"""
+        streams = get_pane_streamer()
+        if streams:
+            streams.mark_input(pane_id)
+
+    def _send_allow(self, pane_id):
+        self._before_keys(pane_id)
+        self._tmux_run(['send-keys', '-t', pane_id, '-l', 'allow'])
+        self._tmux_send_keys(pane_id, ['Enter'])
 
     def _tmux_send_keys(self, pane_id, keys):
         try:
             if not keys:
                 return
+            self._before_keys(pane_id)
             # send-keys can take multiple keys in one call
             result = self._tmux_run(['send-keys', '-t', pane_id] + list(keys))
+            # The pane is about to react; do not serve its old capture
+            get_pane_store().invalidate(pane_id)
             if result and result.returncode != 0:
                 _log_debug(f"send_keys failed: {result.stderr}")
         except Exception as e:
@@ -464,13 +707,16 @@ class YadonPet(QWidget):
 
     def _yaruki_force(self, pane_id):
         try:
-            # Inspect pane tail for yes/no prompt
+            # Inspect pane tail for yes/no prompt (usually the capture the
+            # activity check just took)
             tail = self._capture_pane_tail(pane_id, lines=80)
             if self._detect_yes_no_prompt(tail):
+                self._before_keys(pane_id)
                 # Send 'y' as literal text without Enter first
                 self._tmux_run(['send-keys', '-t', pane_id, '-l', 'y'])
                 # Then send Enter separately to submit
                 self._tmux_run(['send-keys', '-t', pane_id, 'C-m'])
+                get_pane_store().invalidate(pane_id)
                 _log_debug(f"yaruki: answered 'y' to yes/no on {pane_id}")
                 return
             # Otherwise just resend previous command
@@ -694,8 +940,9 @@ class YadonPet(QWidget):
             self.bubble.close()
             self.bubble = None
 
-        self.bubble = SpeechBubble(message, self, bubble_type=bubble_type)
-        self.bubble.show()
+        with metrics.timed('bubble.create'):
+            self.bubble = SpeechBubble(message, self, bubble_type=bubble_type)
+            self.bubble.show()
 
         # Hide bubble after specified time
         if display_time is None:
@@ -709,18 +956,31 @@ class YadonPet(QWidget):
 
     def check_tmux(self):
         """Check if any tmux session is running"""
+        if self._tmux_check_pending:
+            return
+        self._tmux_check_pending = True
+        get_tmux_runner().submit(self._fetch_tmux_sessions, self._apply_tmux_check)
+
+    def _fetch_tmux_sessions(self):
+        """Worker side of check_tmux: current session names"""
+        return get_tmux_sessions()
+
+    def _apply_tmux_check(self, sessions):
+        self._tmux_check_pending = False
         try:
-            tmux_running = count_tmux_sessions() > 0
+            if sessions is None:
+                return
+            tmux_running = len(sessions) > 0
+            retime(self.monitor_timer, self._tmux_poll.update(tmux_running != self.tmux_active))
 
             if tmux_running and not self.tmux_active:
                 # tmux just started
                 self.tmux_active = True
                 # セッション未確定ならここで取得
                 if not self.tmux_session:
-                    new_session = find_tmux_session()
-                    if new_session:
-                        self.tmux_session = new_session
-                        _log_debug(f"check_tmux: late attach to {new_session}")
+                    new_session = sessions[0]
+                    self.tmux_session = new_session
+                    _log_debug(f"check_tmux: late attach to {new_session}")
                 self.show_welcome_message()
                 self.show()
             elif not tmux_running and self.tmux_active:
@@ -755,6 +1015,56 @@ def signal_handler(sig, frame):
     sys.exit(0)
 
 
+def start_pets():
+    """Create the initial pets and the session monitor
+
+    tmux is queried once here; every pet is handed the result instead of
+    running its own session discovery.
+
+    Returns:
+        (pets, monitor)
+    """
+    # Create Yadon pets based on number of tmux sessions
+    pets = []
+    sessions = get_tmux_sessions()
+    tmux_count = len(sessions)
+    
+    # Create one Yadon for each tmux session (up to 4)
+    num_pets = min(tmux_count, MAX_YADON_COUNT) if tmux_count > 0 else 0
+    
+    # Prefer screen under cursor to improve discoverability
+    screen_obj = QApplication.screenAt(QCursor.pos()) or QApplication.primaryScreen()
+    screen = screen_obj.geometry()
+    
+    _log_debug(f"startup: tmux_count={tmux_count}, sessions={sessions}")
+    
+    # Calculate positions for bottom-right alignment
+    # Stack them horizontally from right to left at the bottom
+    margin = 20  # Margin from screen edges
+    spacing = 10  # Space between Yadons
+    
+    for i in range(num_pets):
+        # Pass specific tmux session to each Yadon
+        session_name = sessions[i] if i < len(sessions) else None
+        # Randomly select variant with equal probability
+        variant = random.choice(VARIANT_ORDER)
+        pet = YadonPet(tmux_session=session_name, variant=variant, sessions=sessions)
+        _log_debug(f"created pet for session={session_name} variant={variant}")
+        
+        # Position in bottom-right, stacking from right to left
+        x_pos = screen.width() - margin - (WINDOW_WIDTH + spacing) * (i + 1)
+        y_pos = screen.height() - margin - WINDOW_HEIGHT
+        pet.move(x_pos, y_pos)
+        _log_debug(f"moved pet to ({x_pos},{y_pos})")
+        
+        pets.append(pet)
+    
+    # Monitor for changes in tmux sessions
+    monitor = ProcessMonitor(pets)
+    monitor.start()
+    return pets, monitor
+
+
 def main():
     # Check for existing instance
     lockfile_path = '/tmp/yadon_pet.lock'
@@ -787,53 +1097,29 @@ def main():
     
     # Set up signal handler for clean exit
     signal.signal(signal.SIGINT, signal_handler)
+    # SIGUSR1 switches per-poll debug tracing on/off without a restart.
+    # SIGUSR2 writes the latency histograms to METRICS_DUMP_PATH.
+    # Both only queue the work for the event loop: the handler interrupts
+    # the main thread, possibly while it holds the locks the work takes.
+    if hasattr(signal, 'SIGUSR1'):
+        signal.signal(signal.SIGUSR1, lambda sig, frame: QTimer.singleShot(0, debug_log.toggle_debug))
+    if hasattr(signal, 'SIGUSR2'):
+        signal.signal(signal.SIGUSR2, lambda sig, frame: QTimer.singleShot(0, metrics.dump_metrics))
     
     app = QApplication(sys.argv)
+    # pkill and launchd stop the app with SIGTERM: quit the event loop like
+    # Ctrl+C does, so that the tmux hooks and pane pipes are removed on the
+    # way out
+    signal.signal(signal.SIGTERM, lambda sig, frame: QTimer.singleShot(0, QApplication.quit))
+    app.aboutToQuit.connect(uninstall_tmux_hooks)
+    app.aboutToQuit.connect(close_pane_streamer)
     
     # Also handle Ctrl+C in Qt event loop
-    timer = QTimer()
+    timer = HeartbeatTimer()
     timer.timeout.connect(lambda: None)  # Dummy timer to process events
     timer.start(500)
     
-    # Create Yadon pets based on number of tmux sessions
-    pets = []
-    tmux_count = count_tmux_sessions()
-    
-    # Create one Yadon for each tmux session (up to 4)
-    num_pets = min(tmux_count, MAX_YADON_COUNT) if tmux_count > 0 else 0
-    
-    # Prefer screen under cursor to improve discoverability
-    screen_obj = QApplication.screenAt(QCursor.pos()) or QApplication.primaryScreen()
-    screen = screen_obj.geometry()
-    
-    # Get tmux session names
-    sessions = get_tmux_sessions()
-    _log_debug(f"startup: tmux_count={tmux_count}, sessions={sessions}")
-    
-    # Calculate positions for bottom-right alignment
-    # Stack them horizontally from right to left at the bottom
-    margin = 20  # Margin from screen edges
-    spacing = 10  # Space between Yadons
-    
-    for i in range(num_pets):
-        # Pass specific tmux session to each Yadon
-        session_name = sessions[i] if i < len(sessions) else None
-        # Randomly select variant with equal probability
-        variant = random.choice(VARIANT_ORDER)
-        pet = YadonPet(tmux_session=session_name, variant=variant)
-        _log_debug(f"created pet for session={session_name} variant={variant}")
-        
-        # Position in bottom-right, stacking from right to left
-        x_pos = screen.width() - margin - (WINDOW_WIDTH + spacing) * (i + 1)
-        y_pos = screen.height() - margin - WINDOW_HEIGHT
-        pet.move(x_pos, y_pos)
-        _log_debug(f"moved pet to ({x_pos},{y_pos})")
-        
-        pets.append(pet)
-    
-    # Monitor for changes in tmux sessions
-    monitor = ProcessMonitor(pets)
-    monitor.start()
+    pets, monitor = start_pets()
     
     try:
         sys.exit(app.exec())